@@ -2,14 +2,32 @@ import streamlit as st
 import streamlit.components.v1 as components
 from streamlit_mic_recorder import mic_recorder
 from streamlit_option_menu import option_menu
-from translation_engine import TextTranslator
+from translation_engine import TextTranslator, align_sentences, update_segment_map
 from audio_handler import TextToSpeechHandler
+from voice_catalog import get_voice_catalog
 from audio_player import create_audio_player
-from config import LOGGERS
+from audio_ingest import AudioIngestor
+from http_pool import start_warm_pool
+from artifact_store import get_artifact_store
+from media_server import MediaServer
+from job_executor import get_job_executor, JobQueueFull, DONE, FAILED, CANCELLED
+from tts_prefetch import get_prefetcher, predict_voice, record_voice_use
+from config import (
+    LOGGERS, TRANSCRIPTION_CACHE_MAX_ENTRIES, TRANSCRIPTION_CACHE_MAX_BYTES,
+    TTS_STREAMING_ENABLED, MEDIA_URL_PLAYBACK_ENABLED, MEDIA_SERVER_HOST, MEDIA_SERVER_PORT, MEDIA_SERVER_PUBLIC_URL,
+    SPEECH_TRANSLATION_DIRECT, JOB_POLL_INTERVAL_SECONDS,
+    SPECULATIVE_TRANSLATION_ENABLED, SPECULATIVE_TRANSLATION_DEBOUNCE_SECONDS, TTS_PREFETCH_ENABLED,
+    INCREMENTAL_TRANSLATION_ENABLED
+)
+import datetime
+import functools
 import time
+import os
+import uuid
 
 # Get UI logger
 ui_logger = LOGGERS['ui']
+script_started = time.perf_counter()  # Full-run timing, logged at the end of the script
 
 # --- Page Config & Styling ---
 st.set_page_config(
@@ -215,12 +233,8 @@ if 'autoplay_enabled' not in st.session_state:
     st.session_state.autoplay_enabled = True
 if 'last_auto_generated_voice' not in st.session_state:
     st.session_state.last_auto_generated_voice = None
-if 'audio_loading' not in st.session_state:
-    st.session_state.audio_loading = False
 if 'page_reload' not in st.session_state:
     st.session_state.page_reload = True
-if 'tts_in_progress' not in st.session_state:
-    st.session_state.tts_in_progress = False
 if 'transcribed_text' not in st.session_state:
     st.session_state.transcribed_text = ""
 if 'ready_to_translate' not in st.session_state:
@@ -235,8 +249,27 @@ if 'tts_text' not in st.session_state:
     st.session_state.tts_text = ""
 if 'editing_text' not in st.session_state:
     st.session_state.editing_text = False
-if 'translating' not in st.session_state:
-    st.session_state.translating = False
+if 'session_id' not in st.session_state:
+    # Owner id for this session's artifact references and background jobs
+    st.session_state.session_id = uuid.uuid4().hex
+if 'jobs' not in st.session_state:
+    # Slot ("transcription", "translation", "tts") -> this session's latest background Job
+    st.session_state.jobs = {}
+if 'job_errors' not in st.session_state:
+    st.session_state.job_errors = {}
+if 'voice_history' not in st.session_state:
+    # (target language, voice) of each generation, used to predict the voice to prefetch
+    st.session_state.voice_history = []
+if 'segment_map' not in st.session_state:
+    # Source sentence hash -> translated sentence, so re-translating edited text only sends what changed
+    st.session_state.segment_map = None
+
+@st.cache_resource
+def start_http_pool():
+    """Open provider connections at process start and keep them warm (once per process)"""
+    ui_logger.info("Warming shared HTTP pool.")
+    start_warm_pool()
+    return True
 
 @st.cache_resource
 def get_translator():
@@ -252,8 +285,37 @@ def get_tts_handler():
         ui_logger.error(f"Failed to initialize TTS handler: {e}")
         return None
 
+@st.cache_resource
+def get_audio_ingestor():
+    ui_logger.info("Initializing AudioIngestor instance.")
+    return AudioIngestor(
+        get_translator(),
+        max_entries=TRANSCRIPTION_CACHE_MAX_ENTRIES,
+        max_bytes=TRANSCRIPTION_CACHE_MAX_BYTES
+    )
+
+@st.cache_resource
+def get_media_server():
+    """Local media server for streaming TTS and URL playback (None when both are disabled)"""
+    if not (TTS_STREAMING_ENABLED or MEDIA_URL_PLAYBACK_ENABLED):
+        return None
+    ui_logger.info("Starting MediaServer for streaming TTS / URL playback.")
+    try:
+        server = MediaServer(MEDIA_SERVER_HOST, MEDIA_SERVER_PORT, MEDIA_SERVER_PUBLIC_URL)
+        server.start()
+        return server
+    except Exception as e:
+        ui_logger.error(f"Failed to start media server, streaming TTS and URL playback disabled: {e}")
+        return None
+
+start_http_pool()
 translator = get_translator()
 tts_handler = get_tts_handler()
+audio_ingestor = get_audio_ingestor()
+media_server = get_media_server()
+artifact_store = get_artifact_store()
+job_executor = get_job_executor()
+prefetcher = get_prefetcher()
 
 # --- Main UI ---
 st.html(f"""
@@ -275,21 +337,78 @@ st.html(f"""
 st.markdown('<div class="audio-section">', unsafe_allow_html=True)
 st.markdown("### 🎤 Record Voice")
 
+def timed_fragment(fn):
+    """st.fragment that logs how long each of its runs takes (debug level)"""
+    @functools.wraps(fn)
+    def run():
+        start = time.perf_counter()
+        fn()
+        ui_logger.debug(f"Fragment {fn.__name__} ran in {(time.perf_counter() - start) * 1000:.1f}ms")
+    return st.fragment(run)
+
+# Background jobs: provider calls run on the shared job executor, never on the script thread
+def job_pending(slot):
+    """True while this session's job in the slot is queued or running"""
+    job = st.session_state.jobs.get(slot)
+    return job is not None and not job.finished
+
+def start_job(slot, kind, fn, *args, description=""):
+    """Submit fn(job, *args) for this session, superseding (cancelling) its previous job in the slot"""
+    st.session_state.job_errors.pop(slot, None)
+    try:
+        job = job_executor.submit(kind, fn, *args, owner=st.session_state.session_id, slot=slot, description=description)
+    except JobQueueFull as e:
+        st.session_state.job_errors[slot] = str(e)
+        ui_logger.warning(f"Background {kind} job refused: {e}")
+        return None
+    st.session_state.jobs[slot] = job
+    return job
+
+def cancel_jobs():
+    """Cancel all of this session's background jobs"""
+    job_executor.cancel_owner(st.session_state.session_id)
+    st.session_state.jobs = {}
+
 # Clear status messages when new recording starts
 def clear_audio_messages():
     # Only clear if not doing TTS
-    if not st.session_state.get('tts_in_progress', False):
+    if not job_pending('tts'):
         st.session_state.audio_status = ""
         st.session_state.audio_error = ""
         st.session_state.message_timestamp = 0
 
+def release_generated_audio():
+    """Forget the player's audio file, releasing this session's artifact reference"""
+    path = st.session_state.pop('generated_audio_path', None)
+    if path:
+        artifact_store.release(path, st.session_state.session_id)
+
+def drop_missing_audio():
+    """Clear the player if its file was deleted (audio cache eviction, artifact GC); returns True if it was"""
+    path = st.session_state.get('generated_audio_path')
+    if not path or os.path.exists(path):
+        return False
+    log_tts_debug("Generated audio file no longer exists - clearing player")
+    release_generated_audio()
+    st.session_state.audio_played = False
+    return True
+
+def set_generated_audio(path):
+    """Point the player at an audio file, moving this session's artifact reference to it"""
+    if st.session_state.get('generated_audio_path') == path:
+        return
+    artifact_store.acquire(path, st.session_state.session_id)  # No-op for cached audio
+    release_generated_audio()
+    st.session_state.generated_audio_path = path
+
 def clear_audio():
     """Clear audio player state and generated audio"""
     log_tts_debug("Clearing audio player state")
     
     # Clear audio-related session state
-    if 'generated_audio_path' in st.session_state:
-        del st.session_state.generated_audio_path
+    release_generated_audio()
+    if 'generated_audio_stream_id' in st.session_state:
+        del st.session_state.generated_audio_stream_id
     if 'generated_audio_voice' in st.session_state:
         del st.session_state.generated_audio_voice
     
@@ -297,8 +416,9 @@ def clear_audio():
     st.session_state.audio_just_cleared = True
     
     st.session_state.audio_played = False
-    st.session_state.audio_loading = False
-    st.session_state.tts_in_progress = False
+    tts_job = st.session_state.jobs.pop('tts', None)
+    if tts_job is not None:
+        tts_job.cancel()
     st.session_state.show_voice_modal = False
     st.session_state.page_reload = True  # Reset for next audio generation
     
@@ -321,114 +441,394 @@ def log_tts_debug(message):
     if len(st.session_state.tts_debug_logs) > 10:
         st.session_state.tts_debug_logs = st.session_state.tts_debug_logs[-10:]
 
+# --- Job functions (worker threads: no st.* calls, results are applied by the job panel) ---
+def transcription_job(job, audio_bytes, audio_digest):
+    """Transcribe a recording (and, with direct speech translation, translate Spanish speech)"""
+    if SPEECH_TRANSLATION_DIRECT:
+        # Transcript and (for Spanish) English translation in one concurrent round trip
+        speech_report, from_cache = audio_ingestor.transcribe_and_translate(audio_bytes, audio_digest)
+        return {
+            'transcription': speech_report['transcription'],
+            'from_cache': from_cache,
+            'speech_translation': speech_report if speech_report['translation'] else None,
+        }
+    transcription, from_cache = audio_ingestor.transcribe_detailed(audio_bytes, audio_digest)
+    return {'transcription': transcription, 'from_cache': from_cache, 'speech_translation': None}
+
+def translation_job(job, text, source_language, segment_map=None):
+    """
+    Stream a translation, publishing the text so far as job progress
+
+    With a segment map from earlier translations, edited text only sends its new sentences;
+    the result carries the updated map.
+    """
+    if segment_map is not None:
+        result = translator.translate_incremental(
+            text, segment_map, cancel_event=job.cancel_event, source_language=source_language
+        )
+        if result is not None:
+            job.report(result['translation'])
+            return result
+    result = {}
+    translated = ""
+    for item in translator.detect_and_translate_stream(text, cancel_event=job.cancel_event, source_language=source_language):
+        if isinstance(item, dict):
+            result.update(item)
+        else:
+            translated += item
+            job.report(translated)
+    translation = result.get('translation', '')
+    if (INCREMENTAL_TRANSLATION_ENABLED and not result.get('cancelled') and not result.get('error')
+            and result.get('direction', 'Unknown') != 'Unknown' and translation):
+        result['segment_map'] = update_segment_map(segment_map, result['direction'], align_sentences(text, translation))
+    return result
+
+def tts_job(job, text, voice_id, voice_name):
+    """Synthesize text to a file (or start a stream on the media server)"""
+    if TTS_STREAMING_ENABLED and media_server is not None:
+        # Stream synthesis so the player can start on the first chunk
+        stream_id = media_server.register_stream(tts_handler.stream_audio_with_voice_id(text, voice_id, voice_name))
+        return {'text': text, 'voice_id': voice_id, 'voice_name': voice_name, 'stream_id': stream_id, 'path': None}
+    path = tts_handler.generate_audio_with_voice_id(text, voice_id, voice_name)
+    return {'text': text, 'voice_id': voice_id, 'voice_name': voice_name, 'stream_id': None, 'path': path}
+
+# --- Applying finished jobs (script thread) ---
+def apply_transcription(result):
+    transcription = result['transcription']
+    transcribed_text = transcription['text']
+    if not transcribed_text:
+        # Silent clip - nothing was uploaded
+        st.session_state.audio_error = "No speech detected in the recording."
+    elif not transcribed_text.startswith("Error"):
+        st.session_state.transcribed_text = transcribed_text
+        # Whisper's language lets the translation skip detection while the text is unedited
+        st.session_state.transcribed_language = transcription['language']
+        st.session_state.input_text = transcribed_text  # Also set input_text directly
+        st.session_state.ready_to_translate = True
+        st.session_state.audio_status = f"Transcribed: '{transcribed_text[:100]}...'"
+        st.session_state.message_timestamp = time.time()
+        if result['from_cache']:
+            ui_logger.info("Reused cached transcription for recording")
+        speech_translation = result['speech_translation']
+        if speech_translation:
+            # Spanish speech already translated - show it without a Translate click
+            st.session_state.translated_text = speech_translation['translation']
+            st.session_state.translation_direction = speech_translation['direction']
+            st.session_state.target_language = "english"
+            st.session_state.last_auto_generated_voice = None
+            st.session_state.ready_to_translate = False
+            ui_logger.info(f"Direct speech translation in {speech_translation['seconds']:.2f}s")
+            prefetch_predicted_voice()
+        else:
+            # Start translating now; pressing Translate adopts the result
+            speculate_translation(transcribed_text, transcription['language'])
+    else:
+        st.session_state.audio_error = transcribed_text
+
+def apply_translation(result):
+    if result.get('error'):
+        # A stream that failed part-way must not pass for a complete translation
+        st.session_state.job_errors['translation'] = JOB_FAILURE_MESSAGES['translation'].format(error=result['error'])
+        ui_logger.error(f"Translation failed: {result['error']}")
+        return
+    translated = result.get('translation', '')
+    direction = result.get('direction', 'Unknown')
+    if result.get('usage'):
+        ui_logger.info(f"Translation usage: {result['usage']}")
+    st.session_state.translated_text = translated
+    st.session_state.translation_direction = direction
+    if result.get('segment_map') is not None:
+        st.session_state.segment_map = result['segment_map']
+    
+    # Determine target language for TTS
+    if "English → Spanish" in direction:
+        st.session_state.target_language = "spanish"
+    elif "Spanish → English" in direction:
+        st.session_state.target_language = "english"
+    else:
+        st.session_state.target_language = ""
+    
+    # Reset auto-generation tracker for new translation
+    st.session_state.last_auto_generated_voice = None
+    
+    # Clear transcription state after translation
+    st.session_state.transcribed_text = ""
+    st.session_state.ready_to_translate = False
+    
+    ui_logger.info(f"Translation received. Direction: {direction}")
+    prefetch_predicted_voice()
+
+def apply_voice_audio(result):
+    if not (result['stream_id'] or result['path']):
+        log_tts_debug("TTS returned no audio data")
+        st.session_state.job_errors['tts'] = "Failed to generate audio. Please try again."
+        st.session_state.last_auto_generated_voice = None
+        return
+    # Store audio data for display (a stream while streaming, otherwise a file path)
+    if result['stream_id']:
+        st.session_state.generated_audio_stream_id = result['stream_id']
+        st.session_state.generated_audio_source = (result['text'], result['voice_id'])
+        release_generated_audio()
+    else:
+        set_generated_audio(result['path'])
+        st.session_state.pop('generated_audio_stream_id', None)
+    st.session_state.generated_audio_voice = result['voice_name']
+    st.session_state.selected_voice = result['voice_name']  # Remember the voice
+    record_voice_use(st.session_state.voice_history, result['voice_name'], st.session_state.target_language)
+    st.session_state.audio_played = True  # Enable restart option
+    st.session_state.page_reload = False  # Enable autoplay on next render
+    log_tts_debug("Audio generated successfully")
+
+# --- Predictive TTS prefetch (TTS_PREFETCH_ENABLED) ---
+def cancel_prefetch():
+    job = st.session_state.jobs.pop('prefetch', None)
+    if job is not None:
+        job.cancel()
+    st.session_state.pop('prefetch_key', None)
+
+def prefetch_predicted_voice():
+    """Synthesize a new translation with the session's likely voice before it is picked"""
+    cancel_prefetch()
+    text = st.session_state.translated_text
+    if not (TTS_PREFETCH_ENABLED and tts_handler and text):
+        return
+    voice_name = predict_voice(st.session_state.voice_history, st.session_state.target_language)
+    voice_id = get_voice_id_from_name(voice_name, tts_handler) if voice_name else None
+    if not voice_id or tts_handler.get_cached_audio_path(text, voice_id):
+        return  # Nothing to predict, or the prediction already plays from the audio cache
+    if not prefetcher.reserve(text):
+        return
+    job = start_job('prefetch', 'tts', prefetcher.run, tts_handler, text, voice_id, voice_name,
+                    description=f"🔊 Preparing audio with {voice_name}...")
+    if job is not None:
+        st.session_state.prefetch_key = (text, voice_id)
+
+def adopt_prefetch(text, voice_id):
+    """
+    Use the prefetched audio if it is for this text and voice; returns True if adopted
+
+    Finished audio is shown right away and a synthesis still running becomes the session's TTS
+    job. A prefetch for anything else is cancelled.
+    """
+    job = st.session_state.jobs.get('prefetch')
+    if job is None:
+        return False
+    if st.session_state.get('prefetch_key') != (text, voice_id) or job.status in (FAILED, CANCELLED) or (
+            job.status == DONE and not (job.result and job.result['path'] and os.path.exists(job.result['path']))):
+        prefetcher.record('misses')
+        cancel_prefetch()
+        return False
+    del st.session_state.jobs['prefetch']
+    del st.session_state.prefetch_key
+    prefetcher.record('hits')
+    if job.status == DONE:
+        log_tts_debug("Playing prefetched audio")
+        apply_voice_audio(job.result)
+    else:
+        log_tts_debug("Adopting prefetch still in progress")
+        job_executor.reassign(job, 'tts')
+        st.session_state.jobs['tts'] = job
+    return True
+
+# Slots holding speculative work: never applied or shown by the job panel until adopted
+SPECULATIVE_SLOTS = ('speculation', 'prefetch')
+
+JOB_APPLIERS = {
+    'transcription': apply_transcription,
+    'translation': apply_translation,
+    'tts': apply_voice_audio,
+}
+JOB_FAILURE_MESSAGES = {
+    'transcription': "Auto-transcription failed: {error}",
+    'translation': "Translation failed: {error}",
+    'tts': "Failed to generate audio. Please try again.",
+}
+JOB_PENDING_LABELS = {
+    'transcription': "🎙️ Transcribing audio...",
+    'translation': "⚙️ Translating...",
+    'tts': "🔊 Generating audio...",
+}
+
+# --- Speculative translation (SPECULATIVE_TRANSLATION_ENABLED) ---
+def input_source_language(text):
+    """Whisper's language for dictated, unedited text (lets the translation skip detection), else None"""
+    if st.session_state.get('transcribed_text') and text == st.session_state.transcribed_text:
+        return st.session_state.get('transcribed_language')
+    return None
+
+def cancel_speculation():
+    job = st.session_state.jobs.pop('speculation', None)
+    if job is not None:
+        job.cancel()
+    st.session_state.pop('speculation_key', None)
+    st.session_state.pop('speculation_sends_at', None)
+
+def start_speculation_job(text, source_language):
+    job = start_job('speculation', 'translation', translation_job, text, source_language,
+                    st.session_state.segment_map, description="⚙️ Translating ahead...")
+    if job is None:
+        st.session_state.job_errors.pop('speculation', None)  # A refused speculation is not the user's problem
+        st.session_state.pop('speculation_key', None)
+        return
+    st.session_state.speculation_key = (text, source_language)
+
+def speculate_translation(text, source_language=None, delay_seconds=0.0):
+    """
+    Start translating text before Translate is pressed, superseding (cancelling) any earlier speculation
+
+    With a delay, nothing is submitted yet: the job panel starts the job once the text has been
+    unchanged for delay_seconds, so text that keeps changing never holds a translation worker
+    (or a place in the job queue) and never reaches the provider.
+    """
+    if not SPECULATIVE_TRANSLATION_ENABLED:
+        return
+    if not text.strip():
+        cancel_speculation()
+        return
+    key = (text, source_language)
+    if st.session_state.get('speculation_key') == key and (
+            'speculation' in st.session_state.jobs or 'speculation_sends_at' in st.session_state):
+        return
+    cancel_speculation()
+    if delay_seconds:
+        st.session_state.speculation_key = key
+        st.session_state.speculation_sends_at = time.time() + delay_seconds
+    else:
+        start_speculation_job(text, source_language)
+
+def start_due_speculation():
+    """Submit a debounced speculation once its delay has passed (job panel tick)"""
+    sends_at = st.session_state.get('speculation_sends_at')
+    if sends_at is None or time.time() < sends_at:
+        return
+    del st.session_state.speculation_sends_at
+    start_speculation_job(*st.session_state.speculation_key)
+
+def adopt_speculation(text, source_language):
+    """
+    Use the speculative translation of exactly this text, if there is one; returns True if adopted
+
+    A finished result is applied right away; one still in flight moves to the translation slot,
+    so the job panel shows its progress and applies it like a normal translation.
+    """
+    if 'speculation_sends_at' in st.session_state:
+        # Still debouncing - translating now beats waiting out the delay
+        cancel_speculation()
+        return False
+    job = st.session_state.jobs.get('speculation')
+    if job is None or st.session_state.get('speculation_key') != (text, source_language) or job.status in (FAILED, CANCELLED):
+        return False
+    del st.session_state.jobs['speculation']
+    del st.session_state.speculation_key
+    if job.status == DONE:
+        apply_translation(job.result)
+        ui_logger.info(f"Adopted finished speculative translation (took {job.elapsed_seconds:.2f}s)")
+    else:
+        job_executor.reassign(job, 'translation')
+        st.session_state.jobs['translation'] = job
+        ui_logger.info(f"Adopted in-flight speculative translation (running {job.elapsed_seconds:.2f}s)")
+    return True
+
+def job_panel():
+    """Show this session's pending jobs; apply finished ones and rerun the app so the page reflects them"""
+    start_due_speculation()
+    applied = False
+    for slot, job in list(st.session_state.jobs.items()):
+        if slot in SPECULATIVE_SLOTS or not job.finished:
+            continue  # Speculative results wait, unapplied, until they are adopted
+        del st.session_state.jobs[slot]
+        if job.status == DONE:
+            JOB_APPLIERS[slot](job.result)
+        elif job.status == FAILED:
+            st.session_state.job_errors[slot] = JOB_FAILURE_MESSAGES[slot].format(error=job.error)
+            if slot == 'tts':
+                # Let the same voice be retried
+                st.session_state.last_auto_generated_voice = None
+        ui_logger.info(f"Background {job.kind} job {job.status} after {job.elapsed_seconds:.2f}s")
+        applied = True
+    if applied:
+        st.rerun()
+    
+    for slot, message in st.session_state.job_errors.items():
+        st.error(message)
+    for slot, job in st.session_state.jobs.items():
+        if slot in SPECULATIVE_SLOTS:
+            continue
+        label = job.description or JOB_PENDING_LABELS[slot]
+        st.caption(f"{label} ({job.elapsed_seconds:.0f}s)")
+        if slot == 'translation' and job.progress:
+            # Partial translation while it streams in
+            st.markdown(job.progress)
+
 # Helper function to generate voice audio
 def generate_voice_audio(selected_voice, tts_handler):
-    """Generate audio for selected voice with simplified logic"""
+    """Start background synthesis for the selected voice; returns False if it couldn't be started"""
     # Use edited text if available, otherwise use original translation
     text_to_speak = st.session_state.get('tts_text', st.session_state.translated_text)
     if not tts_handler or not text_to_speak:
         return False
     
-    log_tts_debug(f"Generating audio for voice: {selected_voice}")
-    
-    try:
-        # Mark TTS as in progress to prevent recording interference
-        st.session_state.tts_in_progress = True
-        
-        # Clear any status messages but preserve transcription
-        if not st.session_state.get('tts_in_progress', False):
-            st.session_state.audio_status = ""
-            st.session_state.audio_error = ""
-        
-        # Get voice_id directly from the voice name (works for both languages)
-        voice_id = get_voice_id_from_name(selected_voice, tts_handler)
-        
-        if not voice_id:
-            log_tts_debug(f"Voice ID not found for: {selected_voice}")
-            st.session_state.tts_in_progress = False
-            return False
-        
-        # Generate audio directly with voice_id (no language mapping needed)
-        audio_data = tts_handler.generate_audio_with_voice_id(
-            text_to_speak, 
-            voice_id,
-            selected_voice
-        )
-        
-        # TTS completed successfully
-        st.session_state.tts_in_progress = False
-        st.session_state.audio_loading = False
-        
-        if audio_data:
-            # Store audio data for display
-            st.session_state.generated_audio_path = audio_data
-            st.session_state.generated_audio_voice = selected_voice
-            st.session_state.selected_voice = selected_voice  # Remember the voice
-            st.session_state.audio_played = True  # Enable restart option
-            st.session_state.page_reload = False  # Enable autoplay on next render
-            log_tts_debug("Audio generated successfully")
-            return True
-        else:
-            log_tts_debug("TTS returned no audio data")
-            return False
-    except Exception as e:
-        # Reset TTS flags on error
-        st.session_state.tts_in_progress = False
-        st.session_state.audio_loading = False
-        log_tts_debug(f"TTS error: {e}")
+    # Get voice_id directly from the voice name (works for both languages)
+    voice_id = get_voice_id_from_name(selected_voice, tts_handler)
+    if not voice_id:
+        log_tts_debug(f"Voice ID not found for: {selected_voice}")
         return False
+    
+    # Predicted right: play (or wait for) the prefetched audio; otherwise the prefetch is cancelled
+    if adopt_prefetch(text_to_speak, voice_id):
+        return True
+    
+    # Already synthesized for this text and voice: show it without a background job
+    cached_path = tts_handler.get_cached_audio_path(text_to_speak, voice_id)
+    if cached_path:
+        log_tts_debug(f"Playing cached audio for voice: {selected_voice}")
+        apply_voice_audio({'text': text_to_speak, 'voice_id': voice_id, 'voice_name': selected_voice,
+                           'stream_id': None, 'path': cached_path})
+        return True
+    
+    # A newer selection supersedes (cancels) any synthesis still running for this session
+    log_tts_debug(f"Generating audio for voice: {selected_voice}")
+    job = start_job('tts', 'tts', tts_job, text_to_speak, voice_id, selected_voice,
+                    description=f"🔊 Generating audio with {selected_voice}...")
+    return job is not None
 
 # Helper function to get voice_id from voice name
 def get_voice_id_from_name(voice_name, tts_handler):
     """Get voice_id from voice display name - works across all languages"""
-    # Search in both english and spanish voice dictionaries
-    for lang in ['english', 'spanish']:
-        if lang in tts_handler.voices and voice_name in tts_handler.voices[lang]:
-            return tts_handler.voices[lang][voice_name]['voice_id']
-    return None
+    return get_voice_catalog().voice_id(voice_name)
 
 # Helper function to get voice info from voice name
 def get_voice_info_from_name(voice_name, tts_handler):
     """Get voice info from voice display name - works across all languages"""
-    # Search in both english and spanish voice dictionaries
-    for lang in ['english', 'spanish']:
-        if lang in tts_handler.voices and voice_name in tts_handler.voices[lang]:
-            return tts_handler.voices[lang][voice_name]
-    return None
+    return get_voice_catalog().get(voice_name)
 
 # Auto-dismiss messages after 3 seconds (but not during TTS, editing text, or translating)
 current_time = time.time()
 if (st.session_state.message_timestamp > 0 and 
     (current_time - st.session_state.message_timestamp) > 3 and 
-    not st.session_state.get('tts_in_progress', False) and
+    not job_pending('tts') and
     not st.session_state.get('editing_text', False) and
-    not st.session_state.get('translating', False)):
+    not job_pending('translation')):
     clear_audio_messages()
 
 # Beautiful native audio input - only recording method
-audio_data = None
-
-# Only show recording when TTS is not in progress
-if (not st.session_state.get('tts_in_progress', False) and 
-    not st.session_state.get('audio_loading', False)):
-    audio_data = st.audio_input("🎤 Dictate")
-else:
-    audio_data = None
+# Always available: transcription and TTS run in the background, so nothing blocks a new recording
+audio_data = st.audio_input("🎤 Dictate")
 
 # Process beautiful native audio input if available
-if audio_data is not None and not st.session_state.get('tts_in_progress', False):
+if audio_data is not None:
     st.session_state.recording_method = 'native'
     
-    # Check if this is new audio by comparing with last processed
+    # Check if this is new audio by comparing its digest with the last processed one
     audio_bytes = audio_data.read()
-    audio_hash = hash(audio_bytes) if audio_bytes else None
+    audio_digest = audio_ingestor.digest(audio_bytes) if audio_bytes else None
     
-    if audio_hash and audio_hash != st.session_state.get('last_processed_audio'):
+    if audio_digest and audio_digest != st.session_state.get('last_processed_audio'):
         # Only show audio recording notifications for actual audio recording
         # Skip notifications if there's already translated text (user is probably working with translations)
-        if (not st.session_state.get('tts_in_progress', False) and 
+        if (not job_pending('tts') and 
             not st.session_state.get('editing_text', False) and
-            not st.session_state.get('translating', False) and
+            not job_pending('translation') and
             not st.session_state.get('translated_text', '')):  # No notifications if translation exists
             if not st.session_state.audio_status:
                 st.session_state.audio_status = "Audio recorded successfully!"
@@ -440,26 +840,12 @@ if audio_data is not None and not st.session_state.get('tts_in_progress', False)
             if st.session_state.audio_error:
                 st.error(st.session_state.audio_error)
         
-        # Auto-transcribe when audio is recorded (only new audio)
-        with st.spinner("Auto-transcribing audio..."):
-            ui_logger.info("Auto-transcribing recorded audio")
-            try:
-                transcribed_text = translator.transcribe_audio(audio_bytes)
-                if not transcribed_text.startswith("Error"):
-                    st.session_state.transcribed_text = transcribed_text
-                    st.session_state.input_text = transcribed_text  # Also set input_text directly
-                    st.session_state.ready_to_translate = True
-                    st.session_state.audio_status = f"Transcribed: '{transcribed_text[:100]}...'"
-                    st.session_state.message_timestamp = time.time()
-                    # Don't mark as processed - this allows fresh recording on next interaction
-                    # st.session_state.last_processed_audio = audio_hash  # REMOVED to enable auto-clear
-                    # Don't rerun - let natural flow continue
-                else:
-                    st.session_state.audio_error = transcribed_text
-                    # Don't rerun - let natural flow continue
-            except Exception as e:
-                st.session_state.audio_error = f"Auto-transcription failed: {str(e)}"
-                ui_logger.error(f"Auto-transcription error: {e}")
+        # Auto-transcribe when audio is recorded (only new audio), in the background.
+        # Mark as processed so reruns with the recorder still populated are no-ops;
+        # a new recording has a new digest and supersedes a transcription still running
+        ui_logger.info("Auto-transcribing recorded audio")
+        st.session_state.last_processed_audio = audio_digest
+        start_job('transcription', 'transcription', transcription_job, audio_bytes, audio_digest)
 
 # Reset recording method when no audio is present
 if audio_data is None:
@@ -480,7 +866,8 @@ input_text = st.text_area(
 )
 
 # Update session state when text area changes
-if input_text != st.session_state.input_text:
+input_edited = input_text != st.session_state.input_text
+if input_edited:
     st.session_state.input_text = input_text
     # Clear transcribed text if user manually edits
     if st.session_state.get('transcribed_text') and input_text != st.session_state.transcribed_text:
@@ -528,8 +915,6 @@ with col2:
                                  disabled=button_disabled)
     
     if translate_clicked:
-        # IMMEDIATELY set flag to prevent audio notifications
-        st.session_state.translating = True
         # Reset recording method and clear old messages
         st.session_state.recording_method = None
         clear_audio_messages()
@@ -539,39 +924,34 @@ with col2:
         st.session_state.show_voice_modal = False
         log_tts_debug("Translate button clicked - TTS modal closed")
         
-        with st.spinner("Translating..."):
-            ui_logger.info("Translate button clicked. Calling engine.")
-            translated, direction = translator.detect_and_translate(input_text)
-            st.session_state.translated_text = translated
-            st.session_state.translation_direction = direction
-            
-            # Determine target language for TTS
-            if "English → Spanish" in direction:
-                st.session_state.target_language = "spanish"
-            elif "Spanish → English" in direction:
-                st.session_state.target_language = "english"
-            else:
-                st.session_state.target_language = ""
-            
-            # Reset auto-generation tracker for new translation
-            st.session_state.last_auto_generated_voice = None
-            
-            # Clear transcription state after translation
-            st.session_state.transcribed_text = ""
-            st.session_state.ready_to_translate = False
-            st.session_state.last_processed_audio = None  # Reset audio processing
-            
-            # Reset translating flag
-            st.session_state.translating = False
-            
-            ui_logger.info(f"Translation received. Direction: {direction}")
+        # Dictated and unedited: reuse the language Whisper identified
+        source_language = input_source_language(input_text)
+        
+        if adopt_speculation(input_text, source_language):
+            ui_logger.info("Translate button clicked. Using the speculative translation.")
+        else:
+            # Stream in the background; the job panel shows it progressively and applies the result.
+            # Clicking again supersedes (cancels) a translation still streaming
+            ui_logger.info("Translate button clicked. Streaming from engine in the background.")
+            start_job('translation', 'translation', translation_job, input_text, source_language,
+                      st.session_state.segment_map)
     st.markdown('</div>', unsafe_allow_html=True)
     
     if button_disabled:
         st.caption("Enter text or record audio to enable translation")
 
+# Edited without pressing Translate: translate ahead once the text stops changing (a newer edit cancels it)
+if input_edited and not translate_clicked:
+    speculate_translation(input_text, input_source_language(input_text), SPECULATIVE_TRANSLATION_DEBOUNCE_SECONDS)
+
+# Background job status (pending transcription/translation/TTS); filled in at the end of the script
+job_status_area = st.container()
+
 # --- Output Section (Conditional) ---
-if st.session_state.translated_text:
+# Translation output, voice selection and the player are fragments: interacting with one reruns only it
+@timed_fragment
+def translation_output_panel():
+    """Editable translation (the text sent to TTS) and the copy control"""
     st.markdown("---")
     
     st.markdown(f"### Translation Result ({st.session_state.translation_direction})")
@@ -695,7 +1075,10 @@ if st.session_state.translated_text:
         """
 
         components.html(copy_button_html, height=80)
-    
+
+@timed_fragment
+def voice_selection_panel():
+    """Voice pickers and generation; starting a synthesis reruns the app so the job panel polls it"""
     # Modern Voice Selection Interface
     st.markdown("---")
     
@@ -704,7 +1087,7 @@ if st.session_state.translated_text:
     with voice_header_col1:
         st.markdown("### 🎤 Voice Selection")
     with voice_header_col2:
-        if st.session_state.get('audio_loading', False):
+        if job_pending('tts'):
             st.markdown("🔄 *Generating...*")
         elif st.session_state.get('audio_played', False):
             st.markdown("✅ *Audio Ready*")
@@ -723,35 +1106,12 @@ if st.session_state.translated_text:
     if tts_handler and st.session_state.translated_text:
         # Create voice cards using option_menu
         with st.container():
-            # Get ALL voices from BOTH languages and separate by gender only
-            male_voices = []
-            female_voices = []
+            # Prebuilt per-gender option lists from the shared voice catalog (all languages)
+            voice_catalog = get_voice_catalog()
+            male_options = voice_catalog.options['male']
+            female_options = voice_catalog.options['female']
             
-            # Get voices from both English and Spanish 
-            all_voice_options = []
-            if tts_handler.voices.get('english'):
-                all_voice_options.extend(list(tts_handler.voices['english'].keys()))
-            if tts_handler.voices.get('spanish'):
-                all_voice_options.extend(list(tts_handler.voices['spanish'].keys()))
-                
-                for voice in all_voice_options:
-                    # Try getting voice info from either language
-                    voice_info = None
-                    for lang in ['english', 'spanish']:
-                        if lang in tts_handler.voices and voice in tts_handler.voices[lang]:
-                            voice_info = tts_handler.voices[lang][voice]
-                            break
-                    
-                    if voice_info:
-                        gender = voice_info.get('gender', '').lower()
-                        # Clean display name (remove emoji)
-                        display_name = voice.replace("👨 ", "").replace("👩 ", "")
-                        
-                        if gender == 'male':
-                            male_voices.append((display_name, voice))
-                        elif gender == 'female':
-                            female_voices.append((display_name, voice))
-                
+            if len(voice_catalog):
                 # Create Man | Woman columns
                 col_male, col_female = st.columns(2)
                 
@@ -769,8 +1129,7 @@ if st.session_state.translated_text:
                 
                 with col_male:
                     st.markdown("**👨 Man**")
-                    if male_voices:
-                        male_options = ["Select a voice..."] + [name for name, _ in male_voices]
+                    if len(male_options) > 1:
                         selected_male = st.selectbox(
                             "Choose male voice:",
                             options=male_options,
@@ -783,23 +1142,19 @@ if st.session_state.translated_text:
                             # Reset clear flag when user makes a selection
                             st.session_state.audio_just_cleared = False
                             # Clear any stale status messages only (not transcription)
-                            if not st.session_state.get('tts_in_progress', False):
+                            if not job_pending('tts'):
                                 st.session_state.audio_status = ""
                                 st.session_state.audio_error = ""
-                            # Find the full voice name
-                            for display_name, full_name in male_voices:
-                                if display_name == selected_male:
-                                    selected_voice = full_name
-                                    # Get voice info using simplified helper
-                                    selected_voice_info = get_voice_info_from_name(full_name, tts_handler)
-                                    break
+                            # Map the label back to the full voice name
+                            selected_voice_info = voice_catalog.by_label.get(selected_male)
+                            if selected_voice_info:
+                                selected_voice = selected_voice_info['display_name']
                     else:
                         st.info("No male voices available")
                 
                 with col_female:
                     st.markdown("**👩 Woman**")
-                    if female_voices:
-                        female_options = ["Select a voice..."] + [name for name, _ in female_voices]
+                    if len(female_options) > 1:
                         selected_female = st.selectbox(
                             "Choose female voice:",
                             options=female_options,
@@ -812,16 +1167,13 @@ if st.session_state.translated_text:
                             # Reset clear flag when user makes a selection
                             st.session_state.audio_just_cleared = False
                             # Clear any stale status messages only (not transcription)
-                            if not st.session_state.get('tts_in_progress', False):
+                            if not job_pending('tts'):
                                 st.session_state.audio_status = ""
                                 st.session_state.audio_error = ""
-                            # Find the full voice name
-                            for display_name, full_name in female_voices:
-                                if display_name == selected_female:
-                                    selected_voice = full_name
-                                    # Get voice info using simplified helper
-                                    selected_voice_info = get_voice_info_from_name(full_name, tts_handler)
-                                    break
+                            # Map the label back to the full voice name
+                            selected_voice_info = voice_catalog.by_label.get(selected_female)
+                            if selected_voice_info:
+                                selected_voice = selected_voice_info['display_name']
                     else:
                         st.info("No female voices available")
                 
@@ -842,19 +1194,13 @@ if st.session_state.translated_text:
                         # Mark this voice as being auto-generated to prevent re-runs
                         st.session_state.last_auto_generated_voice = selected_voice
                         
-                        # Set loading state to prevent mic activation
-                        st.session_state.audio_loading = True
-                        with st.spinner(f"🔊 Auto-generating audio with {selected_voice}..."):
-                            success = generate_voice_audio(selected_voice, tts_handler)
-                            if success:
-                                st.success(f"🎵 Audio ready with {selected_voice}")
-                                # Force rerun to display player with autoplay
-                                st.rerun()
-                            else:
-                                st.error("Failed to generate audio. Please try again.")
-                                # Reset on failure so user can try again
-                                st.session_state.last_auto_generated_voice = None
-                                st.session_state.audio_loading = False
+                        # Synthesis runs in the background; the job panel shows the player when it's ready
+                        if generate_voice_audio(selected_voice, tts_handler):
+                            st.rerun()  # Full rerun so the job panel starts polling
+                        else:
+                            st.error("Failed to generate audio. Please try again.")
+                            # Reset on failure so user can try again
+                            st.session_state.last_auto_generated_voice = None
                     
                     # Manual generate button (only appears when voice is selected)
                     generate_col1, generate_col2, generate_col3 = st.columns([1, 2, 1])
@@ -868,16 +1214,10 @@ if st.session_state.translated_text:
                             use_container_width=True,
                             disabled=not st.session_state.get('tts_text', st.session_state.translated_text)
                         ):
-                            # Set loading state to prevent mic activation
-                            st.session_state.audio_loading = True
-                            with st.spinner(f"🔊 Generating audio with {selected_voice}..."):
-                                success = generate_voice_audio(selected_voice, tts_handler)
-                                if success:
-                                    st.success(f"🎵 Audio generated with {selected_voice}")
-                                    # Don't rerun - let natural flow continue
-                                else:
-                                    st.error("Failed to generate audio. Please try again.")
-                                    st.session_state.audio_loading = False
+                            if generate_voice_audio(selected_voice, tts_handler):
+                                st.rerun()  # Full rerun so the job panel starts polling
+                            else:
+                                st.error("Failed to generate audio. Please try again.")
                 else:
                     # No voice selected - show placeholder message
                     st.info("👆 Select a voice from the dropdowns above to generate audio")
@@ -886,45 +1226,98 @@ if st.session_state.translated_text:
         st.warning("🎤 Text-to-speech service is not available. Please check your ElevenLabs API key.")
         st.button("🎤 TTS Unavailable", disabled=True, use_container_width=True)
 
+if st.session_state.translated_text:
+    translation_output_panel()
+    voice_selection_panel()
+
 # Add restart functionality after audio plays
 if 'audio_played' not in st.session_state:
     st.session_state.audio_played = False
 
-# Display custom audio player if audio was generated
-if st.session_state.get('generated_audio_path') and st.session_state.get('audio_played', False):
+# Once a stream has finished, play the cached file instead of the (short-lived) stream
+if st.session_state.get('generated_audio_stream_id') and media_server is not None:
+    audio_stream = media_server.get_stream(st.session_state.generated_audio_stream_id)
+    if audio_stream is not None and audio_stream.error is not None:
+        # Synthesis failed mid-stream - report it like a failed TTS job
+        log_tts_debug(f"Audio stream failed: {audio_stream.error}")
+        st.session_state.job_errors['tts'] = "Failed to generate audio. Please try again."
+        st.session_state.last_auto_generated_voice = None
+        st.session_state.audio_played = False
+        del st.session_state.generated_audio_stream_id
+    elif audio_stream is None or audio_stream.done:
+        finished_text, finished_voice_id = st.session_state.generated_audio_source
+        finished_path = tts_handler.get_cached_audio_path(finished_text, finished_voice_id)
+        if finished_path or audio_stream is None:
+            if finished_path:
+                set_generated_audio(finished_path)
+            else:
+                st.session_state.audio_played = False
+            del st.session_state.generated_audio_stream_id
+
+# Cached audio can be evicted under disk pressure - drop stale references
+drop_missing_audio()
+
+@timed_fragment
+def audio_player_panel():
+    """Save control and the audio player"""
+    # A rerun of only this fragment skips the main script's stale-file check
+    if drop_missing_audio():
+        st.rerun()
     st.markdown("---")
     
     # Download button above the audio player
     button_col1, button_col2, button_col3 = st.columns([1, 1, 1])
     
     with button_col2:
-        # Read the audio file for download
-        with open(st.session_state.generated_audio_path, 'rb') as audio_file:
-            audio_bytes = audio_file.read()
-        
         # Create filename with voice name and timestamp
-        import datetime
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         voice_name = st.session_state.get('generated_audio_voice', 'audio').replace(' ', '_').replace('👨', '').replace('👩', '')
         filename = f"qtranslate_{voice_name}_{timestamp}.mp3"
         
-        # Download button
-        st.download_button(
-            label="💾 Save Audio",
-            data=audio_bytes,
-            file_name=filename,
-            mime="audio/mpeg",
-            key=f"download_{timestamp}",
-            use_container_width=True,
-            type="primary"
-        )
+        # Read the audio file (or finished stream) for download; with URL playback the
+        # browser fetches the file itself and only a link goes over the websocket
+        audio_bytes = None
+        download_url = None
+        if st.session_state.get('generated_audio_path'):
+            if media_server is not None:
+                media_id = media_server.register_file(st.session_state.generated_audio_path)
+                download_url = media_server.media_url(media_id, download_name=filename)
+            else:
+                try:
+                    with open(st.session_state.generated_audio_path, 'rb') as audio_file:
+                        audio_bytes = audio_file.read()
+                except FileNotFoundError:
+                    # Deleted since the check above
+                    drop_missing_audio()
+                    st.rerun()
+        elif media_server is not None:
+            audio_stream = media_server.get_stream(st.session_state.generated_audio_stream_id)
+            if audio_stream is not None and audio_stream.error is not None:
+                st.rerun()  # The full script reports the failure and clears the stream
+            audio_bytes = media_server.get_stream_bytes(st.session_state.generated_audio_stream_id)
+        
+        if download_url:
+            st.link_button("💾 Save Audio", download_url, use_container_width=True, type="primary")
+        elif audio_bytes:
+            # Download button
+            st.download_button(
+                label="💾 Save Audio",
+                data=audio_bytes,
+                file_name=filename,
+                mime="audio/mpeg",
+                key=f"download_{timestamp}",
+                use_container_width=True,
+                type="primary"
+            )
+        else:
+            st.caption("💾 Save will be available once the audio finishes streaming")
     
     # Audio player status indicator
     status_col1, status_col2 = st.columns([3, 1])
     with status_col1:
         st.markdown("### 🎵 Audio Player")
     with status_col2:
-        if st.session_state.get('audio_loading', False):
+        if job_pending('tts'):
             st.markdown("🔄 *Loading...*")
         else:
             st.markdown("✅ *Ready*")
@@ -936,21 +1329,37 @@ if st.session_state.get('generated_audio_path') and st.session_state.get('audio_
     if autoplay_enabled:
         st.info("🔄 Autoplay is enabled - audio will start automatically")
     
+    stream_id = st.session_state.get('generated_audio_stream_id')
+    artifact_store.touch(st.session_state.get('generated_audio_path'))  # Still on screen - keep it past the TTL
     create_audio_player(
-        st.session_state.generated_audio_path, 
+        st.session_state.get('generated_audio_path'), 
         text=f"Translation with {st.session_state.get('generated_audio_voice', 'Selected Voice')}",
-        autoplay=autoplay_enabled
+        autoplay=autoplay_enabled,
+        stream_url=media_server.stream_url(stream_id) if stream_id and media_server is not None else None,
+        media_server=media_server
     )
     
     # Mark that this is no longer a page reload
     st.session_state.page_reload = False
 
+# Display custom audio player if audio was generated (or is streaming)
+has_generated_audio = bool(st.session_state.get('generated_audio_path') or st.session_state.get('generated_audio_stream_id'))
+if has_generated_audio and st.session_state.get('audio_played', False):
+    audio_player_panel()
+
 # Show restart option after TTS has been used
 if st.session_state.get('audio_played', False):
     st.markdown("---")
     col_restart = st.columns([1, 2, 1])[1]  # Center the restart button
     with col_restart:
         if st.button("🔄 Start New Translation", key="restart_btn", use_container_width=True):
+            # Stop any transcription, translation or synthesis still running for this session
+            cancel_jobs()
+            st.session_state.job_errors = {}
+            st.session_state.pop('speculation_key', None)
+            st.session_state.pop('speculation_sends_at', None)
+            st.session_state.pop('prefetch_key', None)
+            st.session_state.segment_map = None
             # Clear all translation-related session state
             st.session_state.translated_text = ""
             st.session_state.translation_direction = ""
@@ -971,8 +1380,9 @@ if st.session_state.get('audio_played', False):
             st.session_state.transcribed_text = ""
             st.session_state.ready_to_translate = False
             # Clear audio player state
-            if 'generated_audio_path' in st.session_state:
-                del st.session_state.generated_audio_path
+            release_generated_audio()
+            if 'generated_audio_stream_id' in st.session_state:
+                del st.session_state.generated_audio_stream_id
             if 'generated_audio_voice' in st.session_state:
                 del st.session_state.generated_audio_voice
             clear_audio_messages()
@@ -984,4 +1394,15 @@ if st.session_state.get('audio_played', False):
 if st.session_state.tts_debug_logs:
     with st.expander("🔧 TTS Debug Info", expanded=False):
         for log_msg in st.session_state.tts_debug_logs[-5:]:  # Show last 5 messages
-            st.text(log_msg)
\ No newline at end of file
+            st.text(log_msg)
+
+# Job panel: a fragment that reruns on its own every JOB_POLL_INTERVAL_SECONDS while this session has
+# a pending job or a debouncing speculation, so waiting never holds the script thread (or the full page)
+# and finished jobs rerun the app
+with job_status_area:
+    jobs_pending = 'speculation_sends_at' in st.session_state or any(
+        not job.finished for slot, job in st.session_state.jobs.items() if slot not in SPECULATIVE_SLOTS
+    )
+    st.fragment(run_every=JOB_POLL_INTERVAL_SECONDS if jobs_pending else None)(job_panel)()
+
+ui_logger.debug(f"Script run in {(time.perf_counter() - script_started) * 1000:.1f}ms")
@@ -1,7 +1,9 @@
 import streamlit as st
 from st_audiorec import st_audiorec
 from translation_engine import TextTranslator
-from config import LOGGERS
+from audio_ingest import AudioIngestor
+from http_pool import start_warm_pool
+from config import LOGGERS, TRANSCRIPTION_CACHE_MAX_ENTRIES, TRANSCRIPTION_CACHE_MAX_BYTES
 
 # Get UI logger
 ui_logger = LOGGERS['ui']
@@ -125,13 +127,33 @@ if 'translation_direction' not in st.session_state:
     st.session_state.translation_direction = ""
 if 'transcribed_text' not in st.session_state:
     st.session_state.transcribed_text = ""
+if 'last_processed_audio' not in st.session_state:
+    st.session_state.last_processed_audio = None
+
+@st.cache_resource
+def start_http_pool():
+    """Open provider connections at process start and keep them warm (once per process)"""
+    ui_logger.info("Warming shared HTTP pool.")
+    start_warm_pool()
+    return True
 
 @st.cache_resource
 def get_translator():
     ui_logger.info("Initializing TextTranslator instance.")
     return TextTranslator()
 
+@st.cache_resource
+def get_audio_ingestor():
+    ui_logger.info("Initializing AudioIngestor instance.")
+    return AudioIngestor(
+        get_translator(),
+        max_entries=TRANSCRIPTION_CACHE_MAX_ENTRIES,
+        max_bytes=TRANSCRIPTION_CACHE_MAX_BYTES
+    )
+
+start_http_pool()
 translator = get_translator()
+audio_ingestor = get_audio_ingestor()
 
 # --- Main UI ---
 st.markdown(f"""
@@ -152,13 +174,21 @@ st.markdown("Click the record button below to dictate your text:")
 
 wav_audio_data = st_audiorec()
 
-if wav_audio_data is not None:
+audio_digest = audio_ingestor.digest(wav_audio_data) if wav_audio_data else None
+
+if audio_digest and audio_digest != st.session_state.last_processed_audio:
     with st.spinner("Transcribing speech..."):
         ui_logger.info("Audio recorded. Starting transcription.")
-        transcribed_text = translator.transcribe_audio(wav_audio_data)
+        transcription, from_cache = audio_ingestor.transcribe_detailed(wav_audio_data, audio_digest)
+        transcribed_text = transcription['text']
         
-        if not transcribed_text.startswith("Error"):
+        if not transcribed_text:
+            st.session_state.last_processed_audio = audio_digest
+            st.warning("No speech detected in the recording.")
+        elif not transcribed_text.startswith("Error"):
             st.session_state.transcribed_text = transcribed_text
+            st.session_state.transcribed_language = transcription['language']
+            st.session_state.last_processed_audio = audio_digest
             ui_logger.info(f"Transcription successful: '{transcribed_text[:50]}...'")
             st.success("Speech transcribed successfully!")
         else:
@@ -185,7 +215,11 @@ with col2:
         if input_text:
             with st.spinner("Translating..."):
                 ui_logger.info("Translate button clicked. Calling engine.")
-                translated, direction = translator.detect_and_translate(input_text)
+                # Dictated and unedited: reuse the language Whisper identified
+                source_language = None
+                if st.session_state.transcribed_text and input_text == st.session_state.transcribed_text:
+                    source_language = st.session_state.get('transcribed_language')
+                translated, direction = translator.detect_and_translate(input_text, source_language=source_language)
                 st.session_state.translated_text = translated
                 st.session_state.translation_direction = direction
                 ui_logger.info(f"Translation received. Direction: {direction}")
@@ -0,0 +1,269 @@
+import os
+import tempfile
+import threading
+import time
+import uuid
+from config import (
+    LOGGERS, ARTIFACT_DIR, ARTIFACT_TTL_SECONDS, ARTIFACT_MAX_BYTES,
+    ARTIFACT_GC_INTERVAL_SECONDS, ARTIFACT_RELEASE_GRACE_SECONDS
+)
+
+# Get audio logger
+audio_logger = LOGGERS['audio']
+
+
+class _Artifact:
+    __slots__ = ('path', 'size', 'created_at', 'accessed_at', 'released_at', 'owners')
+
+    def __init__(self, path, size, created_at):
+        self.path = path
+        self.size = size
+        self.created_at = created_at
+        self.accessed_at = created_at
+        self.released_at = created_at  # Unreferenced until a session acquires it
+        self.owners = {}  # owner -> reference count
+
+
+class ArtifactStore:
+    """
+    Managed directory for generated audio that is not in the content-addressed audio cache
+    (uncached syntheses, joined pipeline segments).
+
+    Sessions ``acquire`` the artifacts they display and ``release`` them when the
+    player is cleared; references are counted per owner. A background thread
+    deletes artifacts that have been unreferenced for ``release_grace_seconds``
+    (so a browser still fetching one isn't cut off), artifacts not accessed for
+    ``ttl_seconds`` even if referenced (Streamlit has no session-end hook, so
+    abandoned sessions never release), and the least recently used unreferenced
+    then referenced artifacts while the directory is over ``max_bytes``.
+    Files left by a previous process are adopted as unreferenced at startup.
+    """
+
+    def __init__(self, root_dir, ttl_seconds, max_bytes, gc_interval_seconds=60.0, release_grace_seconds=60.0):
+        self.root_dir = root_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.gc_interval_seconds = gc_interval_seconds
+        self.release_grace_seconds = release_grace_seconds
+
+        self._lock = threading.Lock()
+        self._artifacts = {}  # path -> _Artifact
+        self._total_bytes = 0
+        self._gc_thread = None
+        self._stop = threading.Event()
+        self.stats = {
+            'files_created': 0,
+            'bytes_created': 0,
+            'files_reclaimed': 0,
+            'bytes_reclaimed': 0,
+            'ttl_expired': 0,
+            'released_reclaimed': 0,
+            'quota_evictions': 0,
+            'gc_runs': 0,
+        }
+
+        os.makedirs(self.root_dir, exist_ok=True)
+        self._adopt_existing()
+        audio_logger.info(f"Artifact store opened at {self.root_dir} ({len(self._artifacts)} files, {self._total_bytes} bytes)")
+
+    def _adopt_existing(self):
+        for entry in os.scandir(self.root_dir):
+            if not entry.is_file():
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            if entry.name.endswith('.tmp'):
+                # Interrupted write from a previous process
+                self._remove_file(entry.path)
+                continue
+            artifact = _Artifact(os.path.abspath(entry.path), stat.st_size, stat.st_mtime)
+            self._artifacts[artifact.path] = artifact
+            self._total_bytes += artifact.size
+
+    def create(self, data, suffix='.mp3'):
+        """
+        Atomically write data as a new artifact and return its path
+
+        The artifact starts unreferenced: acquire it within release_grace_seconds
+        or the next collection reclaims it.
+        """
+        path = os.path.abspath(os.path.join(self.root_dir, f"{uuid.uuid4().hex}{suffix}"))
+        fd, temp_path = tempfile.mkstemp(dir=self.root_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                temp_file.write(data)
+            os.replace(temp_path, path)
+        except Exception:
+            self._remove_file(temp_path)
+            raise
+
+        with self._lock:
+            self._artifacts[path] = _Artifact(path, len(data), time.time())
+            self._total_bytes += len(data)
+            self.stats['files_created'] += 1
+            self.stats['bytes_created'] += len(data)
+            over_budget = self._total_bytes > self.max_bytes
+        if over_budget:
+            self.collect(keep=path)
+        return path
+
+    def is_managed(self, path):
+        with self._lock:
+            return bool(path) and os.path.abspath(path) in self._artifacts
+
+    def acquire(self, path, owner):
+        """Take a reference for owner; returns False for paths the store doesn't manage (e.g. cached audio)."""
+        if not path:
+            return False
+        with self._lock:
+            artifact = self._artifacts.get(os.path.abspath(path))
+            if artifact is None:
+                return False
+            artifact.owners[owner] = artifact.owners.get(owner, 0) + 1
+            artifact.accessed_at = time.time()
+            artifact.released_at = None
+            return True
+
+    def touch(self, path):
+        """Refresh an artifact's last access (it is still being displayed)."""
+        if not path:
+            return
+        with self._lock:
+            artifact = self._artifacts.get(os.path.abspath(path))
+            if artifact is not None:
+                artifact.accessed_at = time.time()
+
+    def release(self, path, owner):
+        """Drop one of owner's references; the file is reclaimed after the grace period once none remain."""
+        if not path:
+            return
+        with self._lock:
+            artifact = self._artifacts.get(os.path.abspath(path))
+            if artifact is None or owner not in artifact.owners:
+                return
+            artifact.owners[owner] -= 1
+            if artifact.owners[owner] <= 0:
+                del artifact.owners[owner]
+            if not artifact.owners:
+                artifact.released_at = time.time()
+
+    def release_owner(self, owner):
+        """Drop every reference held by owner (e.g. a restarted session)."""
+        now = time.time()
+        with self._lock:
+            for artifact in self._artifacts.values():
+                if artifact.owners.pop(owner, None) is not None and not artifact.owners:
+                    artifact.released_at = now
+
+    def collect(self, keep=None):
+        """
+        Delete released, expired and over-quota artifacts (never `keep`, an artifact just created)
+
+        Returns:
+            int: Number of files reclaimed
+        """
+        now = time.time()
+        doomed = []
+        with self._lock:
+            self.stats['gc_runs'] += 1
+            for artifact in list(self._artifacts.values()):
+                if artifact.released_at is not None and now - artifact.released_at >= self.release_grace_seconds:
+                    doomed.append(artifact)
+                    self.stats['released_reclaimed'] += 1
+                elif now - artifact.accessed_at >= self.ttl_seconds:
+                    doomed.append(artifact)
+                    self.stats['ttl_expired'] += 1
+            for artifact in doomed:
+                del self._artifacts[artifact.path]
+                self._total_bytes -= artifact.size
+
+            if self._total_bytes > self.max_bytes:
+                # Least recently used first, unreferenced before referenced
+                candidates = sorted(self._artifacts.values(), key=lambda a: (bool(a.owners), a.accessed_at))
+                for artifact in candidates:
+                    if self._total_bytes <= self.max_bytes:
+                        break
+                    if artifact.path == keep:
+                        continue
+                    del self._artifacts[artifact.path]
+                    self._total_bytes -= artifact.size
+                    self.stats['quota_evictions'] += 1
+                    doomed.append(artifact)
+
+            self.stats['files_reclaimed'] += len(doomed)
+            self.stats['bytes_reclaimed'] += sum(artifact.size for artifact in doomed)
+
+        for artifact in doomed:
+            self._remove_file(artifact.path)
+        if doomed:
+            audio_logger.info(f"Artifact GC reclaimed {len(doomed)} files ({sum(a.size for a in doomed)} bytes)")
+        return len(doomed)
+
+    @staticmethod
+    def _remove_file(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            audio_logger.warning(f"Could not delete artifact {path}: {e}")
+
+    def start_gc(self):
+        """Run collect() every gc_interval_seconds on a daemon thread (idempotent)."""
+        with self._lock:
+            if self._gc_thread is not None:
+                return
+            self._gc_thread = threading.Thread(target=self._gc_loop, name="artifact-gc", daemon=True)
+            self._gc_thread.start()
+
+    def stop_gc(self):
+        self._stop.set()
+
+    def _gc_loop(self):
+        while not self._stop.wait(self.gc_interval_seconds):
+            try:
+                self.collect()
+            except Exception as e:
+                audio_logger.error(f"Artifact GC failed: {e}")
+
+    def get_stats(self):
+        """Return creation/reclaim counters plus current files and bytes on disk."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['files'] = len(self._artifacts)
+            stats['referenced_files'] = sum(1 for artifact in self._artifacts.values() if artifact.owners)
+            stats['disk_bytes'] = self._total_bytes
+            return stats
+
+
+_store_lock = threading.Lock()
+_store = None
+
+
+def get_artifact_store():
+    """Process-wide artifact store (configured from config), with background GC running."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ArtifactStore(
+                ARTIFACT_DIR,
+                ttl_seconds=ARTIFACT_TTL_SECONDS,
+                max_bytes=ARTIFACT_MAX_BYTES,
+                gc_interval_seconds=ARTIFACT_GC_INTERVAL_SECONDS,
+                release_grace_seconds=ARTIFACT_RELEASE_GRACE_SECONDS
+            )
+            _store.start_gc()
+        return _store
+
+
+def write_artifact(data, suffix='.mp3'):
+    """Write generated audio into the artifact store; falls back to an unmanaged temp file if the store is unusable."""
+    try:
+        return get_artifact_store().create(data, suffix=suffix)
+    except Exception as e:
+        audio_logger.warning(f"Artifact store unavailable, using unmanaged temp file: {e}")
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
+            temp_file.write(data)
+            return temp_file.name
@@ -0,0 +1,566 @@
+import asyncio
+import io
+import time
+from collections import deque
+from groq import AsyncGroq
+from elevenlabs.client import AsyncElevenLabs
+from config import (
+    GROQ_API_KEY, ELEVEN_LABS_API_KEY, LOGGERS,
+    LANGUAGE_DETECTION_CONFIDENCE_THRESHOLD, SINGLE_ROUND_TRIP_TRANSLATION,
+    TRANSLATION_CHUNK_TOKENS, TRANSLATION_CHUNK_CONCURRENCY,
+    AUDIO_CACHE_ENABLED, AUDIO_CACHE_DIR, AUDIO_CACHE_MAX_BYTES,
+    AUDIO_PREPROCESSING_ENABLED, TRANSCRIPTION_SAMPLE_RATE
+)
+from language_detector import get_language_detector
+from translation_engine import (
+    TRANSLATION_MODEL, DETECTION_SYSTEM_PROMPT, COMBINED_SYSTEM_PROMPT, UNSUPPORTED_LANGUAGE_MESSAGE,
+    parse_combined_response, translation_route, new_stream_record, stream_chunk_usage,
+    create_translation_cache, cache_lookup, cache_store, store_combined_result, detect_language_locally,
+    estimate_tokens, plan_chunks, chunk_request, clean_chunk_translation, assemble_chunks
+)
+from resilience import is_retryable
+from audio_cache import AudioCache, make_audio_key
+from audio_processing import prepare_for_transcription
+from audio_handler import TTS_MODEL_ID, TTS_OUTPUT_FORMAT, TTS_VOICE_SETTINGS
+from http_pool import get_async_http_client
+from artifact_store import write_artifact
+
+# Get specialized loggers
+api_logger = LOGGERS['api']
+audio_logger = LOGGERS['audio']
+translation_logger = LOGGERS['transcription']  # Re-using for consistency
+
+def _read_file(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+class AsyncTextTranslator:
+    """
+    asyncio counterpart of TextTranslator built on AsyncGroq.
+
+    Same operations, prompts and cache keys as the blocking engine (the helpers
+    come from translation_engine and the two can share a TranslationCache), but
+    every request is a coroutine on the shared pooled HTTP client from
+    http_pool, so many sessions can have requests in flight without a thread
+    each. Cache reads and writes touch SQLite, so they run in worker threads.
+    Run it on the engine loop (http_pool.submit / run_coroutine).
+    """
+
+    def __init__(self, cache=None, detection_threshold=LANGUAGE_DETECTION_CONFIDENCE_THRESHOLD,
+                 single_round_trip=SINGLE_ROUND_TRIP_TRANSLATION, max_chunk_tokens=TRANSLATION_CHUNK_TOKENS,
+                 chunk_concurrency=TRANSLATION_CHUNK_CONCURRENCY, http_client=None):
+        translation_logger.info("Initializing AsyncTextTranslator with AsyncGroq")
+        try:
+            self.client = AsyncGroq(api_key=GROQ_API_KEY, http_client=http_client or get_async_http_client())
+            translation_logger.info("AsyncGroq client initialized successfully on the shared HTTP pool.")
+        except Exception as e:
+            translation_logger.error(f"Failed to initialize AsyncGroq client: {e}")
+            raise
+
+        # Translation cache (in-process LRU + SQLite); None disables caching
+        self.cache = cache if cache is not None else create_translation_cache()
+
+        self.language_detector = get_language_detector()
+        self.detection_threshold = detection_threshold
+        self.single_round_trip = single_round_trip
+
+        # Inputs above max_chunk_tokens are translated as concurrent chunks
+        self.max_chunk_tokens = max_chunk_tokens
+        self.chunk_concurrency = chunk_concurrency
+
+    async def _cache_get(self, text, direction, system_prompt, use_cache):
+        """Look up a cached result off the loop; returns (key, value) where value is None on a miss."""
+        if not use_cache or self.cache is None:
+            return None, None
+        return await asyncio.to_thread(cache_lookup, self.cache, text, direction, system_prompt)
+
+    async def _cache_put(self, key, value):
+        """Store a successful result under a key returned by _cache_get, off the loop."""
+        if key is not None and self.cache is not None:
+            await asyncio.to_thread(cache_store, self.cache, key, value)
+
+    def get_cache_stats(self):
+        """Return translation cache counters, or None when caching is disabled."""
+        return self.cache.get_stats() if self.cache is not None else None
+
+    def _detect_language_locally(self, text):
+        """Offline statistical detection (no network); None when not confident enough."""
+        return detect_language_locally(self.language_detector, text, self.detection_threshold)
+
+    async def _request_detection(self, text):
+        """One Groq language detection call; returns the cleaned response and raises on API errors."""
+        start_time = time.time()
+        chat_completion = await self.client.chat.completions.create(
+            messages=[
+                {"role": "system", "content": DETECTION_SYSTEM_PROMPT},
+                {"role": "user", "content": text}
+            ],
+            model=TRANSLATION_MODEL,
+            temperature=0.0,
+            max_tokens=5
+        )
+        detected_lang = chat_completion.choices[0].message.content.strip().upper()
+        api_logger.info(f"Async language detection completed in {time.time() - start_time:.2f}s: '{detected_lang}'")
+        return detected_lang
+
+    async def _request_translation(self, text, system_prompt, label, max_tokens=2000):
+        """One Groq translation call; raises on API errors."""
+        start_time = time.time()
+        chat_completion = await self.client.chat.completions.create(
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": text}
+            ],
+            model=TRANSLATION_MODEL,
+            temperature=0.0,
+            max_tokens=max_tokens
+        )
+        result = chat_completion.choices[0].message.content.strip()
+        api_logger.info(f"Async {label.lower()} translation completed in {time.time() - start_time:.2f}s: '{result[:100]}...'")
+        return result
+
+    async def _detect_language(self, text, use_cache=True):
+        """Detect if the text is English or Spanish using the local classifier + Groq fallback."""
+        detected_lang = self._detect_language_locally(text)
+        if detected_lang is not None:
+            return detected_lang
+
+        cache_key, cached = await self._cache_get(text, "detect", DETECTION_SYSTEM_PROMPT, use_cache)
+        if cached is not None:
+            api_logger.info(f"Language detection cache hit: {cached}")
+            return cached
+
+        try:
+            detected_lang = await self._request_detection(text)
+        except Exception as e:
+            api_logger.error(f"Async language detection failed: {e}")
+            return "UNKNOWN"
+        if detected_lang in ["ENGLISH", "SPANISH"]:
+            await self._cache_put(cache_key, detected_lang)
+            return detected_lang
+        api_logger.warning(f"Unexpected language detection response: '{detected_lang}', returning UNKNOWN")
+        return "UNKNOWN"
+
+    async def _translate(self, text, detected_language, use_cache=True):
+        """Translate text whose language is known; returns (translation, direction) and raises on API errors."""
+        system_prompt, cache_direction, direction, label = translation_route(detected_language)
+        cache_key, cached = await self._cache_get(text, cache_direction, system_prompt, use_cache)
+        if cached is not None:
+            api_logger.info(f"{label.capitalize()} translation cache hit: '{cached[:100]}...'")
+            return cached, direction
+        if estimate_tokens(text) > self.max_chunk_tokens:
+            report = await self._translate_chunked(text, system_prompt, cache_direction, label, use_cache=use_cache)
+            if report["error"] is not None:
+                raise RuntimeError(report["error"])
+            translation = report["translation"]
+        else:
+            translation = await self._request_translation(text, system_prompt, label)
+        await self._cache_put(cache_key, translation)
+        return translation, direction
+
+    async def _translate_chunk(self, index, chunk, context, system_prompt, cache_direction, label, use_cache):
+        """Translate one chunk with its context into a record (see TextTranslator._translate_chunk)."""
+        chunk_prompt, user_content, max_tokens = chunk_request(chunk, context, system_prompt)
+        record = {"index": index, "source_chars": len(chunk), "seconds": 0.0, "cached": False, "error": None}
+        start_time = time.time()
+        cache_key, cached = await self._cache_get(user_content, cache_direction, chunk_prompt, use_cache)
+        if cached is not None:
+            record.update(cached=True, translation=cached)
+            return record
+        try:
+            translation = await self._request_translation(user_content, chunk_prompt, f"{label} chunk {index}", max_tokens=max_tokens)
+        except Exception as e:
+            translation_logger.error(f"Async chunk {index} translation failed: {e}")
+            record.update(translation=None, seconds=time.time() - start_time, error=str(e))
+            return record
+        translation = clean_chunk_translation(translation)
+        await self._cache_put(cache_key, translation)
+        record.update(translation=translation, seconds=time.time() - start_time)
+        return record
+
+    async def _translate_chunked(self, text, system_prompt, cache_direction, label, use_cache=True):
+        """Translate a long text as concurrent chunks; same report as TextTranslator._translate_chunked."""
+        start_time = time.time()
+        chunks, jobs = plan_chunks(text, self.max_chunk_tokens)
+        translation_logger.info(f"Translating {len(chunks)} chunks of ~{self.max_chunk_tokens} tokens ({len(text)} chars)")
+        semaphore = asyncio.Semaphore(max(1, self.chunk_concurrency))
+
+        async def run(job):
+            async with semaphore:
+                return await self._translate_chunk(*job, system_prompt, cache_direction, label, use_cache)
+
+        records = await asyncio.gather(*(run(job) for job in jobs))
+        return assemble_chunks(chunks, records, time.time() - start_time)
+
+    async def _detect_and_translate_combined(self, text, use_cache=True):
+        """Single JSON-mode detect + translate call; None if malformed, failed or too long (see TextTranslator)."""
+        if estimate_tokens(text) > self.max_chunk_tokens:
+            return None
+        _, cached = await self._cache_get(text, "detect", DETECTION_SYSTEM_PROMPT, use_cache)
+        if cached is not None:
+            return None
+        try:
+            start_time = time.time()
+            chat_completion = await self.client.chat.completions.create(
+                messages=[
+                    {"role": "system", "content": COMBINED_SYSTEM_PROMPT},
+                    {"role": "user", "content": text}
+                ],
+                model=TRANSLATION_MODEL,
+                temperature=0.0,
+                max_tokens=2000,
+                response_format={"type": "json_object"}
+            )
+            api_logger.info(f"Async single-round-trip call completed in {time.time() - start_time:.2f}s")
+            source_language, translation = parse_combined_response(chat_completion.choices[0].message.content)
+        except Exception as e:
+            api_logger.warning(f"Single-round-trip translation unusable ({e}), falling back to two calls")
+            return None
+
+        if use_cache and self.cache is not None:
+            await asyncio.to_thread(store_combined_result, self.cache, text, source_language, translation)
+        return translation, translation_route(source_language)[2]
+
+    async def detect_and_translate(self, text, use_cache=True):
+        """
+        Automatically detects the language and translates it to the other.
+
+        Args:
+            text (str): English or Spanish text
+            use_cache (bool): Set to False to bypass the translation cache for this call
+
+        Returns:
+            tuple: (translation, direction)
+        """
+        translation_logger.info(f"Starting async translation for text: '{text[:50]}...'")
+        if self.single_round_trip and self._detect_language_locally(text) is None:
+            combined = await self._detect_and_translate_combined(text, use_cache=use_cache)
+            if combined is not None:
+                return combined
+
+        detected_language = await self._detect_language(text, use_cache=use_cache)
+        if detected_language not in ("ENGLISH", "SPANISH"):
+            return UNSUPPORTED_LANGUAGE_MESSAGE, "Unknown"
+        try:
+            return await self._translate(text, detected_language, use_cache=use_cache)
+        except Exception as e:
+            translation_logger.error(f"Async translation failed: {e}")
+            return f"Error during text translation: {str(e)}", translation_route(detected_language)[2]
+
+    async def detect_and_translate_stream(self, text, use_cache=True):
+        """
+        Async-generator variant of TextTranslator.detect_and_translate_stream.
+
+        Yields translation deltas (str), then one final record (dict) with keys
+        translation, direction, usage, cached, cancelled, first_token_seconds, error.
+        Cancel by cancelling the consuming task or calling aclose(); the HTTP
+        stream is closed either way.
+        """
+        record = new_stream_record()
+
+        route = translation_route(await self._detect_language(text, use_cache=use_cache))
+        if route is None:
+            record["translation"] = UNSUPPORTED_LANGUAGE_MESSAGE
+            yield record["translation"]
+            yield record
+            return
+        system_prompt, cache_direction, direction, label = route
+        record["direction"] = direction
+
+        cache_key, cached = await self._cache_get(text, cache_direction, system_prompt, use_cache)
+        if cached is not None:
+            record.update(translation=cached, cached=True, first_token_seconds=0.0)
+            yield cached
+            yield record
+            return
+
+        # Long inputs can't fit one response; translate them as chunks and emit the result at once
+        if estimate_tokens(text) > self.max_chunk_tokens:
+            report = await self._translate_chunked(text, system_prompt, cache_direction, label, use_cache=use_cache)
+            if report["error"] is not None:
+                record["translation"] = f"Error during text translation: {report['error']}"
+                record["error"] = report["error"]
+            else:
+                record["translation"] = report["translation"]
+                await self._cache_put(cache_key, report["translation"])
+            yield record["translation"]
+            yield record
+            return
+
+        parts = []
+        stream = None
+        failed = False
+        start_time = time.time()
+        try:
+            stream = await self.client.chat.completions.create(
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": text}
+                ],
+                model=TRANSLATION_MODEL,
+                temperature=0.0,
+                max_tokens=2000,
+                stream=True
+            )
+            async for chunk in stream:
+                usage = stream_chunk_usage(chunk)
+                if usage is not None:
+                    record["usage"] = usage
+
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    if record["first_token_seconds"] is None:
+                        record["first_token_seconds"] = time.time() - start_time
+                    if not parts:
+                        delta = delta.lstrip()
+                        if not delta:
+                            continue
+                    parts.append(delta)
+                    yield delta
+        except asyncio.CancelledError:
+            record["cancelled"] = True
+            raise
+        except Exception as e:
+            translation_logger.error(f"Async streaming translation failed: {e}")
+            failed = True
+            record["error"] = str(e)
+            if not parts:
+                parts.append(f"Error during text translation: {str(e)}")
+                yield parts[0]
+        finally:
+            if stream is not None:
+                await stream.close()
+
+        record["translation"] = "".join(parts).strip()
+        api_logger.info(f"Async streaming translation finished in {time.time() - start_time:.2f}s")
+        if not failed and record["translation"]:
+            await self._cache_put(cache_key, record["translation"])
+        yield record
+
+    async def transcribe_audio(self, audio_bytes):
+        """Transcribe audio to text using Groq Whisper large-v3-turbo"""
+        if AUDIO_PREPROCESSING_ENABLED:
+            try:
+                prepared_bytes, preparation = await asyncio.to_thread(
+                    prepare_for_transcription, audio_bytes, TRANSCRIPTION_SAMPLE_RATE
+                )
+            except Exception as e:
+                translation_logger.warning(f"Audio preprocessing skipped: {e}")
+            else:
+                if prepared_bytes is None:
+                    translation_logger.info("No speech in recording, skipping transcription")
+                    return ""
+                api_logger.info(f"Audio preprocessing: {preparation['original_bytes']} -> {preparation['prepared_bytes']} bytes")
+                audio_bytes = prepared_bytes
+        try:
+            start_time = time.time()
+            audio_file = io.BytesIO(audio_bytes)
+            audio_file.name = "audio.wav"  # Required by Groq API
+            transcription = await self.client.audio.transcriptions.create(
+                file=audio_file,
+                model="whisper-large-v3-turbo",
+                response_format="text",
+                language=None  # Auto-detect language
+            )
+            api_logger.info(f"Async audio transcription completed in {time.time() - start_time:.2f}s")
+            return str(transcription).strip()
+        except Exception as e:
+            translation_logger.error(f"Async audio transcription failed: {e}")
+            return f"Error during audio transcription: {str(e)}"
+
+    async def _translate_item(self, text, use_cache):
+        """Translate one batch item into a record; transient errors are retried by the AsyncGroq client."""
+        try:
+            detected_language = self._detect_language_locally(text)
+            if detected_language is None and self.single_round_trip:
+                combined = await self._detect_and_translate_combined(text, use_cache=use_cache)
+                if combined is not None:
+                    return {"translation": combined[0], "direction": combined[1], "error": None}
+            if detected_language is None:
+                detect_key, detected_language = await self._cache_get(text, "detect", DETECTION_SYSTEM_PROMPT, use_cache)
+                if detected_language is None:
+                    detected_language = await self._request_detection(text)
+                    if detected_language not in ("ENGLISH", "SPANISH"):
+                        raise ValueError(f"Unsupported or undetected language: '{detected_language}'")
+                    await self._cache_put(detect_key, detected_language)
+            translation, direction = await self._translate(text, detected_language, use_cache=use_cache)
+            return {"translation": translation, "direction": direction, "error": None}
+        except Exception as e:
+            translation_logger.error(f"Async batch item failed: {e}")
+            return {
+                "translation": None,
+                "direction": "Unknown",
+                "error": {"type": type(e).__name__, "message": str(e), "retryable": is_retryable(e)}
+            }
+
+    async def translate_batch(self, texts, concurrency=16, ordered=True, use_cache=True):
+        """
+        Translate many texts with at most ``concurrency`` requests in flight.
+
+        Same records and semantics as TextTranslator.translate_batch (lazy input,
+        at most 2 x concurrency items read ahead, dedupe, structured errors), but
+        concurrency costs coroutines rather than threads.
+
+        Yields:
+            dict: {"index", "text", "translation", "direction", "error"}
+        """
+        concurrency = max(1, concurrency)
+        window = 2 * concurrency
+        semaphore = asyncio.Semaphore(concurrency)
+        tasks_by_text = {}  # Dedupe: every occurrence of a text shares one task
+        pending = deque()  # (index, text, task) not yet yielded, in input order
+
+        async def run(text):
+            async with semaphore:
+                return await self._translate_item(text, use_cache)
+
+        async def drain(block):
+            # Finished items; with block=True, wait until at least one is ready
+            if ordered:
+                if block:
+                    await asyncio.wait({pending[0][2]})
+                ready = []
+                while pending and pending[0][2].done():
+                    ready.append(pending.popleft())
+            else:
+                if block:
+                    await asyncio.wait({task for _, _, task in pending}, return_when=asyncio.FIRST_COMPLETED)
+                ready = [item for item in pending if item[2].done()]
+                for item in ready:
+                    pending.remove(item)
+            return [{"index": index, "text": text, **task.result()} for index, text, task in ready]
+
+        try:
+            for index, text in enumerate(texts):
+                task = tasks_by_text.get(text)
+                if task is None:
+                    task = tasks_by_text[text] = asyncio.ensure_future(run(text))
+                pending.append((index, text, task))
+                for record in await drain(block=len(pending) >= window):
+                    yield record
+            while pending:
+                for record in await drain(block=True):
+                    yield record
+        finally:
+            for task in tasks_by_text.values():
+                task.cancel()
+
+
+class AsyncTextToSpeechHandler:
+    """
+    asyncio counterpart of TextToSpeechHandler's synthesis built on AsyncElevenLabs.
+
+    Uses the shared pooled HTTP client from http_pool and the same audio cache
+    keys as the blocking handler. Voice catalog lookups stay on
+    TextToSpeechHandler, which makes no network calls for them.
+    """
+
+    def __init__(self, audio_cache=None, http_client=None):
+        audio_logger.info("Initializing AsyncTextToSpeechHandler with AsyncElevenLabs")
+        if not ELEVEN_LABS_API_KEY:
+            audio_logger.error("ElevenLabs API key not found in environment variables")
+            raise ValueError("ElevenLabs API key is required")
+        try:
+            self.client = AsyncElevenLabs(api_key=ELEVEN_LABS_API_KEY, httpx_client=http_client or get_async_http_client())
+            audio_logger.info("AsyncElevenLabs client initialized successfully on the shared HTTP pool")
+        except Exception as e:
+            audio_logger.error(f"Failed to initialize AsyncElevenLabs client: {e}")
+            raise
+
+        if audio_cache is None and AUDIO_CACHE_ENABLED:
+            try:
+                audio_cache = AudioCache(AUDIO_CACHE_DIR, max_bytes=AUDIO_CACHE_MAX_BYTES)
+            except Exception as e:
+                audio_logger.warning(f"Audio cache unavailable, synthesizing without cache: {e}")
+        self.audio_cache = audio_cache
+
+    def _cache_key(self, text, voice_id, use_cache):
+        if not use_cache or self.audio_cache is None:
+            return None
+        return make_audio_key(text, voice_id, TTS_MODEL_ID, TTS_VOICE_SETTINGS, TTS_OUTPUT_FORMAT)
+
+    def _store(self, cache_key, audio_bytes):
+        """Write synthesized audio to the cache (or an artifact); blocking, so run off the loop."""
+        if cache_key is not None:
+            try:
+                return self.audio_cache.put(cache_key, audio_bytes)
+            except Exception as e:
+                audio_logger.warning(f"Failed to write audio cache, using artifact: {e}")
+        return write_artifact(audio_bytes)
+
+    async def generate_audio_with_voice_id(self, text, voice_id, voice_name, use_cache=True):
+        """
+        Synthesize text and return the path to an MP3 file (cached or artifact), or None if failed
+        """
+        audio_logger.info(f"Async TTS with voice: {voice_name} (ID: {voice_id})")
+        cache_key = self._cache_key(text, voice_id, use_cache)
+        if cache_key is not None:
+            cached_path = await asyncio.to_thread(self.audio_cache.get, cache_key, text_length=len(text))
+            if cached_path:
+                audio_logger.info(f"TTS cache hit: {cached_path}")
+                return cached_path
+
+        try:
+            start_time = time.time()
+            parts = []
+            async for chunk in self.client.text_to_speech.convert(
+                text=text,
+                voice_id=voice_id,
+                model_id=TTS_MODEL_ID,
+                output_format=TTS_OUTPUT_FORMAT,
+                voice_settings=TTS_VOICE_SETTINGS
+            ):
+                parts.append(chunk)
+            audio_bytes = b''.join(parts)
+            audio_logger.info(f"Async TTS request successful in {time.time() - start_time:.2f}s. Audio size: {len(audio_bytes)} bytes")
+        except Exception as e:
+            audio_logger.error(f"Async TTS request failed: {e}")
+            return None
+
+        return await asyncio.to_thread(self._store, cache_key, audio_bytes)
+
+    async def stream_audio_with_voice_id(self, text, voice_id, voice_name, use_cache=True, chunk_size=32 * 1024):
+        """
+        Async-generator variant of TextToSpeechHandler.stream_audio_with_voice_id
+
+        Yields:
+            bytes: MP3 chunks; the complete clip is written to the audio cache at the end
+
+        Raises:
+            Exception: The provider error if the stream fails, so a failed stream never
+                       looks like a short successful one
+        """
+        audio_logger.info(f"Async streaming TTS with voice: {voice_name} (ID: {voice_id})")
+        cache_key = self._cache_key(text, voice_id, use_cache)
+        if cache_key is not None:
+            cached_path = await asyncio.to_thread(self.audio_cache.get, cache_key, text_length=len(text))
+            if cached_path:
+                audio_bytes = await asyncio.to_thread(_read_file, cached_path)
+                for start in range(0, len(audio_bytes), chunk_size):
+                    yield audio_bytes[start:start + chunk_size]
+                return
+
+        parts = []
+        try:
+            async for chunk in self.client.text_to_speech.stream(
+                text=text,
+                voice_id=voice_id,
+                model_id=TTS_MODEL_ID,
+                output_format=TTS_OUTPUT_FORMAT,
+                voice_settings=TTS_VOICE_SETTINGS
+            ):
+                if chunk:
+                    parts.append(chunk)
+                    yield chunk
+        except Exception as e:
+            audio_logger.error(f"Async streaming TTS request failed: {e}")
+            raise
+
+        if cache_key is not None and parts:
+            await asyncio.to_thread(self._store, cache_key, b''.join(parts))
+
+    def get_cache_stats(self):
+        """Return audio cache counters, or None when caching is disabled."""
+        return self.audio_cache.get_stats() if self.audio_cache is not None else None
+
@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from config import LOGGERS
+
+# Get audio logger
+audio_logger = LOGGERS['audio']
+
+
+def make_audio_key(text, voice_id, model_id, voice_settings, output_format):
+    """Content address for a synthesis request: sha256 of the full request tuple."""
+    payload = json.dumps(
+        [text, voice_id, model_id, voice_settings or {}, output_format],
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class AudioCache:
+    """
+    Content-addressed on-disk store for synthesized audio.
+
+    Files are named after their key, written atomically (temp file + os.replace) so
+    several processes can share one directory, and evicted least-recently-used first
+    once the directory grows past ``max_bytes``. Recency is tracked with file mtimes,
+    which are bumped on every hit.
+    """
+
+    def __init__(self, cache_dir, max_bytes, extension='mp3'):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.extension = extension
+
+        self._lock = threading.Lock()
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'writes': 0,
+            'evictions': 0,
+            'characters_saved': 0,
+            'bytes_served': 0,
+        }
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._total_bytes = self._scan_total_bytes()
+        audio_logger.info(f"Audio cache opened at {self.cache_dir} ({self._total_bytes} bytes on disk)")
+
+    def path_for(self, key):
+        return os.path.join(self.cache_dir, f"{key}.{self.extension}")
+
+    def _scan_entries(self):
+        """Return (mtime, size, path) for every cached file."""
+        entries = []
+        suffix = f".{self.extension}"
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(suffix):
+                try:
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                except FileNotFoundError:
+                    continue  # Removed by another process
+        return entries
+
+    def _scan_total_bytes(self):
+        return sum(size for _, size, _ in self._scan_entries())
+
+    def get(self, key, text_length=0):
+        """Return the cached file path for key (refreshing its recency), or None."""
+        path = self.path_for(key)
+        try:
+            os.utime(path, None)
+            size = os.path.getsize(path)
+        except OSError:
+            with self._lock:
+                self.stats['misses'] += 1
+            return None
+        with self._lock:
+            self.stats['hits'] += 1
+            self.stats['characters_saved'] += text_length
+            self.stats['bytes_served'] += size
+        return path
+
+    def put(self, key, audio_bytes):
+        """Atomically store audio bytes under key and return the final path."""
+        path = self.path_for(key)
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                temp_file.write(audio_bytes)
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        with self._lock:
+            self.stats['writes'] += 1
+            self._total_bytes += len(audio_bytes)
+            over_budget = self._total_bytes > self.max_bytes
+        if over_budget:
+            self._evict(keep=path)
+        return path
+
+    def _evict(self, keep=None):
+        """Delete least recently used files until the directory fits in max_bytes."""
+        with self._lock:
+            entries = sorted(self._scan_entries())
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                if path == keep:
+                    continue
+                try:
+                    os.remove(path)
+                    total -= size
+                    self.stats['evictions'] += 1
+                    audio_logger.debug(f"Evicted cached audio: {path}")
+                except FileNotFoundError:
+                    total -= size
+            self._total_bytes = total
+
+    def get_stats(self):
+        """Return hit/miss counters and current disk usage."""
+        with self._lock:
+            stats = dict(self.stats)
+            lookups = stats['hits'] + stats['misses']
+            stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+            stats['disk_bytes'] = self._total_bytes
+            return stats
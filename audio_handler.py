@@ -1,186 +1,82 @@
 import io
-import pandas as pd
 import os
 from elevenlabs.client import ElevenLabs
-from config import ELEVEN_LABS_API_KEY, LOGGERS
+from config import (
+    ELEVEN_LABS_API_KEY, LOGGERS, TTS_DEADLINE_SECONDS,
+    AUDIO_CACHE_ENABLED, AUDIO_CACHE_DIR, AUDIO_CACHE_MAX_BYTES
+)
+from audio_cache import AudioCache, make_audio_key
+from resilience import get_caller
+from http_pool import get_http_client
+from artifact_store import write_artifact
+from voice_catalog import get_voice_catalog
 
 # Get audio logger
 audio_logger = LOGGERS['audio']
 
+# Synthesis settings (also part of the audio cache key)
+TTS_MODEL_ID = "eleven_flash_v2_5"  # Ultra-fast model ~75ms, supports all languages
+TTS_OUTPUT_FORMAT = "mp3_44100_128"
+TTS_VOICE_SETTINGS = {
+    "stability": 0.5,
+    "similarity_boost": 0.5,
+    "style": 0.0,
+    "use_speaker_boost": True
+}
+
+# The ElevenLabs SDK retries by itself (twice by default); the resilience wrappers are
+# the only retry layer, so SDK retries are off on every call (like Groq's max_retries=0)
+SDK_REQUEST_OPTIONS = {"max_retries": 0}
+
 class TextToSpeechHandler:
-    def __init__(self):
+    def __init__(self, audio_cache=None):
         audio_logger.info("Initializing TextToSpeechHandler with ElevenLabs SDK")
         self.api_key = ELEVEN_LABS_API_KEY
         
-        # Load voices from CSV
-        self.voices = self._load_voices_from_csv()
-        
         if not self.api_key:
             audio_logger.error("ElevenLabs API key not found in environment variables")
             raise ValueError("ElevenLabs API key is required")
         
         # Initialize ElevenLabs client
         try:
-            self.client = ElevenLabs(api_key=self.api_key)
+            # Shared keep-alive pool (see http_pool) instead of a per-client default pool
+            self.client = ElevenLabs(api_key=self.api_key, httpx_client=get_http_client())
             audio_logger.info("ElevenLabs SDK client initialized successfully")
         except Exception as e:
             audio_logger.error(f"Failed to initialize ElevenLabs client: {e}")
             raise
         
-        audio_logger.info("TextToSpeechHandler initialized successfully")
-
-    def _load_voices_from_csv(self):
-        """Load voice configurations from CSV file with proper multiline handling"""
-        try:
-            csv_path = "reference/22spanish_voices_complete - spanish_voices_complete.csv"
-            if os.path.exists(csv_path):
-                # Read CSV with proper multiline handling
-                df = pd.read_csv(csv_path, quotechar='"', skipinitialspace=True)
-                
-                # Clean up the dataframe by removing rows where essential fields are NaN
-                df = df.dropna(subset=['voice_id', 'name', 'gender', 'language'])
-                
-                # Filter for English and Spanish voices only - load ALL available
-                english_voices = df[df['language'] == 'en']  # Get ALL English voices
-                spanish_voices = df[df['language'] == 'es']  # Get ALL Spanish voices
-                
-                voices = {
-                    'english': {},
-                    'spanish': {}
-                }
-                
-                audio_logger.info(f"Processing {len(english_voices)} English and {len(spanish_voices)} Spanish voices from CSV")
-                
-                # Add English voices
-                for _, row in english_voices.iterrows():
-                    try:
-                        # Clean up multiline names and descriptions
-                        clean_name = str(row['name']).replace('\n', ' ').replace('  ', ' ').strip()
-                        clean_name = clean_name.split(' - ')[0].strip()  # Remove extra descriptors after dash
-                        # Handle names like "Santiago Latinamerican Spanish" - keep only the first name
-                        if len(clean_name.split()) > 2 and 'spanish' in clean_name.lower():
-                            clean_name = clean_name.split()[0]
-                        
-                        gender_emoji = "👨" if str(row['gender']).lower() == 'male' else "👩"
-                        accent = str(row['accent']).replace('nan', '').replace('NaN', '').strip()
-                        accent_label = f" ({accent.title()})" if accent and accent != '' and accent.lower() != 'standard' else ""
-                        
-                        display_name = f"{gender_emoji} {clean_name}{accent_label}"
-                        
-                        # Clean description
-                        description = str(row['description']).replace('\n', ' ').replace('  ', ' ').strip()
-                        if description == 'nan' or description == 'NaN':
-                            description = f"Professional {str(row['gender']).lower()} voice"
-                        
-                        voices['english'][display_name] = {
-                            'voice_id': str(row['voice_id']).strip(),
-                            'name': clean_name,
-                            'gender': str(row['gender']).strip(),
-                            'accent': accent,
-                            'description': description[:100] + "..." if len(description) > 100 else description
-                        }
-                        
-                        audio_logger.debug(f"Added English voice: {display_name} (ID: {row['voice_id']})")
-                        
-                    except Exception as e:
-                        audio_logger.warning(f"Skipping English voice due to parsing error: {e}")
-                        continue
-                
-                # Add Spanish voices  
-                for _, row in spanish_voices.iterrows():
-                    try:
-                        # Clean up multiline names and descriptions
-                        clean_name = str(row['name']).replace('\n', ' ').replace('  ', ' ').strip()
-                        clean_name = clean_name.split(' - ')[0].strip()  # Remove extra descriptors after dash
-                        # Handle names like "Santiago Latinamerican Spanish" - keep only the first name
-                        if len(clean_name.split()) > 2 and 'spanish' in clean_name.lower():
-                            clean_name = clean_name.split()[0]
-                        
-                        gender_emoji = "👨" if str(row['gender']).lower() == 'male' else "👩"
-                        accent = str(row['accent']).replace('nan', '').replace('NaN', '').strip()
-                        accent_label = f" ({accent.title()})" if accent and accent != '' and accent.lower() != 'standard' else ""
-                        
-                        display_name = f"{gender_emoji} {clean_name}{accent_label}"
-                        
-                        # Clean description
-                        description = str(row['description']).replace('\n', ' ').replace('  ', ' ').strip()
-                        if description == 'nan' or description == 'NaN':
-                            description = f"Professional {str(row['gender']).lower()} voice"
-                        
-                        voices['spanish'][display_name] = {
-                            'voice_id': str(row['voice_id']).strip(),
-                            'name': clean_name,
-                            'gender': str(row['gender']).strip(),
-                            'accent': accent,
-                            'description': description[:100] + "..." if len(description) > 100 else description
-                        }
-                        
-                        audio_logger.debug(f"Added Spanish voice: {display_name} (ID: {row['voice_id']})")
-                        
-                    except Exception as e:
-                        audio_logger.warning(f"Skipping Spanish voice due to parsing error: {e}")
-                        continue
-                
-                audio_logger.info(f"Successfully loaded {len(voices['english'])} English and {len(voices['spanish'])} Spanish voices from CSV")
-                return voices
-                
-            else:
-                audio_logger.warning("Voice CSV file not found, using default voices")
-        except Exception as e:
-            audio_logger.error(f"Error loading voices from CSV: {e}")
-            audio_logger.error(f"CSV parsing failed, falling back to default voices")
+        # Content-addressed audio cache; None disables caching
+        if audio_cache is None and AUDIO_CACHE_ENABLED:
+            try:
+                audio_cache = AudioCache(AUDIO_CACHE_DIR, max_bytes=AUDIO_CACHE_MAX_BYTES)
+            except Exception as e:
+                audio_logger.warning(f"Audio cache unavailable, synthesizing without cache: {e}")
+        self.audio_cache = audio_cache
         
-        # Fallback to default voices if CSV loading fails
-        return {
-            'english': {
-                '👩 Sarah (American)': {
-                    'voice_id': 'EXAVITQu4vr4xnSDxMaL',
-                    'name': 'Sarah',
-                    'gender': 'female',
-                    'accent': 'american',
-                    'description': 'Young adult woman with a confident and warm, mature quality...'
-                },
-                '👨 Will (American)': {
-                    'voice_id': 'bIHbv24MWmeRgasZH58o',
-                    'name': 'Will',
-                    'gender': 'male',
-                    'accent': 'american',
-                    'description': 'Conversational and laid back...'
-                }
-            },
-            'spanish': {
-                '👩 Lumina (Colombian)': {
-                    'voice_id': 'x5IDPSl4ZUbhosMmVFTk',
-                    'name': 'Lumina',
-                    'gender': 'female',
-                    'accent': 'colombian',
-                    'description': 'A neutral and versatile female voice, characterized by its clarity...'
-                },
-                '👨 Santiago (Mexican)': {
-                    'voice_id': '15bJsujCI3tcDWeoZsQP',
-                    'name': 'Santiago',
-                    'gender': 'male',
-                    'accent': 'mexican',
-                    'description': 'Young Spanish Male. Voice is Clear, casual with a Mexican accent...'
-                }
-            }
-        }
+        # ElevenLabs calls go through shared retry/deadline/hedging/circuit-breaker wrappers
+        self._tts_calls = get_caller("elevenlabs.tts", "elevenlabs", deadline_seconds=TTS_DEADLINE_SECONDS, hedge=True)
+        self._tts_stream_calls = get_caller("elevenlabs.tts_stream", "elevenlabs", deadline_seconds=TTS_DEADLINE_SECONDS)
+        self._voices_calls = get_caller("elevenlabs.voices", "elevenlabs", deadline_seconds=TTS_DEADLINE_SECONDS)
         
+        audio_logger.info("TextToSpeechHandler initialized successfully")
+
+    @property
+    def voices(self):
+        """language -> display name -> voice info, from the shared (hot-reloaded) voice catalog"""
+        return get_voice_catalog().by_language
+
     def get_voice_options(self, language):
         """Get available voice options for a language"""
-        language_key = language.lower()
-        if language_key in self.voices:
-            return list(self.voices[language_key].keys())
-        return []
+        language_voices = self.voices.get(language.lower())
+        return list(language_voices) if language_voices else []
         
     def get_voice_info(self, language, voice_display_name):
         """Get voice information for a specific voice"""
-        language_key = language.lower()
-        if language_key in self.voices and voice_display_name in self.voices[language_key]:
-            return self.voices[language_key][voice_display_name]
-        return None
+        language_voices = self.voices.get(language.lower())
+        return language_voices.get(voice_display_name) if language_voices else None
 
-    def generate_audio_with_voice_id(self, text, voice_id, voice_name):
+    def generate_audio_with_voice_id(self, text, voice_id, voice_name, use_cache=True):
         """
         Generate audio directly with voice_id - simplified approach
         
@@ -188,44 +84,15 @@ class TextToSpeechHandler:
             text (str): Text to convert to speech
             voice_id (str): ElevenLabs voice ID
             voice_name (str): Display name for logging
+            use_cache (bool): Set to False to bypass the audio cache for this call
             
         Returns:
-            str: Path to temp MP3 file or None if failed
+            str: Path to MP3 file (cached or artifact) or None if failed
         """
         audio_logger.info(f"Converting text to speech with voice: {voice_name} (ID: {voice_id})")
-        
-        try:
-            # Use the official ElevenLabs SDK with fast model for real-time use
-            audio = self.client.text_to_speech.convert(
-                text=text,
-                voice_id=voice_id,
-                model_id="eleven_flash_v2_5",  # Ultra-fast model ~75ms, supports all languages
-                output_format="mp3_44100_128",
-                voice_settings={
-                    "stability": 0.5,
-                    "similarity_boost": 0.5,
-                    "style": 0.0,
-                    "use_speaker_boost": True
-                }
-            )
-            
-            # Convert the audio generator to bytes
-            audio_bytes = b''.join(audio)
-            audio_logger.info(f"TTS request successful. Audio size: {len(audio_bytes)} bytes")
-            
-            # Save to temp file for reliable st.audio() playback
-            import tempfile
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as temp_file:
-                temp_file.write(audio_bytes)
-                temp_file_path = temp_file.name
-                audio_logger.info(f"Audio saved to temp file: {temp_file_path}")
-                return temp_file_path
-            
-        except Exception as e:
-            audio_logger.error(f"TTS request failed with ElevenLabs SDK: {e}")
-            return None
+        return self._synthesize_to_file(text, voice_id, use_cache=use_cache)
 
-    def text_to_speech(self, text, language, voice_name=None):
+    def text_to_speech(self, text, language, voice_name=None, use_cache=True):
         """
         Convert text to speech using ElevenLabs SDK
         
@@ -233,9 +100,10 @@ class TextToSpeechHandler:
             text (str): Text to convert to speech
             language (str): Target language ('english' or 'spanish')
             voice_name (str): Optional specific voice name from dropdown
+            use_cache (bool): Set to False to bypass the audio cache for this call
             
         Returns:
-            bytes: MP3 audio data or None if failed
+            str: Path to MP3 file (cached or artifact) or None if failed
         """
         audio_logger.info(f"Converting text to speech in {language}: '{text[:50]}...'")
         
@@ -255,38 +123,134 @@ class TextToSpeechHandler:
             
         voice_id = voice_config['voice_id']
         
+        audio_logger.info(f"Making TTS request with ElevenLabs SDK for voice: {voice_config['name']} (ID: {voice_id})")
+        return self._synthesize_to_file(text, voice_id, use_cache=use_cache)
+
+    def _synthesize_to_file(self, text, voice_id, use_cache=True):
+        """
+        Synthesize text with ElevenLabs, going through the audio cache when enabled
+        
+        Returns:
+            str: Path to MP3 file or None if failed
+        """
+        cache_key = None
+        if use_cache and self.audio_cache is not None:
+            cache_key = make_audio_key(text, voice_id, TTS_MODEL_ID, TTS_VOICE_SETTINGS, TTS_OUTPUT_FORMAT)
+            cached_path = self.audio_cache.get(cache_key, text_length=len(text))
+            if cached_path:
+                audio_logger.info(f"TTS cache hit: {cached_path}")
+                return cached_path
+        
         try:
-            audio_logger.info(f"Making TTS request with ElevenLabs SDK for voice: {voice_config['name']} (ID: {voice_id})")
-            
-            # Use the official ElevenLabs SDK with fast model for real-time use
-            audio = self.client.text_to_speech.convert(
-                text=text,
-                voice_id=voice_id,
-                model_id="eleven_flash_v2_5",  # Ultra-fast model ~75ms, supports all languages
-                output_format="mp3_44100_128",
-                voice_settings={
-                    "stability": 0.5,
-                    "similarity_boost": 0.5,
-                    "style": 0.0,
-                    "use_speaker_boost": True
-                }
+            # Use the official ElevenLabs SDK with fast model for real-time use;
+            # the body is read inside the wrapper so a broken download is retried too
+            audio_bytes = self._tts_calls.call(
+                lambda: b''.join(self.client.text_to_speech.convert(
+                    text=text,
+                    voice_id=voice_id,
+                    model_id=TTS_MODEL_ID,
+                    output_format=TTS_OUTPUT_FORMAT,
+                    voice_settings=TTS_VOICE_SETTINGS,
+                    request_options=SDK_REQUEST_OPTIONS
+                ))
             )
-            
-            # Convert the audio generator to bytes
-            audio_bytes = b''.join(audio)
             audio_logger.info(f"TTS request successful. Audio size: {len(audio_bytes)} bytes")
-            
-            # Save to temp file for reliable st.audio() playback (like BiLingual AI)
-            import tempfile
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as temp_file:
-                temp_file.write(audio_bytes)
-                temp_file_path = temp_file.name
-                audio_logger.info(f"Audio saved to temp file: {temp_file_path}")
-                return temp_file_path
-            
         except Exception as e:
             audio_logger.error(f"TTS request failed with ElevenLabs SDK: {e}")
             return None
+        
+        if cache_key is not None:
+            try:
+                cached_path = self.audio_cache.put(cache_key, audio_bytes)
+                audio_logger.info(f"Audio saved to cache: {cached_path}")
+                return cached_path
+            except Exception as e:
+                audio_logger.warning(f"Failed to write audio cache, using artifact: {e}")
+        
+        # Save as a managed artifact (garbage collected once no session displays it)
+        artifact_path = write_artifact(audio_bytes)
+        audio_logger.info(f"Audio saved to artifact: {artifact_path}")
+        return artifact_path
+
+    def stream_audio_with_voice_id(self, text, voice_id, voice_name, use_cache=True, chunk_size=32 * 1024):
+        """
+        Stream audio chunks as ElevenLabs synthesizes them
+        
+        Args:
+            text (str): Text to convert to speech
+            voice_id (str): ElevenLabs voice ID
+            voice_name (str): Display name for logging
+            use_cache (bool): Set to False to bypass the audio cache for this call
+            chunk_size (int): Chunk size used when replaying a cached clip
+            
+        Yields:
+            bytes: MP3 chunks; the complete clip is written to the audio cache at the end
+        """
+        audio_logger.info(f"Streaming text to speech with voice: {voice_name} (ID: {voice_id})")
+        
+        cache_key = None
+        if use_cache and self.audio_cache is not None:
+            cache_key = make_audio_key(text, voice_id, TTS_MODEL_ID, TTS_VOICE_SETTINGS, TTS_OUTPUT_FORMAT)
+            cached_path = self.audio_cache.get(cache_key, text_length=len(text))
+            if cached_path:
+                audio_logger.info(f"TTS cache hit, replaying: {cached_path}")
+                with open(cached_path, 'rb') as cached_file:
+                    while True:
+                        chunk = cached_file.read(chunk_size)
+                        if not chunk:
+                            return
+                        yield chunk
+        
+        # SDK v2 exposes text_to_speech.stream; v1 named it convert_as_stream
+        stream_method = getattr(self.client.text_to_speech, 'stream', None) or self.client.text_to_speech.convert_as_stream
+        
+        def open_stream():
+            # The request is sent on first iteration, so the first chunk is read here too
+            audio_stream = iter(stream_method(
+                text=text,
+                voice_id=voice_id,
+                model_id=TTS_MODEL_ID,
+                output_format=TTS_OUTPUT_FORMAT,
+                voice_settings=TTS_VOICE_SETTINGS,
+                request_options=SDK_REQUEST_OPTIONS
+            ))
+            return audio_stream, next(audio_stream, b'')
+        
+        parts = []
+        try:
+            # Retried until the first chunk arrives; after that a failure ends the stream
+            audio_stream, first_chunk = self._tts_stream_calls.call(open_stream)
+            if first_chunk:
+                parts.append(first_chunk)
+                yield first_chunk
+            for chunk in audio_stream:
+                if chunk:
+                    parts.append(chunk)
+                    yield chunk
+        except Exception as e:
+            # Re-raised so the media server marks the stream as failed instead of finished
+            audio_logger.error(f"Streaming TTS request failed with ElevenLabs SDK: {e}")
+            raise
+        
+        audio_bytes = b''.join(parts)
+        audio_logger.info(f"Streaming TTS finished. Audio size: {len(audio_bytes)} bytes")
+        if cache_key is not None and audio_bytes:
+            try:
+                self.audio_cache.put(cache_key, audio_bytes)
+            except Exception as e:
+                audio_logger.warning(f"Failed to write streamed audio to cache: {e}")
+
+    def get_cached_audio_path(self, text, voice_id):
+        """Path of an already synthesized clip for (text, voice_id), or None."""
+        if self.audio_cache is None:
+            return None
+        cache_key = make_audio_key(text, voice_id, TTS_MODEL_ID, TTS_VOICE_SETTINGS, TTS_OUTPUT_FORMAT)
+        cached_path = self.audio_cache.path_for(cache_key)
+        return cached_path if os.path.exists(cached_path) else None
+
+    def get_cache_stats(self):
+        """Return audio cache counters, or None when caching is disabled."""
+        return self.audio_cache.get_stats() if self.audio_cache is not None else None
 
     def get_available_voices(self):
         """
@@ -298,7 +262,7 @@ class TextToSpeechHandler:
         audio_logger.info("Fetching available voices from ElevenLabs API using SDK")
         
         try:
-            voices_response = self.client.voices.get_all()
+            voices_response = self._voices_calls.call(self.client.voices.get_all, request_options=SDK_REQUEST_OPTIONS)
             voices_data = {
                 "voices": voices_response.voices,
                 "total_count": len(voices_response.voices)
@@ -0,0 +1,148 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from config import LOGGERS
+
+# Get transcription logger
+transcription_logger = LOGGERS['transcription']
+
+
+def audio_digest(audio_bytes):
+    """Stable fingerprint for a recording (unlike hash(), identical across processes)."""
+    return hashlib.blake2b(audio_bytes, digest_size=16).hexdigest()
+
+
+class AudioIngestor:
+    """
+    Idempotent front door for recorded audio.
+
+    Recordings are fingerprinted with blake2b and their transcriptions kept in a
+    bounded LRU shared by every session of the process (direct speech translation
+    reports too), so Streamlit reruns with the recorder still populated never
+    re-upload the same WAV. Concurrent requests for
+    the same digest wait for the first one instead of transcribing twice.
+    """
+
+    def __init__(self, translator, max_entries, max_bytes):
+        self.translator = translator
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._results = OrderedDict()  # digest ("<digest>:direct" for speech translation reports) -> (result, size)
+        self._result_bytes = 0
+        self._in_flight = {}  # digest -> threading.Event
+        self.stats = {'hits': 0, 'misses': 0, 'coalesced': 0, 'evictions': 0}
+
+    def digest(self, audio_bytes):
+        return audio_digest(audio_bytes)
+
+    def _lookup(self, key):
+        entry = self._results.get(key)
+        if entry is None:
+            return None
+        self._results.move_to_end(key)
+        return entry[0]
+
+    @staticmethod
+    def _transcription_size(transcription):
+        """Approximate memory held by a transcription (text plus segment metadata)."""
+        segments_size = sum(len((segment.get('text') or '').encode('utf-8')) + 64 for segment in transcription['segments'])
+        return len(transcription['text'].encode('utf-8')) + segments_size
+
+    def _store(self, key, result, size):
+        if key in self._results:
+            self._result_bytes -= self._results.pop(key)[1]
+        self._results[key] = (result, size)
+        self._result_bytes += size
+        while self._results and (len(self._results) > self.max_entries or self._result_bytes > self.max_bytes):
+            _, (_, evicted_size) = self._results.popitem(last=False)
+            self._result_bytes -= evicted_size
+            self.stats['evictions'] += 1
+
+    def transcribe(self, audio_bytes, digest=None):
+        """
+        Transcribe a recording; see transcribe_detailed
+
+        Returns:
+            tuple: (transcription, from_cache) - errors are returned but never cached
+        """
+        result, from_cache = self.transcribe_detailed(audio_bytes, digest)
+        return result['text'], from_cache
+
+    def transcribe_detailed(self, audio_bytes, digest=None):
+        """
+        Transcribe a recording, reusing the cached result for a known digest
+
+        Args:
+            audio_bytes (bytes): WAV audio data
+            digest (str): Optional precomputed digest of audio_bytes
+
+        Returns:
+            tuple: (result, from_cache) where result is transcribe_audio(verbose=True)'s dict
+                   (text, language, segments, duration) - errors are returned but never cached
+        """
+        digest = digest or self.digest(audio_bytes)
+        return self._cached(
+            digest, lambda: self.translator.transcribe_audio(audio_bytes, verbose=True), lambda result: result, None
+        )
+
+    def transcribe_and_translate(self, audio_bytes, digest=None):
+        """
+        Direct speech translation (transcribe_and_translate_audio), cached under the recording's digest
+
+        Returns:
+            tuple: (report, from_cache) - reports whose transcription failed are returned but never cached
+        """
+        digest = digest or self.digest(audio_bytes)
+        return self._cached(
+            f"{digest}:direct", lambda: self.translator.transcribe_and_translate_audio(audio_bytes),
+            lambda report: report['transcription'], lambda report: len((report['translation'] or '').encode('utf-8'))
+        )
+
+    def _cached(self, key, compute, transcription_of, extra_size):
+        """
+        Return (compute(), False) or the cached result as (result, True)
+
+        Concurrent requests for one key wait for the first instead of computing it
+        twice; results whose transcription is an error are not cached.
+        """
+        while True:
+            with self._lock:
+                result = self._lookup(key)
+                if result is not None:
+                    self.stats['hits'] += 1
+                    transcription_logger.info(f"Transcription cache hit for audio {key[:12]}")
+                    return result, True
+                pending = self._in_flight.get(key)
+                if pending is None:
+                    pending = threading.Event()
+                    self._in_flight[key] = pending
+                    self.stats['misses'] += 1
+                    break
+                self.stats['coalesced'] += 1
+            # Another session is transcribing the same audio - wait for it, then re-check
+            pending.wait()
+
+        try:
+            result = compute()
+            transcription = transcription_of(result)
+            if not transcription['text'].startswith("Error"):
+                size = self._transcription_size(transcription) + (extra_size(result) if extra_size else 0)
+                with self._lock:
+                    self._store(key, result, size)
+            return result, False
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            pending.set()
+
+    def get_stats(self):
+        """Return hit/miss counters and current memory usage."""
+        with self._lock:
+            stats = dict(self.stats)
+            lookups = stats['hits'] + stats['misses']
+            stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+            stats['entries'] = len(self._results)
+            stats['bytes'] = self._result_bytes
+            return stats
@@ -1,18 +1,95 @@
 import streamlit as st
 import streamlit.components.v1 as components
 import base64
-import os
+import html
+import json
+import mimetypes
 
-def create_audio_player(audio_file_path, text="Audio", autoplay=False, show_clear_button=True, on_clear_callback=None):
-    """Create a custom audio player with waveform visualization and enhanced controls"""
+# Progressive playback: feed a MediaSource from the local media server as chunks arrive
+MEDIA_SOURCE_SCRIPT = """
+            (function() {
+                const streamUrl = __STREAM_URL__;
+                const mimeType = 'audio/mpeg';
+                if (!window.MediaSource || !MediaSource.isTypeSupported(mimeType)) {
+                    // Without MSE support the browser still plays chunked HTTP progressively
+                    audio.src = streamUrl;
+                    return;
+                }
+                const mediaSource = new MediaSource();
+                audio.src = URL.createObjectURL(mediaSource);
+                mediaSource.addEventListener('sourceopen', async () => {
+                    const sourceBuffer = mediaSource.addSourceBuffer(mimeType);
+                    const appendChunk = (chunk) => new Promise((resolve, reject) => {
+                        sourceBuffer.addEventListener('updateend', resolve, { once: true });
+                        sourceBuffer.addEventListener('error', reject, { once: true });
+                        sourceBuffer.appendBuffer(chunk);
+                    });
+                    try {
+                        const response = await fetch(streamUrl);
+                        if (!response.ok) {
+                            throw new Error('HTTP ' + response.status);
+                        }
+                        const reader = response.body.getReader();
+                        updateStatus('Streaming...', true);
+                        while (true) {
+                            const { done, value } = await reader.read();
+                            if (done) break;
+                            if (value && value.length) {
+                                await appendChunk(value);
+                            }
+                        }
+                        if (mediaSource.readyState === 'open') {
+                            mediaSource.endOfStream();
+                        }
+                        updateStatus(isPlaying ? 'Playing...' : 'Ready to play');
+                    } catch (err) {
+                        console.error('Audio stream failed:', err);
+                        updateStatus('Error streaming audio');
+                        if (mediaSource.readyState === 'open') {
+                            mediaSource.endOfStream('network');
+                        }
+                    }
+                });
+            })();
+"""
+
+def audio_mime_type(audio_file_path):
+    """Registered MIME type for an audio file (audio/mpeg for .mp3, not audio/mp3)"""
+    mime_type, _ = mimetypes.guess_type(audio_file_path)
+    return mime_type if mime_type and mime_type.startswith("audio/") else "audio/mpeg"
+
+
+def create_audio_player(audio_file_path, text="Audio", autoplay=False, show_clear_button=True, on_clear_callback=None,
+                        stream_url=None, media_server=None):
+    """
+    Create a custom audio player with waveform visualization and enhanced controls
     
-    # Read the audio file and encode it
-    with open(audio_file_path, "rb") as f:
-        audio_bytes = f.read()
-        audio_b64 = base64.b64encode(audio_bytes).decode()
+    When stream_url is given, audio_file_path is ignored and the clip is played
+    progressively from the local media server as it is being synthesized.
     
-    # Get file extension
-    file_ext = os.path.splitext(audio_file_path)[1][1:]  # Remove the dot
+    With a media_server, the file is referenced by URL (range requests, so seeking
+    doesn't need the whole clip) and the player page itself is served by the media
+    server, so a rerun sends only an iframe URL. Without one, the audio is inlined
+    as base64 in the component HTML.
+    """
+    
+    if stream_url:
+        source_markup = ""
+        stream_script = MEDIA_SOURCE_SCRIPT.replace("__STREAM_URL__", json.dumps(stream_url))
+    elif media_server is not None:
+        mime_type = audio_mime_type(audio_file_path)
+        audio_url = media_server.media_url(media_server.register_file(audio_file_path, mime_type))
+        source_markup = f'<source src="{html.escape(audio_url, quote=True)}" type="{mime_type}">'
+        stream_script = ""
+    else:
+        # Read the audio file and encode it
+        with open(audio_file_path, "rb") as f:
+            audio_bytes = f.read()
+            audio_b64 = base64.b64encode(audio_bytes).decode()
+        
+        mime_type = audio_mime_type(audio_file_path)
+        source_markup = f'<source src="data:{mime_type};base64,{audio_b64}" type="{mime_type}">'
+        stream_script = ""
     
     # HTML for custom audio player
     audio_player_html = f"""
@@ -222,7 +299,7 @@ def create_audio_player(audio_file_path, text="Audio", autoplay=False, show_clea
             </div>
             
             <audio id="audioPlayer" style="display: none;" {"autoplay" if autoplay else ""}>
-                <source src="data:audio/{file_ext};base64,{audio_b64}" type="audio/{file_ext}">
+                {source_markup}
             </audio>
         </div>
         
@@ -328,12 +405,15 @@ def create_audio_player(audio_file_path, text="Audio", autoplay=False, show_clea
             progressContainer.addEventListener('click', (e) => {{
                 const rect = progressContainer.getBoundingClientRect();
                 const percent = (e.clientX - rect.left) / rect.width;
-                audio.currentTime = percent * audio.duration;
+                if (isFinite(audio.duration)) {{
+                    audio.currentTime = percent * audio.duration;
+                }}
             }});
             
             // Audio time update
             audio.addEventListener('timeupdate', () => {{
-                if (audio.duration) {{
+                // Streamed audio reports an infinite duration until the last chunk arrives
+                if (isFinite(audio.duration)) {{
                     const progress = (audio.currentTime / audio.duration) * 100;
                     progressBar.style.width = progress + '%';
                     timeDisplay.textContent = `${{formatTime(audio.currentTime)}} / ${{formatTime(audio.duration)}}`;
@@ -376,7 +456,7 @@ def create_audio_player(audio_file_path, text="Audio", autoplay=False, show_clea
             updateStatus('Initializing...');
             
             audio.addEventListener('loadedmetadata', () => {{
-                timeDisplay.textContent = `0:00 / ${{formatTime(audio.duration)}}`;
+                timeDisplay.textContent = isFinite(audio.duration) ? `0:00 / ${{formatTime(audio.duration)}}` : '0:00 / --:--';
                 updateStatus('Ready to play');
                 
                 // Auto-play if enabled
@@ -389,10 +469,14 @@ def create_audio_player(audio_file_path, text="Audio", autoplay=False, show_clea
                     }}, 500);
                 }}
             }});
+            {stream_script}
         </script>
     </body>
     </html>
     """
     
     # Render the audio player
-    components.html(audio_player_html, height=250)
\ No newline at end of file
+    if media_server is not None:
+        components.iframe(media_server.page_url(media_server.register_page(audio_player_html)), height=250)
+    else:
+        components.html(audio_player_html, height=250)
\ No newline at end of file
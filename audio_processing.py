@@ -0,0 +1,242 @@
+import io
+import re
+import wave
+import numpy as np
+from config import LOGGERS
+
+# Get audio logger
+audio_logger = LOGGERS['audio']
+
+FRAME_SECONDS = 0.03  # Energy analysis frame
+SILENCE_DBFS = -45.0  # Frames quieter than this count as silence
+
+
+def wav_duration(wav_bytes):
+    """Duration of a WAV recording in seconds from its header, or None if it isn't a readable WAV."""
+    try:
+        with wave.open(io.BytesIO(wav_bytes), 'rb') as wav_file:
+            return wav_file.getnframes() / float(wav_file.getframerate())
+    except (wave.Error, EOFError):
+        return None
+
+
+def decode_wav(wav_bytes):
+    """
+    Decode PCM WAV bytes with the stdlib wave module
+
+    Returns:
+        tuple: (mono float32 samples in [-1, 1], sample rate)
+
+    Raises:
+        wave.Error: If the data is not PCM WAV
+    """
+    with wave.open(io.BytesIO(wav_bytes), 'rb') as wav_file:
+        channels = wav_file.getnchannels()
+        sample_width = wav_file.getsampwidth()
+        sample_rate = wav_file.getframerate()
+        raw = wav_file.readframes(wav_file.getnframes())
+
+    if sample_width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif sample_width == 2:
+        samples = np.frombuffer(raw, dtype='<i2').astype(np.float32) / 32768.0
+    elif sample_width == 3:
+        # 24-bit: widen each little-endian triple to int32
+        triples = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        values = triples[:, 0] | (triples[:, 1] << 8) | (triples[:, 2] << 16)
+        values = np.where(values >= 1 << 23, values - (1 << 24), values)
+        samples = values.astype(np.float32) / float(1 << 23)
+    elif sample_width == 4:
+        samples = np.frombuffer(raw, dtype='<i4').astype(np.float32) / float(1 << 31)
+    else:
+        raise wave.Error(f"Unsupported sample width: {sample_width} bytes")
+
+    if channels > 1:
+        samples = samples[:len(samples) - len(samples) % channels].reshape(-1, channels).mean(axis=1)
+    return samples, sample_rate
+
+
+def encode_wav(samples, sample_rate):
+    """Encode mono float samples in [-1, 1] as 16-bit PCM WAV bytes."""
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767.0).astype('<i2')
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm.tobytes())
+    return buffer.getvalue()
+
+
+def frame_energy_dbfs(samples, sample_rate, frame_seconds=FRAME_SECONDS):
+    """RMS energy of consecutive frames in dBFS (one value per frame)."""
+    frame_length = max(1, int(sample_rate * frame_seconds))
+    frame_count = len(samples) // frame_length
+    if frame_count == 0:
+        rms = np.sqrt(np.mean(samples.astype(np.float64) ** 2)) if len(samples) else 0.0
+        return np.array([20 * np.log10(rms + 1e-10)])
+    frames = samples[:frame_count * frame_length].reshape(frame_count, frame_length)
+    rms = np.sqrt(np.mean(frames.astype(np.float64) ** 2, axis=1))
+    return 20 * np.log10(rms + 1e-10)
+
+
+def find_split_points(samples, sample_rate, target_seconds, search_seconds):
+    """
+    Choose cut points (sample indexes) roughly every target_seconds.
+
+    Each cut goes in the quietest stretch within +/- search_seconds of its
+    target (frames within 6 dB of the window minimum), at the frame closest to
+    the target, so segments end in pauses rather than mid-word.
+    """
+    energy = frame_energy_dbfs(samples, sample_rate)
+    frame_length = max(1, int(sample_rate * FRAME_SECONDS))
+    total_frames = len(energy)
+    target_frames = max(1, int(target_seconds / FRAME_SECONDS))
+    search_frames = max(1, int(search_seconds / FRAME_SECONDS))
+
+    cuts = []
+    last_cut = 0
+    while total_frames - last_cut > target_frames + search_frames:
+        target = last_cut + target_frames
+        window_start = max(last_cut + 1, target - search_frames)
+        window_end = min(total_frames, target + search_frames + 1)
+        window = energy[window_start:window_end]
+        candidates = np.flatnonzero(window <= window.min() + 6.0) + window_start
+        quietest = int(candidates[np.argmin(np.abs(candidates - target))])
+        cuts.append(quietest * frame_length + frame_length // 2)
+        last_cut = quietest
+    return cuts
+
+
+def split_on_silence(wav_bytes, target_seconds=45.0, search_seconds=10.0, overlap_seconds=0.5):
+    """
+    Split a WAV recording into segments that end at low-energy points
+
+    Segments overlap by overlap_seconds so words straddling a cut are not lost
+    (stitch_transcripts removes the repeated words). Segments that are silent
+    throughout are dropped, since Whisper tends to hallucinate text for them.
+
+    Returns:
+        list: (start_seconds, segment WAV bytes) in order; start_seconds is where the
+              segment's audio begins in the recording, leading overlap included
+    """
+    samples, sample_rate = decode_wav(wav_bytes)
+    cuts = find_split_points(samples, sample_rate, target_seconds, search_seconds)
+    bounds = [0] + cuts + [len(samples)]
+    overlap = int(overlap_seconds * sample_rate)
+
+    segments = []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        slice_start = max(0, start - overlap)
+        segment = samples[slice_start:min(len(samples), end + overlap)]
+        if frame_energy_dbfs(segment, sample_rate).max() < SILENCE_DBFS:
+            audio_logger.debug(f"Skipping silent segment at {start / sample_rate:.1f}s")
+            continue
+        segments.append((slice_start / sample_rate, encode_wav(segment, sample_rate)))
+    audio_logger.info(
+        f"Split {len(samples) / sample_rate:.1f}s recording into {len(segments)} segments "
+        f"(cuts at {[round(cut / sample_rate, 1) for cut in cuts]}s)"
+    )
+    return segments
+
+
+def _comparable_word(word):
+    return re.sub(r"[^\w]", "", word.lower())
+
+
+def stitch_transcripts(texts, max_overlap_words=8):
+    """
+    Join segment transcripts, dropping words repeated across each seam
+
+    The longest run (up to max_overlap_words) that ends one transcript and
+    starts the next, compared case- and punctuation-insensitively, is kept once.
+    """
+    words = []
+    for text in texts:
+        next_words = text.split()
+        if not next_words:
+            continue
+        overlap = 0
+        for size in range(min(max_overlap_words, len(words), len(next_words)), 0, -1):
+            tail = [_comparable_word(word) for word in words[-size:]]
+            head = [_comparable_word(word) for word in next_words[:size]]
+            if tail == head and any(tail):
+                overlap = size
+                break
+        words.extend(next_words[overlap:])
+    return " ".join(words)
+
+
+def resample(samples, from_rate, to_rate, taps=63):
+    """
+    Resample mono audio with a windowed-sinc anti-aliasing filter and linear interpolation
+
+    Good enough for speech recognition input; not meant for music.
+    """
+    if from_rate == to_rate or not len(samples):
+        return samples.astype(np.float32)
+    if to_rate < from_rate:
+        # Low-pass just below the new Nyquist frequency before decimating
+        cutoff = 0.9 * (to_rate / 2.0) / from_rate  # In cycles per input sample
+        n = np.arange(taps) - (taps - 1) / 2.0
+        kernel = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(taps)
+        samples = np.convolve(samples, kernel / kernel.sum(), mode='same')
+    duration = len(samples) / float(from_rate)
+    target_times = np.arange(int(round(duration * to_rate))) / float(to_rate)
+    return np.interp(target_times, np.arange(len(samples)) / float(from_rate), samples).astype(np.float32)
+
+
+def voiced_bounds(samples, sample_rate, threshold_dbfs=SILENCE_DBFS, padding_seconds=0.25):
+    """
+    Energy VAD: sample range from the first to the last voiced frame, plus padding
+
+    Returns:
+        tuple: (start, end) sample indexes; (0, 0) if no frame is above threshold_dbfs
+    """
+    energy = frame_energy_dbfs(samples, sample_rate)
+    voiced = np.flatnonzero(energy > threshold_dbfs)
+    if not len(voiced):
+        return 0, 0
+    frame_length = max(1, int(sample_rate * FRAME_SECONDS))
+    padding = int(padding_seconds * sample_rate)
+    start = max(0, voiced[0] * frame_length - padding)
+    end = min(len(samples), (voiced[-1] + 1) * frame_length + padding)
+    return start, end
+
+
+def trim_silence(samples, sample_rate, threshold_dbfs=SILENCE_DBFS, padding_seconds=0.25):
+    """Drop leading and trailing silence (empty result if the clip has no voiced frame)."""
+    start, end = voiced_bounds(samples, sample_rate, threshold_dbfs, padding_seconds)
+    return samples[start:end]
+
+
+def prepare_for_transcription(wav_bytes, target_rate=16000, min_speech_seconds=0.2):
+    """
+    Downmix, resample to target_rate, trim silence and re-encode as 16-bit PCM WAV
+
+    Whisper works on 16 kHz mono internally, so this loses nothing it would use.
+
+    Returns:
+        tuple: (prepared WAV bytes, or None if the clip holds no speech, stats dict)
+
+    Raises:
+        wave.Error: If the data is not PCM WAV
+    """
+    samples, sample_rate = decode_wav(wav_bytes)
+    original_seconds = len(samples) / float(sample_rate) if sample_rate else 0.0
+    samples = resample(samples, sample_rate, target_rate)
+    start, end = voiced_bounds(samples, target_rate)
+    samples = samples[start:end]
+    stats = {
+        "original_bytes": len(wav_bytes),
+        "original_seconds": original_seconds,
+        "original_rate": sample_rate,
+        "prepared_bytes": 0,
+        "prepared_seconds": len(samples) / float(target_rate),
+        "trimmed_start_seconds": float(start) / target_rate,  # Offset of the prepared clip in the original
+    }
+    if stats["prepared_seconds"] < min_speech_seconds:
+        return None, stats
+    prepared = encode_wav(samples, target_rate)
+    stats["prepared_bytes"] = len(prepared)
+    return prepared, stats
@@ -0,0 +1,62 @@
+"""
+Benchmark batch translation on threads against the asyncio engine.
+
+For each concurrency level, translates the same texts with
+
+  threads   TextTranslator.translate_batch (one thread per request in flight)
+  asyncio   AsyncTextTranslator.translate_batch on the engine loop (one coroutine each)
+
+against the live Groq API and reports wall time, throughput and errors. Caches
+are bypassed so every run pays for real requests.
+
+    python benchmark_batch_translation.py texts.txt [--concurrency 4 16 32]
+
+texts.txt holds one English or Spanish text per line.
+"""
+import argparse
+import time
+from translation_engine import TextTranslator
+from async_engine import AsyncTextTranslator
+from http_pool import run_coroutine
+
+
+def run_threads(translator, texts, concurrency):
+    start = time.perf_counter()
+    records = list(translator.translate_batch(texts, concurrency=concurrency, use_cache=False))
+    return time.perf_counter() - start, sum(1 for record in records if record["error"] is not None)
+
+
+async def _collect(translator, texts, concurrency):
+    return [record async for record in translator.translate_batch(texts, concurrency=concurrency, use_cache=False)]
+
+
+def run_async(translator, texts, concurrency):
+    start = time.perf_counter()
+    records = run_coroutine(_collect(translator, texts, concurrency))
+    return time.perf_counter() - start, sum(1 for record in records if record["error"] is not None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("texts", help="File with one text per line")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[4, 16, 32], help="Requests in flight")
+    args = parser.parse_args()
+
+    with open(args.texts, encoding='utf-8') as f:
+        texts = [line.strip() for line in f if line.strip()]
+    if not texts:
+        print("No texts to translate.")
+        return
+    translator = TextTranslator()
+    async_translator = AsyncTextTranslator()
+
+    print(f"{'Texts:':<16}{len(texts)}")
+    for concurrency in args.concurrency:
+        for label, runner, engine in (("threads", run_threads, translator), ("asyncio", run_async, async_translator)):
+            seconds, errors = runner(engine, texts, concurrency)
+            print(f"  concurrency {concurrency:>3} {label:<8} {seconds:6.2f}s  "
+                  f"{len(texts) / seconds:6.1f} texts/s  {errors} errors")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark the offline language detector on the labeled EN/ES corpus.
+
+Reports accuracy of the local classifier, the share of inputs that would fall
+back to the LLM at the given confidence threshold, accuracy on the inputs it
+keeps, and the cost per classification (single and batched).
+
+    python benchmark_language_detector.py [--threshold 0.9]
+"""
+import argparse
+import csv
+import os
+import time
+import numpy as np
+from config import LANGUAGE_DETECTION_CONFIDENCE_THRESHOLD
+from language_detector import LanguageDetector, get_language_detector
+
+BENCHMARK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reference", "language_benchmark.tsv")
+
+
+def load_benchmark(path):
+    with open(path, encoding='utf-8', newline='') as f:
+        rows = list(csv.DictReader(f, delimiter='\t'))
+    return [row['text'] for row in rows], [row['label'] for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threshold", type=float, default=LANGUAGE_DETECTION_CONFIDENCE_THRESHOLD)
+    parser.add_argument("--corpus", default=BENCHMARK_PATH)
+    parser.add_argument("--repeat", type=int, default=20, help="Timing repetitions over the corpus")
+    parser.add_argument("--show-errors", action="store_true")
+    args = parser.parse_args()
+
+    texts, labels = load_benchmark(args.corpus)
+    detector = get_language_detector()
+
+    predictions = [detector.detect(text) for text in texts]
+    correct = np.array([label == predicted for label, (predicted, _) in zip(labels, predictions)])
+    confident = np.array([confidence >= args.threshold for _, confidence in predictions])
+
+    # Timing: a cold detector (nothing memoized), then warm single and batched calls
+    cold_detector = LanguageDetector()
+    start = time.perf_counter()
+    for text in texts:
+        cold_detector.detect(text)
+    cold_us = (time.perf_counter() - start) / len(texts) * 1e6
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for text in texts:
+            detector.detect(text)
+    single_us = (time.perf_counter() - start) / (args.repeat * len(texts)) * 1e6
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        detector.detect_batch(texts)
+    batch_us = (time.perf_counter() - start) / (args.repeat * len(texts)) * 1e6
+
+    batch_labels, _ = detector.detect_batch(texts)
+    assert batch_labels == [predicted for predicted, _ in predictions], "batch and single paths disagree"
+
+    print(f"Samples:                     {len(texts)}")
+    print(f"Local accuracy (all inputs): {correct.mean():.3f}")
+    print(f"Confidence threshold:        {args.threshold}")
+    print(f"LLM fallback rate:           {1 - confident.mean():.3f}")
+    if confident.any():
+        print(f"Accuracy when not falling back: {correct[confident].mean():.3f}")
+    print(f"Cold classification:         {cold_us:.1f} µs")
+    print(f"Single classification:       {single_us:.1f} µs")
+    print(f"Batched classification:      {batch_us:.1f} µs per text")
+
+    if args.show_errors:
+        for text, label, (predicted, confidence) in zip(texts, labels, predictions):
+            if predicted != label or confidence < args.threshold:
+                marker = "WRONG" if predicted != label else "FALLBACK"
+                print(f"  {marker:8} {label:7} -> {predicted:7} {confidence:.3f}  {text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark the sentence-pipelined translate -> speak path against the serial one.
+
+For each text, runs both paths against the live Groq and ElevenLabs APIs:
+
+  serial    detect_and_translate, then generate_audio_with_voice_id on the whole translation
+  pipeline  TranslateSpeakPipeline (sentences synthesized while the translation streams)
+
+and reports time to first playable audio and total time per path. Caches are
+bypassed so every run pays for real requests.
+
+    python benchmark_speech_pipeline.py texts.txt --voice-id EXAVITQu4vr4xnSDxMaL [--repeat 3]
+
+texts.txt holds one English or Spanish text per line.
+"""
+import argparse
+import time
+import numpy as np
+from translation_engine import TextTranslator
+from audio_handler import TextToSpeechHandler
+from speech_pipeline import TranslateSpeakPipeline
+
+
+def run_serial(translator, tts_handler, text, voice_id):
+    start = time.perf_counter()
+    translation, direction = translator.detect_and_translate(text, use_cache=False)
+    if direction == "Unknown" or translation.startswith("Error"):
+        return None
+    audio_path = tts_handler.generate_audio_with_voice_id(translation, voice_id, "benchmark", use_cache=False)
+    seconds = time.perf_counter() - start
+    return (seconds, seconds) if audio_path else None
+
+
+def run_pipeline(pipeline, text, voice_id):
+    done = None
+    for event in pipeline.run(text, voice_id, "benchmark"):
+        if event["type"] == "done":
+            done = event
+    if done is None or done["error"] is not None or not done["audio_path"]:
+        return None
+    return done["timings"]["first_audio_seconds"], done["timings"]["total_seconds"]
+
+
+class UncachedTTS:
+    """Routes the pipeline's segment syntheses past the audio cache."""
+
+    def __init__(self, tts_handler):
+        self.tts_handler = tts_handler
+
+    def generate_audio_with_voice_id(self, text, voice_id, voice_name):
+        return self.tts_handler.generate_audio_with_voice_id(text, voice_id, voice_name, use_cache=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("texts", help="File with one text per line")
+    parser.add_argument("--voice-id", required=True, help="ElevenLabs voice ID")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per text and path (median is kept)")
+    args = parser.parse_args()
+
+    with open(args.texts, encoding='utf-8') as f:
+        texts = [line.strip() for line in f if line.strip()]
+    translator = TextTranslator()
+    tts_handler = TextToSpeechHandler()
+    pipeline = TranslateSpeakPipeline(translator, UncachedTTS(tts_handler))
+    rows = []
+    for index, text in enumerate(texts):
+        # Alternate the paths so neither benefits from warmer connections
+        serial_runs, pipeline_runs = [], []
+        for _ in range(args.repeat):
+            serial_runs.append(run_serial(translator, tts_handler, text, args.voice_id))
+            pipeline_runs.append(run_pipeline(pipeline, text, args.voice_id))
+        if None in serial_runs or None in pipeline_runs:
+            print(f"  text {index}: skipped (a run failed or the language is unsupported)")
+            continue
+        rows.append({
+            "serial_first": float(np.median([first for first, _ in serial_runs])),
+            "pipeline_first": float(np.median([first for first, _ in pipeline_runs])),
+            "serial_total": float(np.median([total for _, total in serial_runs])),
+            "pipeline_total": float(np.median([total for _, total in pipeline_runs])),
+        })
+        print(f"  text {index} ({len(text)} chars): first audio serial {rows[-1]['serial_first']:.2f}s, "
+              f"pipeline {rows[-1]['pipeline_first']:.2f}s")
+
+    if not rows:
+        print("No texts to compare.")
+        return
+    print(f"{'Texts compared:':<33}{len(rows)}")
+    for key, label in (("first", "First audio"), ("total", "Total")):
+        serial = np.array([row[f"serial_{key}"] for row in rows])
+        pipelined = np.array([row[f"pipeline_{key}"] for row in rows])
+        print(f"{label + ' serial (median):':<33}{np.median(serial):.2f}s")
+        print(f"{label + ' pipeline (median):':<33}{np.median(pipelined):.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark direct speech translation against the transcribe-then-translate chain.
+
+For each WAV recording, runs both paths against the live Groq API:
+
+  chain   transcribe_audio (verbose) + detect_and_translate with Whisper's language
+  direct  transcribe_and_translate_audio (transcription and Whisper translation concurrently)
+
+and reports wall-clock latency per path. Quality is a word-level F1 against a
+reference English translation when a references TSV (columns: file, reference)
+is given, and the F1 between the two paths' outputs otherwise. Only Spanish
+recordings exercise the direct path; English ones are reported as skipped.
+
+    python benchmark_speech_translation.py recordings/*.wav [--references refs.tsv] [--repeat 3]
+"""
+import argparse
+import csv
+import os
+import re
+import time
+from collections import Counter
+import numpy as np
+from translation_engine import TextTranslator
+
+WORD_PATTERN = re.compile(r"[^\W_]+(?:'[^\W_]+)?")
+
+
+def load_references(path):
+    with open(path, encoding='utf-8', newline='') as f:
+        return {os.path.basename(row['file']): row['reference'] for row in csv.DictReader(f, delimiter='\t')}
+
+
+def word_f1(candidate, reference):
+    """Bag-of-words F1 (case-insensitive): a rough adequacy score, not BLEU."""
+    candidate_words = Counter(WORD_PATTERN.findall(candidate.lower()))
+    reference_words = Counter(WORD_PATTERN.findall(reference.lower()))
+    overlap = sum((candidate_words & reference_words).values())
+    if not overlap:
+        return 0.0
+    precision = overlap / sum(candidate_words.values())
+    recall = overlap / sum(reference_words.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def run_chain(translator, audio_bytes):
+    start = time.perf_counter()
+    transcription = translator.transcribe_audio(audio_bytes, verbose=True)
+    translation, _ = translator.detect_and_translate(
+        transcription['text'], use_cache=False, source_language=transcription['language']
+    )
+    return translation, transcription['language'], time.perf_counter() - start
+
+
+def run_direct(translator, audio_bytes):
+    start = time.perf_counter()
+    report = translator.transcribe_and_translate_audio(audio_bytes)
+    return report['translation'], report['transcription']['language'], time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("recordings", nargs="+", help="WAV files")
+    parser.add_argument("--references", help="TSV with file and reference (English) columns")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per recording and path (median latency is kept)")
+    args = parser.parse_args()
+
+    references = load_references(args.references) if args.references else {}
+    translator = TextTranslator()
+    rows = []
+    for path in args.recordings:
+        with open(path, 'rb') as f:
+            audio_bytes = f.read()
+        name = os.path.basename(path)
+        # Alternate the paths so neither benefits from warmer connections
+        chain_runs, direct_runs = [], []
+        for _ in range(args.repeat):
+            chain_runs.append(run_chain(translator, audio_bytes))
+            direct_runs.append(run_direct(translator, audio_bytes))
+        chain_text, language, _ = chain_runs[-1]
+        direct_text, _, _ = direct_runs[-1]
+        if language != "SPANISH" or not direct_text:
+            print(f"  {name}: skipped (language {language}, direct translation {'ok' if direct_text else 'missing'})")
+            continue
+
+        reference = references.get(name)
+        rows.append({
+            "name": name,
+            "chain_seconds": float(np.median([seconds for _, _, seconds in chain_runs])),
+            "direct_seconds": float(np.median([seconds for _, _, seconds in direct_runs])),
+            "chain_f1": word_f1(chain_text, reference) if reference else None,
+            "direct_f1": word_f1(direct_text, reference) if reference else None,
+            "agreement": word_f1(direct_text, chain_text),
+        })
+        print(f"  {name}: chain {rows[-1]['chain_seconds']:.2f}s, direct {rows[-1]['direct_seconds']:.2f}s")
+        print(f"    chain:  {chain_text}")
+        print(f"    direct: {direct_text}")
+
+    if not rows:
+        print("No Spanish recordings to compare.")
+        return
+    chain_seconds = np.array([row['chain_seconds'] for row in rows])
+    direct_seconds = np.array([row['direct_seconds'] for row in rows])
+    print(f"Recordings compared:         {len(rows)}")
+    print(f"Chain latency (median):      {np.median(chain_seconds):.2f}s")
+    print(f"Direct latency (median):     {np.median(direct_seconds):.2f}s")
+    print(f"Median speedup:              {np.median(chain_seconds / direct_seconds):.2f}x")
+    print(f"Chain/direct word F1:        {np.mean([row['agreement'] for row in rows]):.3f}")
+    scored = [row for row in rows if row['chain_f1'] is not None]
+    if scored:
+        print(f"Chain word F1 vs reference:  {np.mean([row['chain_f1'] for row in scored]):.3f}")
+        print(f"Direct word F1 vs reference: {np.mean([row['direct_f1'] for row in scored]):.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Build reference/language_profiles.json for the offline language detector.
+
+Trains naive Bayes weights on the EN/ES corpus in reference/language_corpus and
+fits Platt-scaling coefficients on cross-validated (held-out) scores, so the
+detector's confidence is calibrated.
+
+    python build_language_profiles.py
+"""
+import argparse
+import json
+import os
+import random
+from collections import Counter
+import numpy as np
+from language_detector import DEFAULT_PROFILES_PATH, extract_features
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reference", "language_corpus")
+NGRAM_RANGE = (1, 3)
+
+
+def read_lines(filename):
+    with open(os.path.join(CORPUS_DIR, filename), encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def read_words(filename):
+    with open(os.path.join(CORPUS_DIR, filename), encoding='utf-8') as f:
+        return f.read().split()
+
+
+def count_features(texts):
+    counts = Counter()
+    for text in texts:
+        counts.update(extract_features(text, NGRAM_RANGE))
+    return counts
+
+
+def train_weights(english_texts, spanish_texts, alpha, min_count):
+    """Per-feature log-likelihood ratio log P(f|ES) - log P(f|EN) with additive smoothing."""
+    english_counts = count_features(english_texts)
+    spanish_counts = count_features(spanish_texts)
+    vocabulary = sorted(
+        feature for feature in set(english_counts) | set(spanish_counts)
+        if english_counts[feature] + spanish_counts[feature] >= min_count
+    )
+    english_total = sum(english_counts[f] for f in vocabulary) + alpha * len(vocabulary)
+    spanish_total = sum(spanish_counts[f] for f in vocabulary) + alpha * len(vocabulary)
+    weights = {}
+    for feature in vocabulary:
+        p_english = (english_counts[feature] + alpha) / english_total
+        p_spanish = (spanish_counts[feature] + alpha) / spanish_total
+        weights[feature] = float(np.log(p_spanish) - np.log(p_english))
+    return weights
+
+
+def score(weights, text):
+    return sum(weights.get(feature, 0.0) for feature in extract_features(text, NGRAM_RANGE))
+
+
+def fit_platt(scores, labels, ridge=1.0, iterations=100):
+    """
+    Fit p(SPANISH) = sigmoid(a * score + b) by Newton's method on the log loss.
+
+    Uses Platt's prior-corrected targets and a small ridge penalty on ``a`` so the
+    fit stays finite when the held-out scores are perfectly separable.
+    """
+    scale = float(np.std(scores)) or 1.0
+    x = np.asarray(scores, dtype=np.float64) / scale  # Well-conditioned Newton steps
+    y = np.asarray(labels, dtype=np.float64)
+    positives, negatives = y.sum(), len(y) - y.sum()
+    y = np.where(y == 1, (positives + 1) / (positives + 2), 1 / (negatives + 2))
+
+    def loss(a, b):
+        z = a * x + b
+        return np.sum(np.logaddexp(0, z) - y * z) + 0.5 * ridge * a * a
+
+    a, b = 0.0, 0.0
+    for _ in range(iterations):
+        p = 1.0 / (1.0 + np.exp(-(a * x + b)))
+        grad = np.array([np.sum((p - y) * x) + ridge * a, np.sum(p - y)])
+        w = p * (1 - p)
+        hessian = np.array([[np.sum(w * x * x) + ridge, np.sum(w * x)], [np.sum(w * x), np.sum(w) + 1e-9]])
+        step = np.linalg.solve(hessian, grad)
+        # Backtrack so the loss never increases
+        t = 1.0
+        while loss(a - t * step[0], b - t * step[1]) > loss(a, b) and t > 1e-6:
+            t *= 0.5
+        a, b = a - t * step[0], b - t * step[1]
+        if np.max(np.abs(t * step)) < 1e-8:
+            break
+    return float(a / scale), float(b)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default=DEFAULT_PROFILES_PATH)
+    parser.add_argument("--alpha", type=float, default=0.5, help="Additive smoothing")
+    parser.add_argument("--min-count", type=int, default=1, help="Drop features seen fewer times")
+    parser.add_argument("--folds", type=int, default=5, help="Cross-validation folds for calibration")
+    args = parser.parse_args()
+
+    english_sentences = read_lines("english.txt")
+    spanish_sentences = read_lines("spanish.txt")
+    english_words = read_words("english_words.txt")
+    spanish_words = read_words("spanish_words.txt")
+
+    # Held-out scores for calibration: sentences in a fold are scored by a model trained without them
+    samples = [(text, 0) for text in english_sentences] + [(text, 1) for text in spanish_sentences]
+    rng = random.Random(13)
+    rng.shuffle(samples)
+    held_out_scores, held_out_labels = [], []
+    for fold in range(args.folds):
+        train = [s for i, s in enumerate(samples) if i % args.folds != fold]
+        test = [s for i, s in enumerate(samples) if i % args.folds == fold]
+        weights = train_weights(
+            [t for t, label in train if label == 0] + english_words,
+            [t for t, label in train if label == 1] + spanish_words,
+            args.alpha, args.min_count
+        )
+        for text, label in test:
+            held_out_scores.append(score(weights, text))
+            held_out_labels.append(label)
+            # Most real inputs are short utterances, so calibrate on short snippets too
+            words = text.split()
+            length = rng.randint(1, min(3, len(words)))
+            start = rng.randint(0, len(words) - length)
+            held_out_scores.append(score(weights, " ".join(words[start:start + length])))
+            held_out_labels.append(label)
+    a, b = fit_platt(held_out_scores, held_out_labels)
+    accuracy = np.mean([(s > -b / a) == bool(label) for s, label in zip(held_out_scores, held_out_labels)])
+    print(f"Cross-validated accuracy: {accuracy:.3f}  calibration: a={a:.4f} b={b:.4f}")
+
+    weights = train_weights(english_sentences + english_words, spanish_sentences + spanish_words, args.alpha, args.min_count)
+    features = sorted(weights)
+    profiles = {
+        "version": 1,
+        "ngram_range": list(NGRAM_RANGE),
+        "calibration": {"a": round(a, 6), "b": round(b, 6)},
+        "features": features,
+        "weights": [round(weights[feature], 3) for feature in features],
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(profiles, f, ensure_ascii=False, separators=(",", ":"))
+    print(f"Wrote {len(features)} features to {args.output} ({os.path.getsize(args.output)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,121 @@ except:
     GROQ_API_KEY = os.getenv('GROQ_API_KEY')
     ELEVEN_LABS_API_KEY = os.getenv('ELEVEN_LABS_API_KEY')
 
+# Local cache directory shared by all on-disk caches
+CACHE_DIR = os.getenv('QTRANSLATE_CACHE_DIR', '.cache')
+
+# Translation Cache Configuration
+TRANSLATION_CACHE_ENABLED = os.getenv('TRANSLATION_CACHE_ENABLED', 'true').lower() == 'true'
+TRANSLATION_CACHE_PATH = os.getenv('TRANSLATION_CACHE_PATH', os.path.join(CACHE_DIR, 'translations.sqlite3'))
+TRANSLATION_CACHE_TTL_SECONDS = int(os.getenv('TRANSLATION_CACHE_TTL_SECONDS', str(30 * 24 * 3600)))
+TRANSLATION_CACHE_MAX_BYTES = int(os.getenv('TRANSLATION_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+TRANSLATION_CACHE_MEMORY_MAX_BYTES = int(os.getenv('TRANSLATION_CACHE_MEMORY_MAX_BYTES', str(8 * 1024 * 1024)))
+
+# TTS Audio Cache Configuration
+AUDIO_CACHE_ENABLED = os.getenv('AUDIO_CACHE_ENABLED', 'true').lower() == 'true'
+AUDIO_CACHE_DIR = os.getenv('AUDIO_CACHE_DIR', os.path.join(CACHE_DIR, 'audio'))
+AUDIO_CACHE_MAX_BYTES = int(os.getenv('AUDIO_CACHE_MAX_BYTES', str(512 * 1024 * 1024)))
+
+# Voice Catalog - parsed once from the CSV into a compact cache file, reloaded when the CSV's mtime/size changes
+VOICE_CATALOG_CSV = os.getenv('VOICE_CATALOG_CSV', os.path.join('reference', '22spanish_voices_complete - spanish_voices_complete.csv'))
+VOICE_CATALOG_CACHE_PATH = os.getenv('VOICE_CATALOG_CACHE_PATH', os.path.join(CACHE_DIR, 'voice_catalog.json'))
+
+# Generated Audio Artifacts (uncached TTS output, joined segments) - reference counted, TTL/quota garbage collected
+ARTIFACT_DIR = os.getenv('ARTIFACT_DIR', os.path.join(CACHE_DIR, 'artifacts'))
+ARTIFACT_TTL_SECONDS = float(os.getenv('ARTIFACT_TTL_SECONDS', '3600'))
+ARTIFACT_MAX_BYTES = int(os.getenv('ARTIFACT_MAX_BYTES', str(256 * 1024 * 1024)))
+ARTIFACT_GC_INTERVAL_SECONDS = float(os.getenv('ARTIFACT_GC_INTERVAL_SECONDS', '60'))
+ARTIFACT_RELEASE_GRACE_SECONDS = float(os.getenv('ARTIFACT_RELEASE_GRACE_SECONDS', '60'))
+
+# Streaming TTS / Local Media Server Configuration
+# The browser fetches streamed audio from MEDIA_SERVER_PUBLIC_URL, so it must be reachable from clients
+TTS_STREAMING_ENABLED = os.getenv('TTS_STREAMING_ENABLED', 'false').lower() == 'true'
+# Play and download finished audio by URL from the media server (range requests) instead of inlining it as base64
+MEDIA_URL_PLAYBACK_ENABLED = os.getenv('MEDIA_URL_PLAYBACK_ENABLED', 'false').lower() == 'true'
+MEDIA_SERVER_HOST = os.getenv('MEDIA_SERVER_HOST', '127.0.0.1')
+MEDIA_SERVER_PORT = int(os.getenv('MEDIA_SERVER_PORT', '8502'))
+MEDIA_SERVER_PUBLIC_URL = os.getenv('MEDIA_SERVER_PUBLIC_URL', f'http://localhost:{MEDIA_SERVER_PORT}')
+
+# Long-Document Translation Configuration
+# Inputs estimated above TRANSLATION_CHUNK_TOKENS are split on paragraph/sentence boundaries and translated in parallel
+TRANSLATION_CHUNK_TOKENS = int(os.getenv('TRANSLATION_CHUNK_TOKENS', '1000'))
+TRANSLATION_CHUNK_CONCURRENCY = int(os.getenv('TRANSLATION_CHUNK_CONCURRENCY', '16'))
+TRANSLATION_CHUNK_OVERLAP_CHARS = int(os.getenv('TRANSLATION_CHUNK_OVERLAP_CHARS', '300'))
+
+# Incremental Re-translation Configuration
+# Re-translating edited text sends only added/changed sentences when at least MIN_REUSE of its sentences are already translated
+INCREMENTAL_TRANSLATION_ENABLED = os.getenv('INCREMENTAL_TRANSLATION_ENABLED', 'true').lower() == 'true'
+INCREMENTAL_TRANSLATION_MIN_REUSE = float(os.getenv('INCREMENTAL_TRANSLATION_MIN_REUSE', '0.5'))
+INCREMENTAL_TRANSLATION_MAX_SEGMENTS = int(os.getenv('INCREMENTAL_TRANSLATION_MAX_SEGMENTS', '500'))
+
+# Long-Recording Transcription Configuration
+# Recordings longer than ~1.5 segments (or over the upload limit) are split at pauses and transcribed in parallel
+TRANSCRIPTION_SEGMENT_SECONDS = float(os.getenv('TRANSCRIPTION_SEGMENT_SECONDS', '45'))
+TRANSCRIPTION_SEGMENT_CONCURRENCY = int(os.getenv('TRANSCRIPTION_SEGMENT_CONCURRENCY', '8'))
+TRANSCRIPTION_MAX_UPLOAD_BYTES = int(os.getenv('TRANSCRIPTION_MAX_UPLOAD_BYTES', str(24 * 1024 * 1024)))
+# Recordings are downmixed, resampled and silence-trimmed before upload
+AUDIO_PREPROCESSING_ENABLED = os.getenv('AUDIO_PREPROCESSING_ENABLED', 'true').lower() == 'true'
+TRANSCRIPTION_SAMPLE_RATE = int(os.getenv('TRANSCRIPTION_SAMPLE_RATE', '16000'))
+# Spanish dictation is translated to English by Whisper's translations endpoint, concurrently with transcription
+SPEECH_TRANSLATION_DIRECT = os.getenv('SPEECH_TRANSLATION_DIRECT', 'false').lower() == 'true'
+SPEECH_TRANSLATION_MODEL = os.getenv('SPEECH_TRANSLATION_MODEL', 'whisper-large-v3')
+
+# Shared HTTP Connection Pool Configuration (sync and async Groq/ElevenLabs clients)
+HTTP_POOL_MAX_CONNECTIONS = int(os.getenv('HTTP_POOL_MAX_CONNECTIONS', '100'))
+HTTP_POOL_MAX_KEEPALIVE = int(os.getenv('HTTP_POOL_MAX_KEEPALIVE', '20'))
+HTTP_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv('HTTP_KEEPALIVE_EXPIRY_SECONDS', '120'))
+HTTP_TIMEOUT_SECONDS = float(os.getenv('HTTP_TIMEOUT_SECONDS', '60'))
+HTTP2_ENABLED = os.getenv('HTTP2_ENABLED', 'false').lower() == 'true'  # Needs the h2 package (httpx[http2])
+# Connections opened per provider at startup, and how often idle providers are pinged to keep them open (0 disables)
+HTTP_WARMUP_ENABLED = os.getenv('HTTP_WARMUP_ENABLED', 'true').lower() == 'true'
+HTTP_WARMUP_CONNECTIONS = int(os.getenv('HTTP_WARMUP_CONNECTIONS', '4'))
+HTTP_KEEP_WARM_INTERVAL_SECONDS = float(os.getenv('HTTP_KEEP_WARM_INTERVAL_SECONDS', '30'))
+
+# Provider Call Resilience Configuration (retries, per-operation deadlines, hedging, circuit breakers)
+PROVIDER_MAX_ATTEMPTS = int(os.getenv('PROVIDER_MAX_ATTEMPTS', '3'))
+PROVIDER_CALL_WORKERS = int(os.getenv('PROVIDER_CALL_WORKERS', '32'))
+DETECTION_DEADLINE_SECONDS = float(os.getenv('DETECTION_DEADLINE_SECONDS', '10'))
+TRANSLATION_DEADLINE_SECONDS = float(os.getenv('TRANSLATION_DEADLINE_SECONDS', '30'))
+TRANSCRIPTION_DEADLINE_SECONDS = float(os.getenv('TRANSCRIPTION_DEADLINE_SECONDS', '90'))
+TTS_DEADLINE_SECONDS = float(os.getenv('TTS_DEADLINE_SECONDS', '45'))
+# Hedged requests send a duplicate once an attempt outlives the HEDGE_PERCENTILE latency (costs a second request)
+HEDGE_REQUESTS_ENABLED = os.getenv('HEDGE_REQUESTS_ENABLED', 'false').lower() == 'true'
+HEDGE_PERCENTILE = float(os.getenv('HEDGE_PERCENTILE', '95'))
+HEDGE_MIN_SAMPLES = int(os.getenv('HEDGE_MIN_SAMPLES', '20'))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', '5'))
+CIRCUIT_RESET_SECONDS = float(os.getenv('CIRCUIT_RESET_SECONDS', '30'))
+
+# Background Job Configuration (transcription/translation/TTS run off the Streamlit script thread)
+# Worker threads per job kind, and how many more jobs of a kind may wait before submissions are refused
+JOB_TRANSCRIPTION_WORKERS = int(os.getenv('JOB_TRANSCRIPTION_WORKERS', '8'))
+JOB_TRANSLATION_WORKERS = int(os.getenv('JOB_TRANSLATION_WORKERS', '16'))
+JOB_TTS_WORKERS = int(os.getenv('JOB_TTS_WORKERS', '8'))
+JOB_QUEUE_LIMIT = int(os.getenv('JOB_QUEUE_LIMIT', '64'))
+# How often the UI polls pending jobs (only while a job is pending)
+JOB_POLL_INTERVAL_SECONDS = float(os.getenv('JOB_POLL_INTERVAL_SECONDS', '0.5'))
+
+# Speculative Translation (opt-in): translate dictation as soon as it is transcribed, and typed text once it
+# has been unchanged for the debounce interval, so pressing Translate adopts a finished or in-flight result
+SPECULATIVE_TRANSLATION_ENABLED = os.getenv('SPECULATIVE_TRANSLATION_ENABLED', 'false').lower() == 'true'
+SPECULATIVE_TRANSLATION_DEBOUNCE_SECONDS = float(os.getenv('SPECULATIVE_TRANSLATION_DEBOUNCE_SECONDS', '1.0'))
+
+# Predictive TTS Prefetch (opt-in): synthesize each new translation with the session's likely voice before it is
+# picked; speculative characters are capped per process over a sliding window
+TTS_PREFETCH_ENABLED = os.getenv('TTS_PREFETCH_ENABLED', 'false').lower() == 'true'
+TTS_PREFETCH_BUDGET_CHARS = int(os.getenv('TTS_PREFETCH_BUDGET_CHARS', '20000'))
+TTS_PREFETCH_BUDGET_WINDOW_SECONDS = float(os.getenv('TTS_PREFETCH_BUDGET_WINDOW_SECONDS', '3600'))
+TTS_PREFETCH_MAX_TEXT_CHARS = int(os.getenv('TTS_PREFETCH_MAX_TEXT_CHARS', '1000'))
+
+# Language Detection Configuration
+# Below this calibrated confidence the local classifier defers to the LLM
+LANGUAGE_DETECTION_CONFIDENCE_THRESHOLD = float(os.getenv('LANGUAGE_DETECTION_CONFIDENCE_THRESHOLD', '0.9'))
+# When local detection is inconclusive, detect and translate in one structured Groq call instead of two
+SINGLE_ROUND_TRIP_TRANSLATION = os.getenv('SINGLE_ROUND_TRIP_TRANSLATION', 'false').lower() == 'true'
+
+# Transcription Cache Configuration (in-memory, shared across sessions)
+TRANSCRIPTION_CACHE_MAX_ENTRIES = int(os.getenv('TRANSCRIPTION_CACHE_MAX_ENTRIES', '256'))
+TRANSCRIPTION_CACHE_MAX_BYTES = int(os.getenv('TRANSCRIPTION_CACHE_MAX_BYTES', str(4 * 1024 * 1024)))
+
 # Logging Configuration
 def setup_logging():
     """Setup logging configuration for the application."""
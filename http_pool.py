@@ -0,0 +1,252 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+import httpx
+from config import (
+    LOGGERS, GROQ_API_KEY, ELEVEN_LABS_API_KEY,
+    HTTP_POOL_MAX_CONNECTIONS, HTTP_POOL_MAX_KEEPALIVE, HTTP_KEEPALIVE_EXPIRY_SECONDS, HTTP_TIMEOUT_SECONDS,
+    HTTP2_ENABLED, HTTP_WARMUP_ENABLED, HTTP_WARMUP_CONNECTIONS, HTTP_KEEP_WARM_INTERVAL_SECONDS
+)
+
+# Get API logger
+api_logger = LOGGERS['api']
+
+# Cheap authenticated GETs on each provider's API host, used to open and keep connections warm
+GROQ_WARMUP_URL = "https://api.groq.com/openai/v1/models"
+ELEVENLABS_WARMUP_URL = "https://api.elevenlabs.io/v1/models"
+
+_lock = threading.Lock()
+_engine_loop = None
+_async_http_client = None
+_http_client = None
+_keep_warm_thread = None
+_last_request_at = {}  # host -> monotonic time of the last request through the sync pool
+_last_async_request_at = {}  # same for the async pool; its connections go stale independently
+
+
+def get_engine_loop():
+    """
+    Process-wide asyncio event loop, run forever on one daemon thread.
+
+    The async engines live on this loop: every Streamlit session submits its
+    coroutines here, so concurrent requests share one thread and one pooled
+    set of connections instead of a thread each.
+    """
+    global _engine_loop
+    with _lock:
+        if _engine_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="engine-loop", daemon=True).start()
+            _engine_loop = loop
+            api_logger.info("Started async engine event loop")
+        return _engine_loop
+
+
+def submit(coro):
+    """Schedule a coroutine on the engine loop; returns a concurrent.futures.Future."""
+    return asyncio.run_coroutine_threadsafe(coro, get_engine_loop())
+
+
+def run_coroutine(coro, timeout=None):
+    """Run a coroutine on the engine loop and block the calling (script) thread for its result."""
+    return submit(coro).result(timeout)
+
+
+def _pool_limits():
+    # httpx closes idle keep-alive connections after 5s by default - far shorter than the gap between user turns
+    return httpx.Limits(
+        max_connections=HTTP_POOL_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_POOL_MAX_KEEPALIVE,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS
+    )
+
+
+def _http2_available():
+    """HTTP/2 if enabled and the h2 package is installed."""
+    if not HTTP2_ENABLED:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        api_logger.warning("HTTP2_ENABLED is set but the h2 package is missing (pip install 'httpx[http2]'); using HTTP/1.1")
+        return False
+    return True
+
+
+def _mark_request(request):
+    _last_request_at[request.url.host] = time.monotonic()
+
+
+async def _mark_request_async(request):
+    _last_async_request_at[request.url.host] = time.monotonic()
+
+
+def get_http_client():
+    """
+    Process-wide pooled httpx.Client shared by the sync Groq and ElevenLabs clients.
+
+    Keep-alive connections stay open for HTTP_KEEPALIVE_EXPIRY_SECONDS, so turns
+    from every session reuse warm connections instead of paying DNS + TLS again.
+    """
+    global _http_client
+    with _lock:
+        if _http_client is None:
+            http2 = _http2_available()
+            _http_client = httpx.Client(
+                limits=_pool_limits(),
+                timeout=httpx.Timeout(HTTP_TIMEOUT_SECONDS),
+                http2=http2,
+                follow_redirects=True,
+                event_hooks={"request": [_mark_request]}
+            )
+            api_logger.info(
+                f"Created shared HTTP pool (max_connections={HTTP_POOL_MAX_CONNECTIONS}, "
+                f"max_keepalive={HTTP_POOL_MAX_KEEPALIVE}, keepalive_expiry={HTTP_KEEPALIVE_EXPIRY_SECONDS:.0f}s, "
+                f"http2={http2})"
+            )
+        return _http_client
+
+
+def get_async_http_client():
+    """
+    Process-wide pooled httpx.AsyncClient shared by AsyncGroq and AsyncElevenLabs.
+
+    Its connections belong to the engine loop, so only use it from coroutines
+    running there (submit / run_coroutine).
+    """
+    global _async_http_client
+    with _lock:
+        if _async_http_client is None:
+            http2 = _http2_available()
+            _async_http_client = httpx.AsyncClient(
+                limits=_pool_limits(),
+                timeout=httpx.Timeout(HTTP_TIMEOUT_SECONDS),
+                http2=http2,
+                follow_redirects=True,
+                event_hooks={"request": [_mark_request_async]}
+            )
+            api_logger.info(
+                f"Created shared async HTTP pool (max_connections={HTTP_POOL_MAX_CONNECTIONS}, "
+                f"max_keepalive={HTTP_POOL_MAX_KEEPALIVE}, http2={http2})"
+            )
+        return _async_http_client
+
+
+def _configured_endpoints():
+    """provider -> (warm-up URL, auth headers) for providers with an API key."""
+    endpoints = {}
+    if GROQ_API_KEY:
+        endpoints["groq"] = (GROQ_WARMUP_URL, {"Authorization": f"Bearer {GROQ_API_KEY}"})
+    if ELEVEN_LABS_API_KEY:
+        endpoints["elevenlabs"] = (ELEVENLABS_WARMUP_URL, {"xi-api-key": ELEVEN_LABS_API_KEY})
+    return endpoints
+
+
+def _ping(url, headers):
+    """One warm-up request; any HTTP response means the connection is open."""
+    start = time.monotonic()
+    try:
+        get_http_client().get(url, headers=headers).close()
+        return time.monotonic() - start
+    except httpx.HTTPError as e:
+        api_logger.warning(f"Warm-up request to {urlsplit(url).netloc} failed: {e}")
+        return None
+
+
+async def _warm_async_pool(endpoints, connections):
+    client = get_async_http_client()
+
+    async def ping(url, headers):
+        try:
+            await client.get(url, headers=headers)
+        except httpx.HTTPError as e:
+            api_logger.warning(f"Async warm-up request to {urlsplit(url).netloc} failed: {e}")
+
+    await asyncio.gather(*(ping(url, headers) for url, headers in endpoints.values() for _ in range(connections)))
+
+
+def _warm_provider(url, headers, connections):
+    """Concurrent pings so each opens (or refreshes) its own connection; returns the slowest, or None if all failed."""
+    with ThreadPoolExecutor(max_workers=connections, thread_name_prefix="http-warmup") as executor:
+        durations = [seconds for seconds in executor.map(lambda _: _ping(url, headers), range(connections)) if seconds is not None]
+    return max(durations) if durations else None
+
+
+def warm_up(connections=HTTP_WARMUP_CONNECTIONS):
+    """
+    Open `connections` keep-alive connections to every configured provider
+
+    Requests per provider are sent concurrently so each opens its own connection
+    (DNS, TCP and TLS done now rather than on the first user request). The async
+    pool is warmed too if an async engine has created it.
+
+    Returns:
+        dict: provider -> seconds of the slowest warm-up request (None if all failed)
+    """
+    endpoints = _configured_endpoints()
+    connections = max(1, connections)
+    start = time.monotonic()
+    timings = {provider: _warm_provider(url, headers, connections) for provider, (url, headers) in endpoints.items()}
+
+    if endpoints and _async_http_client is not None:
+        try:
+            run_coroutine(_warm_async_pool(endpoints, connections), timeout=HTTP_TIMEOUT_SECONDS)
+        except Exception as e:
+            api_logger.warning(f"Async pool warm-up failed: {e}")
+
+    api_logger.info(
+        f"HTTP pool warmed in {time.monotonic() - start:.2f}s ({connections} connection(s) per provider): {timings}"
+    )
+    return timings
+
+
+def _idle_endpoints(last_request_at, interval_seconds):
+    """Configured providers nobody has talked to through a pool for a full interval."""
+    now = time.monotonic()
+    return {
+        provider: (url, headers) for provider, (url, headers) in _configured_endpoints().items()
+        if now - last_request_at.get(urlsplit(url).hostname, 0.0) >= interval_seconds
+    }
+
+
+def _keep_warm_loop(interval_seconds, connections):
+    while True:
+        time.sleep(interval_seconds)
+        for provider, (url, headers) in _idle_endpoints(_last_request_at, interval_seconds).items():
+            if _warm_provider(url, headers, connections) is not None:
+                api_logger.debug(f"Keep-warm ping to {provider}")
+        # The async pool only exists once an async engine has created it
+        if _async_http_client is not None:
+            idle = _idle_endpoints(_last_async_request_at, interval_seconds)
+            if idle:
+                try:
+                    run_coroutine(_warm_async_pool(idle, connections), timeout=HTTP_TIMEOUT_SECONDS)
+                    api_logger.debug(f"Async keep-warm ping to {', '.join(idle)}")
+                except Exception as e:
+                    api_logger.warning(f"Async pool keep-warm failed: {e}")
+
+
+def _warm_and_keep_warm(interval_seconds):
+    if HTTP_WARMUP_ENABLED:
+        warm_up()
+    if interval_seconds > 0:
+        _keep_warm_loop(interval_seconds, max(1, HTTP_WARMUP_CONNECTIONS))
+
+
+def start_warm_pool(interval_seconds=HTTP_KEEP_WARM_INTERVAL_SECONDS):
+    """
+    Warm the shared pool in the background and keep it warm (idempotent)
+
+    Call once at process start; the first translation then finds open
+    connections instead of paying connection setup.
+    """
+    global _keep_warm_thread
+    with _lock:
+        if _keep_warm_thread is not None:
+            return
+        _keep_warm_thread = threading.Thread(
+            target=_warm_and_keep_warm, args=(interval_seconds,), name="http-keep-warm", daemon=True
+        )
+        _keep_warm_thread.start()
@@ -0,0 +1,238 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from config import (
+    LOGGERS, JOB_TRANSCRIPTION_WORKERS, JOB_TRANSLATION_WORKERS, JOB_TTS_WORKERS, JOB_QUEUE_LIMIT
+)
+
+# Get UI logger
+ui_logger = LOGGERS['ui']
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+class JobQueueFull(Exception):
+    """Raised when a job kind already has as many jobs waiting as its queue allows."""
+
+
+class Job:
+    """
+    Handle for one background job; safe to keep in st.session_state.
+
+    The job function runs on a worker thread and must not touch Streamlit state:
+    it receives this handle, returns its result, and may publish partial results
+    with ``report()`` and check ``cancel_event``. The script thread polls
+    ``status`` / ``progress`` and applies ``result`` once the job is done.
+    """
+
+    def __init__(self, kind, owner=None, slot=None, description=""):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.owner = owner
+        self.slot = slot
+        self.description = description
+        self.cancel_event = threading.Event()
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self._status = QUEUED
+        self._progress = None
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    @property
+    def status(self):
+        with self._lock:
+            return self._status
+
+    @property
+    def progress(self):
+        """Latest value passed to report() (e.g. the translation so far), or None."""
+        with self._lock:
+            return self._progress
+
+    @property
+    def finished(self):
+        return self._done.is_set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    @property
+    def elapsed_seconds(self):
+        return (self.finished_at or time.time()) - self.submitted_at
+
+    def report(self, progress):
+        with self._lock:
+            self._progress = progress
+
+    def cancel(self):
+        """
+        Ask the job to stop; its result is discarded either way
+
+        A queued job never runs. A running job keeps its worker until the
+        function returns (or notices cancel_event), but its status becomes
+        cancelled and its result is dropped.
+        """
+        self.cancel_event.set()
+        with self._lock:
+            if self._status in (QUEUED, RUNNING):
+                self._status = CANCELLED
+
+    def wait(self, timeout=None):
+        """Block until the job finishes; returns False on timeout. Not for the script thread."""
+        return self._done.wait(timeout)
+
+    def _finish(self, status, result=None, error=None):
+        with self._lock:
+            self.finished_at = time.time()
+            if self._status != CANCELLED:
+                self._status = status
+                self.result = result
+                self.error = error
+        self._done.set()
+
+
+class JobExecutor:
+    """
+    Process-wide background executor with one bounded worker pool per job kind.
+
+    Kinds ("transcription", "translation", "tts") have separate pools, so a
+    burst of slow syntheses cannot starve transcriptions. Each kind accepts at
+    most its worker count plus ``queue_limit`` unfinished jobs; beyond that
+    submit() raises JobQueueFull instead of queueing unbounded work. Jobs
+    submitted with an (owner, slot) supersede - cancel - the owner's previous
+    job in that slot, so one session holds at most one job per slot and can
+    never pile work up in front of other sessions.
+    """
+
+    def __init__(self, workers, queue_limit=JOB_QUEUE_LIMIT):
+        self.queue_limit = queue_limit
+        self._workers = dict(workers)
+        self._pools = {
+            kind: ThreadPoolExecutor(max_workers=count, thread_name_prefix=f"job-{kind}")
+            for kind, count in self._workers.items()
+        }
+        self._lock = threading.Lock()
+        self._unfinished = {kind: 0 for kind in self._workers}
+        self._slots = {}  # (owner, slot) -> Job
+        self.stats = {
+            'submitted': 0,
+            'completed': 0,
+            'failed': 0,
+            'cancelled': 0,
+            'superseded': 0,
+            'rejected': 0,
+        }
+
+    def submit(self, kind, fn, *args, owner=None, slot=None, description="", **kwargs):
+        """
+        Run fn(job, *args, **kwargs) on the kind's pool and return its Job handle
+
+        Raises:
+            KeyError: Unknown job kind
+            JobQueueFull: Too many unfinished jobs of this kind
+        """
+        pool = self._pools[kind]
+        job = Job(kind, owner=owner, slot=slot, description=description)
+        with self._lock:
+            if self._unfinished[kind] >= self._workers[kind] + self.queue_limit:
+                self.stats['rejected'] += 1
+                raise JobQueueFull(f"Too many {kind} jobs in progress, try again shortly")
+            previous = self._slots.get((owner, slot)) if slot is not None else None
+            if slot is not None:
+                self._slots[(owner, slot)] = job
+            self._unfinished[kind] += 1
+            self.stats['submitted'] += 1
+        if previous is not None and not previous.finished:
+            previous.cancel()
+            self._count('superseded')
+        pool.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _run(self, job, fn, args, kwargs):
+        try:
+            # Checked and claimed under the job's lock, so a cancel() can't slip in between
+            with job._lock:
+                cancelled = job._status == CANCELLED
+                if not cancelled:
+                    job._status = RUNNING
+                    job.started_at = time.time()
+            if cancelled:
+                job._finish(CANCELLED)
+                return
+            try:
+                result = fn(job, *args, **kwargs)
+            except Exception as e:
+                ui_logger.error(f"Error during background {job.kind} job {job.description or job.id[:8]}: {e}")
+                job._finish(FAILED, error=e)
+            else:
+                job._finish(DONE, result=result)
+        finally:
+            with self._lock:
+                self._unfinished[job.kind] -= 1
+                if job.slot is not None and self._slots.get((job.owner, job.slot)) is job:
+                    del self._slots[(job.owner, job.slot)]
+                self.stats[{DONE: 'completed', FAILED: 'failed'}.get(job.status, 'cancelled')] += 1
+
+    def reassign(self, job, slot):
+        """
+        Move an unfinished job to another of its owner's slots (e.g. adopt a speculative job)
+
+        Whatever job held the target slot is superseded; the job's old slot is freed.
+        """
+        with self._lock:
+            if self._slots.get((job.owner, job.slot)) is job:
+                del self._slots[(job.owner, job.slot)]
+            previous = self._slots.get((job.owner, slot))
+            job.slot = slot
+            if not job.finished:
+                self._slots[(job.owner, slot)] = job
+        if previous is not None and previous is not job and not previous.finished:
+            previous.cancel()
+            self._count('superseded')
+
+    def cancel_owner(self, owner):
+        """Cancel every unfinished slotted job of one owner (e.g. a session starting over)."""
+        with self._lock:
+            jobs = [job for (job_owner, _), job in self._slots.items() if job_owner == owner]
+        for job in jobs:
+            job.cancel()
+        return len(jobs)
+
+    def get_stats(self):
+        """Return job counters plus unfinished jobs per kind."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['unfinished'] = dict(self._unfinished)
+            return stats
+
+
+_executor_lock = threading.Lock()
+_executor = None
+
+
+def get_job_executor():
+    """Process-wide job executor (configured from config)."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = JobExecutor({
+                "transcription": JOB_TRANSCRIPTION_WORKERS,
+                "translation": JOB_TRANSLATION_WORKERS,
+                "tts": JOB_TTS_WORKERS,
+            })
+            ui_logger.info(f"Started background job executor (queue limit {JOB_QUEUE_LIMIT} per kind)")
+        return _executor
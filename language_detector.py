@@ -0,0 +1,149 @@
+import functools
+import json
+import math
+import os
+import re
+import unicodedata
+import numpy as np
+from config import LOGGERS
+
+# Get API logger
+api_logger = LOGGERS['api']
+
+DEFAULT_PROFILES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reference", "language_profiles.json")
+WORD_PATTERN = re.compile(r"[^\W\d_]+")
+SPANISH_ONLY_MARKS = "¿¡"
+
+
+def normalize_for_detection(text):
+    return unicodedata.normalize('NFC', (text or '').lower())
+
+
+def word_features(word, ngram_range=(1, 3)):
+    """Features contributed by one word: the word itself plus n-grams of the space-padded word."""
+    features = ["w:" + word]
+    padded = f" {word} "
+    for n in range(ngram_range[0], ngram_range[1] + 1):
+        for i in range(len(padded) - n + 1):
+            gram = padded[i:i + n]
+            if gram.strip():
+                features.append("c:" + gram)
+    return features
+
+
+def extract_features(text, ngram_range=(1, 3)):
+    """
+    Features used by the detector: whole words ("w:"), character n-grams of
+    space-padded words ("c:") and Spanish-only punctuation ("p:").
+    """
+    text = normalize_for_detection(text)
+    features = []
+    for word in WORD_PATTERN.findall(text):
+        features.extend(word_features(word, ngram_range))
+    for mark in SPANISH_ONLY_MARKS:
+        if mark in text:
+            features.append("p:" + mark)
+    return features
+
+
+class LanguageDetector:
+    """
+    Offline English/Spanish classifier (naive Bayes over words and character n-grams).
+
+    The precomputed table stores one log-likelihood ratio per feature (positive
+    means Spanish) plus Platt-scaling coefficients fitted on held-out data, so
+    ``confidence`` is a calibrated probability rather than a raw score. Build the
+    table with build_language_profiles.py.
+
+    A word always contributes the same total weight, so per-word scores are
+    memoized and texts are scored as sums over their words.
+    """
+
+    def __init__(self, profiles_path=DEFAULT_PROFILES_PATH, max_cached_words=50000):
+        with open(profiles_path, encoding='utf-8') as f:
+            profiles = json.load(f)
+
+        self.ngram_range = tuple(profiles['ngram_range'])
+        self.calibration_a = profiles['calibration']['a']
+        self.calibration_b = profiles['calibration']['b']
+        self.max_cached_words = max_cached_words
+        self._weight_map = dict(zip(profiles['features'], profiles['weights']))
+        self._mark_weights = {mark: self._weight_map.get("p:" + mark, 0.0) for mark in SPANISH_ONLY_MARKS}
+        self._word_scores = {}  # Memoized per-word scores, bounded by max_cached_words
+        api_logger.info(f"Language detector loaded {len(self._weight_map)} features from {profiles_path}")
+
+    def _word_score(self, word):
+        """Total weight of a word's features, memoized."""
+        word_score = self._word_scores.get(word)
+        if word_score is None:
+            weight_map = self._weight_map
+            word_score = sum(weight_map.get(f, 0.0) for f in word_features(word, self.ngram_range))
+            if len(self._word_scores) < self.max_cached_words:
+                self._word_scores[word] = word_score
+        return word_score
+
+    def _mark_score(self, text):
+        return sum(weight for mark, weight in self._mark_weights.items() if mark in text)
+
+    def score(self, text):
+        """Log-likelihood ratio of Spanish vs English (None if the text has no letters)."""
+        text = normalize_for_detection(text)
+        words = WORD_PATTERN.findall(text)
+        if not words:
+            return None
+        return sum(map(self._word_score, words)) + self._mark_score(text)
+
+    def _calibrate(self, llr):
+        z = self.calibration_a * llr + self.calibration_b
+        return 1.0 / (1.0 + math.exp(-z)) if z > -500 else 0.0
+
+    def detect(self, text):
+        """
+        Classify one text
+
+        Returns:
+            tuple: ("ENGLISH" | "SPANISH" | "UNKNOWN", calibrated confidence in [0.5, 1])
+        """
+        llr = self.score(text)
+        if llr is None:
+            return "UNKNOWN", 0.0
+        p_spanish = self._calibrate(llr)
+        if p_spanish >= 0.5:
+            return "SPANISH", p_spanish
+        return "ENGLISH", 1.0 - p_spanish
+
+    def detect_batch(self, texts):
+        """
+        Classify many texts at once; scoring is vectorized with NumPy
+
+        Returns:
+            tuple: (labels list, confidences ndarray)
+        """
+        texts = [normalize_for_detection(text) for text in texts]
+        word_lists = [WORD_PATTERN.findall(text) for text in texts]
+        word_scores = np.fromiter(
+            (self._word_score(word) for words in word_lists for word in words),
+            dtype=np.float64, count=sum(len(words) for words in word_lists)
+        )
+        lengths = np.fromiter((len(words) for words in word_lists), dtype=np.int64, count=len(texts))
+        owners = np.repeat(np.arange(len(texts)), lengths)
+        llr = np.bincount(owners, weights=word_scores, minlength=len(texts))
+        llr += np.fromiter((self._mark_score(text) for text in texts), dtype=np.float64, count=len(texts))
+
+        z = np.clip(self.calibration_a * llr + self.calibration_b, -500, 500)
+        p_spanish = 1.0 / (1.0 + np.exp(-z))
+        is_spanish = p_spanish >= 0.5
+        has_letters = lengths > 0
+        confidences = np.where(is_spanish, p_spanish, 1.0 - p_spanish)
+        confidences[~has_letters] = 0.0
+        labels = [
+            ("SPANISH" if spanish else "ENGLISH") if letters else "UNKNOWN"
+            for spanish, letters in zip(is_spanish, has_letters)
+        ]
+        return labels, confidences
+
+
+@functools.lru_cache(maxsize=None)
+def get_language_detector(profiles_path=DEFAULT_PROFILES_PATH):
+    """Process-wide detector; the table is loaded once."""
+    return LanguageDetector(profiles_path)
@@ -0,0 +1,396 @@
+import hashlib
+import os
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote, parse_qs, urlsplit
+from config import LOGGERS
+
+# Get audio logger
+audio_logger = LOGGERS['audio']
+
+RANGE_PATTERN = re.compile(r"bytes=(\d*)-(\d*)$")
+COPY_CHUNK_BYTES = 64 * 1024
+
+
+def parse_range(header, size):
+    """
+    Parse a single-range Range header against a resource of `size` bytes
+
+    Returns:
+        tuple: (start, end) inclusive, None for no/unsupported range (serve everything),
+               or "unsatisfiable"
+    """
+    match = RANGE_PATTERN.match((header or "").strip())
+    if not match:
+        return None  # Absent, malformed or multi-range: a full 200 response is allowed
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return "unsatisfiable"
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return "unsatisfiable"
+    return start, end
+
+
+class StreamInterrupted(Exception):
+    """Raised to a stream reader when the producer failed or stalled before finishing."""
+
+
+class _StreamBuffer:
+    """Chunks of one audio stream, readable by any number of clients while it is still growing."""
+
+    def __init__(self, content_type):
+        self.content_type = content_type
+        self.chunks = []
+        self.size = 0
+        self.done = False
+        self.error = None
+        self.created_at = time.time()
+        self.updated_at = self.created_at  # Last chunk (or creation); a stale unfinished stream lost its producer
+        self.finished_at = None
+        self.producer = None
+        self._condition = threading.Condition()
+
+    def append(self, chunk):
+        with self._condition:
+            self.chunks.append(chunk)
+            self.size += len(chunk)
+            self.updated_at = time.time()
+            self._condition.notify_all()
+
+    def finish(self, error=None):
+        with self._condition:
+            self.done = True
+            self.error = error
+            self.finished_at = time.time()
+            self._condition.notify_all()
+
+    def iter_chunks(self, timeout):
+        """
+        Yield chunks from the start, blocking for new ones until the stream finishes
+
+        Raises:
+            StreamInterrupted: The producer failed, or sent nothing for `timeout` seconds
+        """
+        index = 0
+        while True:
+            with self._condition:
+                while index >= len(self.chunks) and not self.done:
+                    if not self._condition.wait(timeout):
+                        raise StreamInterrupted(f"no audio for {timeout:.0f}s")
+                if index >= len(self.chunks):
+                    if self.error is not None:
+                        raise StreamInterrupted(str(self.error))
+                    return
+                chunk = self.chunks[index]
+            index += 1
+            yield chunk
+
+    def get_bytes(self):
+        """Return the complete stream, or None while it is still being produced or if it failed."""
+        with self._condition:
+            if not self.done or self.error is not None:
+                return None
+            return b''.join(self.chunks)
+
+
+class MediaServer:
+    """
+    Small local HTTP server that streams generated audio to the browser.
+
+    Streamlit cannot expose custom endpoints, so players fetch audio from this
+    server instead. ``register_stream`` drains a chunk iterator on a background
+    thread while ``GET /stream/<id>`` relays chunks (HTTP chunked encoding) as soon
+    as they arrive. Finished streams are kept for ``stream_ttl_seconds`` so
+    reruns and replays can fetch them again.
+
+    Finished audio files are served by URL too (``register_file``, ``GET /media/<id>``)
+    with HTTP range support, and player pages are served from memory
+    (``register_page``, ``GET /page/<id>``), so a rerun only sends the browser a URL
+    instead of base64 audio inlined in the component HTML.
+    """
+
+    def __init__(self, host, port, public_url, stream_ttl_seconds=600, read_timeout=30.0,
+                 max_files=1024, max_pages=256):
+        self.host = host
+        self.port = port
+        self.public_url = public_url.rstrip('/')
+        self.stream_ttl_seconds = stream_ttl_seconds
+        self.read_timeout = read_timeout
+        self.max_files = max_files
+        self.max_pages = max_pages
+
+        self._lock = threading.Lock()
+        self._streams = {}
+        self._files = OrderedDict()  # media id -> (path, content type), LRU
+        self._pages = OrderedDict()  # page id -> UTF-8 HTML, LRU
+        self._httpd = None
+        self._thread = None
+
+    def start(self):
+        """Bind the server and serve it from a daemon thread."""
+        self._httpd = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="media-server", daemon=True)
+        self._thread.start()
+        audio_logger.info(f"Media server listening on {self.host}:{self.port} (public URL: {self.public_url})")
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def register_stream(self, chunks, content_type='audio/mpeg'):
+        """Start draining an iterator of audio chunks; returns the stream id."""
+        self._reap()
+        stream_id = uuid.uuid4().hex
+        buffer = _StreamBuffer(content_type)
+        with self._lock:
+            self._streams[stream_id] = buffer
+
+        def produce():
+            start_time = time.time()
+            try:
+                for chunk in chunks:
+                    if chunk:
+                        if not buffer.chunks:
+                            audio_logger.info(f"Stream {stream_id[:8]} first chunk after {time.time() - start_time:.2f}s")
+                        buffer.append(chunk)
+                buffer.finish()
+                audio_logger.info(f"Stream {stream_id[:8]} finished: {buffer.size} bytes in {time.time() - start_time:.2f}s")
+            except Exception as e:
+                audio_logger.error(f"Stream {stream_id[:8]} failed: {e}")
+                buffer.finish(error=e)
+
+        buffer.producer = threading.Thread(target=produce, name=f"stream-{stream_id[:8]}", daemon=True)
+        buffer.producer.start()
+        return stream_id
+
+    def stream_url(self, stream_id):
+        return f"{self.public_url}/stream/{stream_id}"
+
+    def get_stream(self, stream_id):
+        with self._lock:
+            return self._streams.get(stream_id)
+
+    def get_stream_bytes(self, stream_id):
+        """Complete audio of a finished stream, or None."""
+        buffer = self.get_stream(stream_id)
+        return buffer.get_bytes() if buffer is not None else None
+
+    def register_file(self, path, content_type='audio/mpeg'):
+        """Expose a file at /media/<id>; the id is derived from the path, so re-registering is free."""
+        media_id = hashlib.sha256(os.path.abspath(path).encode('utf-8')).hexdigest()[:32]
+        with self._lock:
+            self._files[media_id] = (path, content_type)
+            self._files.move_to_end(media_id)
+            while len(self._files) > self.max_files:
+                self._files.popitem(last=False)
+        return media_id
+
+    def media_url(self, media_id, download_name=None):
+        """URL of a registered file; with download_name the response is sent as an attachment."""
+        url = f"{self.public_url}/media/{media_id}"
+        return f"{url}?download={quote(download_name)}" if download_name else url
+
+    def get_file(self, media_id):
+        with self._lock:
+            return self._files.get(media_id)
+
+    def register_page(self, html):
+        """Serve an HTML page at /page/<id>; the id is a content hash, so identical pages share a URL."""
+        body = html.encode('utf-8')
+        page_id = hashlib.sha256(body).hexdigest()[:32]
+        with self._lock:
+            self._pages[page_id] = body
+            self._pages.move_to_end(page_id)
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+        return page_id
+
+    def page_url(self, page_id):
+        return f"{self.public_url}/page/{page_id}"
+
+    def get_page(self, page_id):
+        with self._lock:
+            return self._pages.get(page_id)
+
+    def _reap(self):
+        """Forget finished streams older than the TTL, and fail unfinished ones whose producer is gone."""
+        cutoff = time.time() - self.stream_ttl_seconds
+        with self._lock:
+            abandoned = [
+                buf for buf in self._streams.values()
+                if not buf.done and (buf.updated_at < cutoff or (buf.producer is not None and not buf.producer.is_alive()))
+            ]
+        for buffer in abandoned:
+            # Readers still waiting on it end with a failed transfer; the stream is reaped a TTL later
+            buffer.finish(error=StreamInterrupted("audio producer stopped without finishing"))
+        with self._lock:
+            expired = [sid for sid, buf in self._streams.items() if buf.done and buf.finished_at < cutoff]
+            for stream_id in expired:
+                del self._streams[stream_id]
+        if abandoned:
+            audio_logger.warning(f"Failed {len(abandoned)} audio streams whose producer stopped")
+        if expired:
+            audio_logger.debug(f"Reaped {len(expired)} finished audio streams")
+
+    def _make_handler(self):
+        server = self
+
+        class MediaRequestHandler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                audio_logger.debug(f"Media server: {format % args}")
+
+            def _send_cors_headers(self):
+                # Players run inside component iframes with a different origin
+                self.send_header('Access-Control-Allow-Origin', '*')
+
+            def do_OPTIONS(self):
+                self.send_response(204)
+                self._send_cors_headers()
+                self.send_header('Access-Control-Allow-Methods', 'GET, HEAD, OPTIONS')
+                self.send_header('Access-Control-Allow-Headers', 'Range')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def do_GET(self):
+                self._route(head_only=False)
+
+            def do_HEAD(self):
+                self._route(head_only=True)
+
+            def _route(self, head_only):
+                url = urlsplit(self.path)
+                parts = url.path.strip('/').split('/')
+                if len(parts) == 2 and parts[0] == 'stream' and not head_only:
+                    self._serve_stream(parts[1])
+                elif len(parts) == 2 and parts[0] == 'media':
+                    download_name = parse_qs(url.query).get('download', [None])[0]
+                    self._serve_file(parts[1], head_only, download_name)
+                elif len(parts) == 2 and parts[0] == 'page':
+                    self._serve_page(parts[1], head_only)
+                else:
+                    self._send_not_found()
+
+            def _serve_page(self, page_id, head_only):
+                body = server.get_page(page_id)
+                if body is None:
+                    self._send_not_found()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Cache-Control', 'public, max-age=86400, immutable')  # Content-addressed
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if not head_only:
+                    self.wfile.write(body)
+
+            def _serve_file(self, media_id, head_only, download_name=None):
+                registered = server.get_file(media_id)
+                if registered is None:
+                    self._send_not_found()
+                    return
+                path, content_type = registered
+                try:
+                    media_file = open(path, 'rb')
+                except OSError:
+                    # Evicted from the audio cache (or a removed temp file)
+                    self._send_not_found()
+                    return
+                with media_file:
+                    stat = os.fstat(media_file.fileno())
+                    size = stat.st_size
+                    etag = f'"{media_id[:16]}-{size:x}-{int(stat.st_mtime):x}"'
+                    if self.headers.get('If-None-Match') == etag:
+                        self.send_response(304)
+                        self._send_cors_headers()
+                        self.send_header('ETag', etag)
+                        self.end_headers()
+                        return
+
+                    byte_range = parse_range(self.headers.get('Range'), size)
+                    if byte_range == "unsatisfiable":
+                        self.send_response(416)
+                        self._send_cors_headers()
+                        self.send_header('Content-Range', f'bytes */{size}')
+                        self.send_header('Content-Length', '0')
+                        self.end_headers()
+                        return
+                    start, end = byte_range if byte_range is not None else (0, size - 1)
+                    length = max(0, end - start + 1)
+
+                    self.send_response(206 if byte_range is not None else 200)
+                    self._send_cors_headers()
+                    self.send_header('Access-Control-Expose-Headers', 'Content-Range, Content-Length, Accept-Ranges')
+                    self.send_header('Content-Type', content_type)
+                    self.send_header('Accept-Ranges', 'bytes')
+                    self.send_header('Content-Length', str(length))
+                    if byte_range is not None:
+                        self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+                    self.send_header('ETag', etag)
+                    self.send_header('Cache-Control', 'private, max-age=3600')
+                    if download_name:
+                        self.send_header('Content-Disposition', f"attachment; filename*=UTF-8''{quote(download_name)}")
+                    self.end_headers()
+                    if head_only:
+                        return
+
+                    media_file.seek(start)
+                    remaining = length
+                    try:
+                        while remaining > 0:
+                            chunk = media_file.read(min(COPY_CHUNK_BYTES, remaining))
+                            if not chunk:
+                                break
+                            self.wfile.write(chunk)
+                            remaining -= len(chunk)
+                    except (BrokenPipeError, ConnectionResetError):
+                        audio_logger.debug(f"Client disconnected from media {media_id[:8]}")
+
+            def _send_not_found(self):
+                self.send_response(404)
+                self._send_cors_headers()
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def _serve_stream(self, stream_id):
+                buffer = server.get_stream(stream_id)
+                if buffer is None:
+                    self._send_not_found()
+                    return
+                self.send_response(200)
+                self._send_cors_headers()
+                self.send_header('Content-Type', buffer.content_type)
+                self.send_header('Cache-Control', 'no-store')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                try:
+                    for chunk in buffer.iter_chunks(server.read_timeout):
+                        self.wfile.write(f"{len(chunk):X}\r\n".encode('ascii') + chunk + b"\r\n")
+                        self.wfile.flush()
+                    self.wfile.write(b"0\r\n\r\n")
+                    self.wfile.flush()
+                except StreamInterrupted as e:
+                    # No terminating chunk: closing mid-body makes the browser see a failed transfer,
+                    # not a complete (truncated) MP3
+                    audio_logger.warning(f"Stream {stream_id[:8]} interrupted, closing the connection: {e}")
+                    self.close_connection = True
+                except (BrokenPipeError, ConnectionResetError):
+                    audio_logger.debug(f"Client disconnected from stream {stream_id[:8]}")
+
+        return MediaRequestHandler
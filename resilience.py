@@ -0,0 +1,379 @@
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import numpy as np
+from config import (
+    LOGGERS, PROVIDER_MAX_ATTEMPTS, HEDGE_REQUESTS_ENABLED, HEDGE_PERCENTILE, HEDGE_MIN_SAMPLES,
+    CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS, PROVIDER_CALL_WORKERS
+)
+
+# Get API logger
+api_logger = LOGGERS['api']
+
+RETRYABLE_STATUS_CODES = (408, 409, 425, 429, 500, 502, 503, 504)
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling the provider while its circuit breaker is open."""
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when an operation's deadline passes before any attempt succeeds."""
+
+
+def transient_retry_delay(error, attempt):
+    """Backoff before retrying a transient error: jittered exponential, at least the provider's Retry-After."""
+    delay = min(8.0, 0.5 * 2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+    response = getattr(error, "response", None)
+    try:
+        delay = max(delay, float(response.headers.get("retry-after")))
+    except (AttributeError, TypeError, ValueError):
+        pass
+    return delay
+
+
+def is_retryable(error):
+    """
+    Default classification: connection failures, timeouts, 408/409/425/429 and 5xx.
+
+    Works on Groq and ElevenLabs SDK errors alike by looking at the status code on
+    the error (or its response) instead of SDK-specific classes.
+    """
+    if isinstance(error, (ConnectionError, TimeoutError)) and not isinstance(error, DeadlineExceeded):
+        return True
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        status_code = getattr(getattr(error, "response", None), "status_code", None)
+    if status_code is not None:
+        return status_code in RETRYABLE_STATUS_CODES
+    # httpx transport errors (and SDK wrappers named after them) carry no status code
+    return type(error).__name__ in ("APIConnectionError", "APITimeoutError", "ConnectError", "ReadTimeout",
+                                    "ConnectTimeout", "RemoteProtocolError", "ReadError")
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one provider.
+
+    After ``failure_threshold`` retryable failures in a row the circuit opens and
+    calls fail fast with CircuitOpenError. After ``reset_seconds`` one trial call
+    is let through (half-open): success closes the circuit, failure re-opens it.
+    Non-retryable errors (bad requests) show the provider is up and count as success.
+    """
+
+    def __init__(self, name, failure_threshold=CIRCUIT_FAILURE_THRESHOLD, reset_seconds=CIRCUIT_RESET_SECONDS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._state = "closed"
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.stats = {
+            'opens': 0,
+            'rejections': 0,
+        }
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state
+
+    def allow(self):
+        """True if a call may go to the provider now."""
+        with self._lock:
+            if self._state == "closed":
+                return True
+            if self._state == "open" and time.monotonic() - self._opened_at >= self.reset_seconds:
+                self._state = "half_open"
+                self._trial_in_flight = False
+                api_logger.info(f"Circuit {self.name} half-open, allowing a trial call")
+            if self._state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.stats['rejections'] += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self._state != "closed":
+                api_logger.info(f"Circuit {self.name} closed")
+            self._state = "closed"
+            self._consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def release_trial(self):
+        """Give back a half-open trial slot that never reached the provider."""
+        with self._lock:
+            if self._state == "half_open":
+                self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._consecutive_failures += 1
+            if self._state == "half_open" or (
+                self._state == "closed" and self._consecutive_failures >= self.failure_threshold
+            ):
+                self._state = "open"
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+                self.stats['opens'] += 1
+                api_logger.warning(
+                    f"Circuit {self.name} opened after {self._consecutive_failures} consecutive failures; "
+                    f"failing fast for {self.reset_seconds:.0f}s"
+                )
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats, state=self._state, consecutive_failures=self._consecutive_failures)
+
+
+class ResilientCaller:
+    """
+    Call wrapper for one provider operation: deadline, retries, hedging and circuit breaking.
+
+    - Retryable errors are retried up to ``max_attempts`` times with jittered
+      exponential backoff (honouring Retry-After), but never past the deadline.
+    - With ``hedge`` on, once ``HEDGE_MIN_SAMPLES`` latencies are known a duplicate
+      request is sent when the first has been out longer than the
+      ``HEDGE_PERCENTILE`` latency; whichever succeeds first wins. Only use it for
+      idempotent calls - a hedge doubles that request's provider cost.
+    - Calls with a deadline or hedging run on a shared worker pool so the caller
+      can stop waiting; an abandoned attempt finishes in the background and its
+      result is discarded. Time an attempt spends waiting for a free worker is a
+      local backlog, not provider latency: it extends the deadline (by at most
+      the deadline again over the whole call) and never trips the provider's
+      circuit. A call still waiting for a worker at its deadline fails with
+      DeadlineExceeded without touching the circuit.
+    """
+
+    def __init__(self, operation, breaker, deadline_seconds=None, max_attempts=PROVIDER_MAX_ATTEMPTS,
+                 hedge=False, retryable=is_retryable, latency_window=500):
+        self.operation = operation
+        self.breaker = breaker
+        self.deadline_seconds = deadline_seconds
+        self.max_attempts = max(1, max_attempts)
+        self.hedge = hedge and HEDGE_REQUESTS_ENABLED
+        self.retryable = retryable
+        self._latencies = deque(maxlen=latency_window)  # Seconds of successful attempts
+        self._lock = threading.Lock()
+        self.stats = {
+            'calls': 0,
+            'successes': 0,
+            'failures': 0,
+            'attempts': 0,
+            'retries': 0,
+            'retryable_errors': 0,
+            'deadline_exceeded': 0,
+            'circuit_rejections': 0,
+            'hedges_launched': 0,
+            'hedge_wins': 0,
+        }
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def _timed(self, fn, args, kwargs):
+        start = time.monotonic()
+        result = fn(*args, **kwargs)
+        with self._lock:
+            self._latencies.append(time.monotonic() - start)
+        return result
+
+    def latency_percentile(self, percentile):
+        """Latency (seconds) of recent successful attempts at a percentile, or None without samples."""
+        with self._lock:
+            latencies = list(self._latencies)
+        return float(np.percentile(latencies, percentile)) if latencies else None
+
+    def _hedge_delay(self):
+        with self._lock:
+            enough = len(self._latencies) >= HEDGE_MIN_SAMPLES
+        return self.latency_percentile(HEDGE_PERCENTILE) if self.hedge and enough else None
+
+    def call(self, fn, *args, deadline_seconds=None, hedge=True, **kwargs):
+        """
+        Run fn(*args, **kwargs) under this operation's policy
+
+        Args:
+            deadline_seconds (float): Overrides the operation's deadline for this call
+            hedge (bool): Set to False to disable hedging for this call (e.g. streams)
+
+        Raises:
+            CircuitOpenError: The provider's circuit is open
+            DeadlineExceeded: No attempt succeeded before the deadline
+            Exception: The last error once attempts are exhausted, or the first non-retryable one
+        """
+        self._count('calls')
+        if deadline_seconds is None:
+            deadline_seconds = self.deadline_seconds
+        deadline = time.monotonic() + deadline_seconds if deadline_seconds else None
+        queue_allowance = deadline_seconds or 0.0  # Queue time that may still extend the deadline
+        hedge_delay = self._hedge_delay() if hedge else None
+
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                self._count('circuit_rejections')
+                self._count('failures')
+                raise CircuitOpenError(f"{self.breaker.name} is unavailable (circuit open), not calling {self.operation}")
+            attempt += 1
+            self._count('attempts')
+            primary = None
+            if deadline is not None or hedge_delay is not None:
+                primary, queued_seconds = self._start_attempt(fn, args, kwargs, deadline)
+                if primary is None:
+                    # No worker freed up in time; the provider was never called, so the circuit is left alone
+                    self.breaker.release_trial()
+                    self._count('deadline_exceeded')
+                    self._count('failures')
+                    raise DeadlineExceeded(
+                        f"{self.operation} deadline of {deadline_seconds:.1f}s exceeded waiting {queued_seconds:.1f}s "
+                        f"for a free provider-call worker"
+                    )
+                if deadline is not None:
+                    extension = min(queued_seconds, queue_allowance)
+                    queue_allowance -= extension
+                    deadline += extension
+            try:
+                if primary is None:
+                    result = self._timed(fn, args, kwargs)
+                else:
+                    result = self._attempt_with_deadline(primary, fn, args, kwargs, deadline, hedge_delay)
+            except DeadlineExceeded:
+                self.breaker.record_failure()
+                self._count('deadline_exceeded')
+                self._count('failures')
+                raise
+            except Exception as e:
+                if not self.retryable(e):
+                    self.breaker.record_success()  # The provider answered; the request was the problem
+                    self._count('failures')
+                    raise
+                self.breaker.record_failure()
+                self._count('retryable_errors')
+                if attempt >= self.max_attempts:
+                    self._count('failures')
+                    raise
+                delay = transient_retry_delay(e, attempt)
+                if deadline is not None and time.monotonic() + delay >= deadline:
+                    self._count('deadline_exceeded')
+                    self._count('failures')
+                    raise DeadlineExceeded(f"{self.operation} deadline of {deadline_seconds:.1f}s exceeded after {attempt} attempt(s)") from e
+                api_logger.warning(f"Transient error on {self.operation} (attempt {attempt}), retrying in {delay:.2f}s: {e}")
+                self._count('retries')
+                time.sleep(delay)
+            else:
+                self.breaker.record_success()
+                self._count('successes')
+                return result
+
+    def _start_attempt(self, fn, args, kwargs, deadline):
+        """
+        Submit one attempt to the worker pool and wait until a worker picks it up
+
+        The wait ends at the deadline (if any). Returns (future, seconds spent
+        queued), with future None if the attempt was still queued at the deadline
+        and has been withdrawn.
+        """
+        submitted = time.monotonic()
+        started = threading.Event()
+
+        def run():
+            started.set()
+            return self._timed(fn, args, kwargs)
+
+        future = _get_executor().submit(run)
+        timeout = max(0.0, deadline - submitted) if deadline is not None else None
+        if not started.wait(timeout) and future.cancel():
+            return None, time.monotonic() - submitted
+        return future, time.monotonic() - submitted
+
+    def _attempt_with_deadline(self, primary, fn, args, kwargs, deadline, hedge_delay):
+        """Wait for a started attempt, plus an optional hedge; returns the first success."""
+        executor = _get_executor()
+        pending = {primary}
+        hedge_at = time.monotonic() + hedge_delay if hedge_delay is not None else None
+        last_error = None
+        while True:
+            now = time.monotonic()
+            timeouts = [moment - now for moment in (deadline, hedge_at) if moment is not None]
+            done, pending = wait(pending, timeout=max(0.0, min(timeouts)) if timeouts else None, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    if future is not primary:
+                        self._count('hedge_wins')
+                    return future.result()
+                last_error = error
+            if not pending:
+                raise last_error
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                raise DeadlineExceeded(f"{self.operation} deadline exceeded")
+            if hedge_at is not None and now >= hedge_at:
+                api_logger.info(f"Hedging {self.operation} after {hedge_delay:.2f}s (p{HEDGE_PERCENTILE:g} latency)")
+                self._count('hedges_launched')
+                pending.add(executor.submit(self._timed, fn, args, kwargs))
+                hedge_at = None
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            latencies = list(self._latencies)
+        if latencies:
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+            stats.update(p50_seconds=round(float(p50), 3), p95_seconds=round(float(p95), 3), p99_seconds=round(float(p99), 3))
+        stats['circuit'] = self.breaker.state
+        return stats
+
+
+_registry_lock = threading.Lock()
+_breakers = {}
+_callers = {}
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    with _registry_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=PROVIDER_CALL_WORKERS, thread_name_prefix="provider-call")
+        return _executor
+
+
+def get_breaker(provider):
+    """Process-wide circuit breaker for a provider ("groq", "elevenlabs")."""
+    with _registry_lock:
+        if provider not in _breakers:
+            _breakers[provider] = CircuitBreaker(provider)
+        return _breakers[provider]
+
+
+def get_caller(operation, provider, **options):
+    """
+    Process-wide ResilientCaller for an operation; operations of one provider share its breaker.
+
+    Options (deadline_seconds, max_attempts, hedge, retryable) apply when the
+    operation is first registered.
+    """
+    breaker = get_breaker(provider)
+    with _registry_lock:
+        if operation not in _callers:
+            _callers[operation] = ResilientCaller(operation, breaker, **options)
+        return _callers[operation]
+
+
+def get_resilience_stats():
+    """Counters for every registered operation and provider circuit."""
+    with _registry_lock:
+        callers = dict(_callers)
+        breakers = dict(_breakers)
+    return {
+        "operations": {operation: caller.get_stats() for operation, caller in callers.items()},
+        "circuits": {provider: breaker.get_stats() for provider, breaker in breakers.items()},
+    }
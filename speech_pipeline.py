@@ -0,0 +1,184 @@
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from config import LOGGERS
+from artifact_store import write_artifact
+
+# Get specialized loggers
+api_logger = LOGGERS['api']
+audio_logger = LOGGERS['audio']
+
+# Sentence boundary: terminal punctuation, optional closing quotes/brackets, then whitespace
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?…])["\'”’)\]]*\s+')
+
+
+class SentenceSplitter:
+    """
+    Incrementally split streamed text into sentences.
+
+    Sentences shorter than ``min_chars`` are merged with the next one so short
+    fragments ("Sí.", "OK.") don't each cost a separate TTS request.
+    """
+
+    def __init__(self, min_chars=20):
+        self.min_chars = min_chars
+        self._buffer = ""
+
+    def feed(self, delta):
+        """Add a text delta; return the list of sentences completed by it."""
+        self._buffer += delta
+        sentences = []
+        start = 0
+        for match in SENTENCE_BOUNDARY.finditer(self._buffer):
+            candidate = self._buffer[start:match.end()].strip()
+            if len(candidate) >= self.min_chars:
+                sentences.append(candidate)
+                start = match.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self):
+        """Return whatever text is left once the stream has ended."""
+        remainder = self._buffer.strip()
+        self._buffer = ""
+        return [remainder] if remainder else []
+
+
+class TranslateSpeakPipeline:
+    """
+    Sentence-pipelined translate -> speak.
+
+    Builds on TextTranslator.detect_and_translate_stream and
+    TextToSpeechHandler.generate_audio_with_voice_id: every sentence that
+    completes in the translation stream is submitted to ElevenLabs right away
+    (at most ``max_concurrency`` requests in flight), and audio segments are
+    handed back strictly in order, so the first sentence can play while later
+    ones are still being translated.
+
+    The app does not use it yet (its TTS job speaks the translation the user may
+    have edited); benchmark_speech_pipeline.py measures it against the serial path.
+    """
+
+    def __init__(self, translator, tts_handler, max_concurrency=3, min_sentence_chars=20):
+        self.translator = translator
+        self.tts_handler = tts_handler
+        self.max_concurrency = max_concurrency
+        self.min_sentence_chars = min_sentence_chars
+
+    def _synthesize_segment(self, index, sentence, voice_id, voice_name):
+        start_time = time.time()
+        audio_path = self.tts_handler.generate_audio_with_voice_id(sentence, voice_id, f"{voice_name} [segment {index}]")
+        return audio_path, time.time() - start_time
+
+    def run(self, text, voice_id, voice_name, cancel_event=None):
+        """
+        Translate text and synthesize it sentence by sentence
+
+        Args:
+            text (str): English or Spanish source text
+            voice_id (str): ElevenLabs voice ID for the translated audio
+            voice_name (str): Display name for logging
+            cancel_event (threading.Event): Optional cancellation signal
+
+        Yields:
+            dict: {"type": "text", "delta"} for every translation delta,
+                  {"type": "segment", "index", "sentence", "audio_path", "tts_seconds"} in order,
+                  {"type": "done", "translation", "direction", "error", "failed_segments",
+                  "audio_path", "timings"} last; nothing is synthesized for refusals, and
+                  nothing past the last complete sentence when the translation fails (error
+                  is set). If a sentence fails to synthesize, its index is in failed_segments,
+                  error names it, and audio_path joins only the segments that succeeded
+        """
+        pipeline_start = time.time()
+        timings = {
+            "first_token_seconds": None,
+            "translation_seconds": None,
+            "first_audio_seconds": None,
+            "segment_tts_seconds": [],
+            "total_seconds": None,
+        }
+        splitter = SentenceSplitter(self.min_sentence_chars)
+        pending = []  # (index, sentence, future) in submission order
+        segment_paths = []
+        failed_segments = []
+        record = {}
+
+        def ready_segments(block):
+            # Hand back finished segments in order; stop at the first one still running
+            while pending and (block or pending[0][2].done()):
+                index, sentence, future = pending.pop(0)
+                audio_path, tts_seconds = future.result()
+                timings["segment_tts_seconds"].append(round(tts_seconds, 3))
+                if audio_path and timings["first_audio_seconds"] is None:
+                    timings["first_audio_seconds"] = time.time() - pipeline_start
+                    audio_logger.info(f"First pipelined audio segment ready after {timings['first_audio_seconds']:.2f}s")
+                if audio_path:
+                    segment_paths.append(audio_path)
+                else:
+                    audio_logger.warning(f"Pipeline segment {index} failed to synthesize")
+                    failed_segments.append(index)
+                yield {"type": "segment", "index": index, "sentence": sentence,
+                       "audio_path": audio_path, "tts_seconds": tts_seconds}
+
+        def submit(executor, sentences):
+            for sentence in sentences:
+                index = len(pending) + len(timings["segment_tts_seconds"])
+                api_logger.info(f"Pipeline submitting sentence {index} to TTS: '{sentence[:50]}...'")
+                pending.append((index, sentence, executor.submit(self._synthesize_segment, index, sentence, voice_id, voice_name)))
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="pipeline-tts") as executor:
+            try:
+                # Speech runs one delta behind the text: the engine sends its refusal or error
+                # message as a lone delta right before the final record, so the held delta is
+                # only spoken once another delta (or a successful final record) confirms it
+                held = None
+                for item in self.translator.detect_and_translate_stream(text, cancel_event=cancel_event):
+                    if isinstance(item, dict):
+                        record = item
+                        continue
+                    if timings["first_token_seconds"] is None:
+                        timings["first_token_seconds"] = time.time() - pipeline_start
+                    yield {"type": "text", "delta": item}
+                    if held is not None:
+                        submit(executor, splitter.feed(held))
+                    held = item
+                    yield from ready_segments(block=False)
+                timings["translation_seconds"] = time.time() - pipeline_start
+
+                if (record.get("direction", "Unknown") != "Unknown" and not record.get("cancelled")
+                        and record.get("error") is None):
+                    if held is not None:
+                        submit(executor, splitter.feed(held))
+                    submit(executor, splitter.flush())
+                if not record.get("cancelled"):
+                    yield from ready_segments(block=True)
+            finally:
+                for _, _, future in pending:
+                    future.cancel()
+
+        joined_path = self.join_segments(segment_paths) if segment_paths else None
+        timings["total_seconds"] = time.time() - pipeline_start
+        api_logger.info(f"Translate-speak pipeline timings: {timings}")
+        error = record.get("error")
+        if error is None and failed_segments:
+            error = f"Speech synthesis failed for sentence(s) {', '.join(str(index) for index in failed_segments)}"
+        yield {
+            "type": "done",
+            "translation": record.get("translation", ""),
+            "direction": record.get("direction", "Unknown"),
+            "error": error,
+            "failed_segments": failed_segments,
+            "audio_path": joined_path,
+            "timings": timings,
+        }
+
+    @staticmethod
+    def join_segments(segment_paths):
+        """Concatenate MP3 segments (same format, so frames can be appended) into one file."""
+        parts = []
+        for path in segment_paths:
+            with open(path, 'rb') as segment_file:
+                parts.append(segment_file.read())
+        joined_path = write_artifact(b''.join(parts))
+        audio_logger.info(f"Joined {len(segment_paths)} audio segments into {joined_path}")
+        return joined_path
@@ -0,0 +1,200 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from config import LOGGERS
+
+# Get API logger (cache hits/misses are reported next to the API calls they replace)
+cache_logger = LOGGERS['api']
+
+
+def normalize_text(text):
+    """Normalize text for cache lookups: NFC unicode, trimmed, single-spaced."""
+    text = unicodedata.normalize('NFC', text or '')
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def make_cache_key(text, direction, model, system_prompt):
+    """Build a stable cache key from normalized text, direction, model and system prompt hash."""
+    prompt_hash = hashlib.sha256(system_prompt.encode('utf-8')).hexdigest()[:16]
+    payload = '\x1f'.join([normalize_text(text), direction, model, prompt_hash])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class TranslationCache:
+    """
+    Two-tier translation cache: an in-process LRU in front of a SQLite (WAL) store.
+
+    Entries expire after ``ttl_seconds``. Both tiers are bounded by bytes and evict
+    least recently used entries first. The disk tier is optional - if SQLite cannot
+    be opened the cache keeps working in memory only.
+    """
+
+    def __init__(self, db_path, ttl_seconds, max_bytes, memory_max_bytes):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.memory_max_bytes = memory_max_bytes
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()  # key -> (value, created_at, size)
+        self._memory_bytes = 0
+        self._disk_bytes = 0
+        self._conn = None
+
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'expired': 0,
+            'evictions': 0,
+        }
+
+        self._open_disk_store()
+
+    def _open_disk_store(self):
+        """Open (or create) the SQLite store in WAL mode."""
+        try:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_translations_accessed ON translations(accessed_at)")
+            conn.commit()
+            self._disk_bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM translations").fetchone()[0]
+            self._conn = conn
+            cache_logger.info(f"Translation cache opened at {self.db_path} ({self._disk_bytes} bytes on disk)")
+        except Exception as e:
+            cache_logger.warning(f"Translation cache disk store unavailable, using memory only: {e}")
+            self._conn = None
+
+    def _is_expired(self, created_at, now):
+        return self.ttl_seconds > 0 and now - created_at > self.ttl_seconds
+
+    def _remember(self, key, value, created_at):
+        """Insert into the memory tier, evicting LRU entries beyond the byte budget."""
+        size = len(value.encode('utf-8'))
+        if size > self.memory_max_bytes:
+            return
+        if key in self._memory:
+            self._memory_bytes -= self._memory.pop(key)[2]
+        self._memory[key] = (value, created_at, size)
+        self._memory_bytes += size
+        while self._memory_bytes > self.memory_max_bytes and self._memory:
+            _, (_, _, evicted_size) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted_size
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created_at, size = entry
+                if not self._is_expired(created_at, now):
+                    self._memory.move_to_end(key)
+                    self.stats['hits'] += 1
+                    self.stats['memory_hits'] += 1
+                    return value
+                del self._memory[key]
+                self._memory_bytes -= size
+                self.stats['expired'] += 1
+
+            if self._conn is not None:
+                try:
+                    row = self._conn.execute(
+                        "SELECT value, created_at, size FROM translations WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row is not None:
+                        value, created_at, size = row
+                        if not self._is_expired(created_at, now):
+                            self._conn.execute("UPDATE translations SET accessed_at = ? WHERE key = ?", (now, key))
+                            self._conn.commit()
+                            self._remember(key, value, created_at)
+                            self.stats['hits'] += 1
+                            self.stats['disk_hits'] += 1
+                            return value
+                        self._conn.execute("DELETE FROM translations WHERE key = ?", (key,))
+                        self._conn.commit()
+                        self._disk_bytes -= size
+                        self.stats['expired'] += 1
+                except Exception as e:
+                    cache_logger.warning(f"Translation cache read failed: {e}")
+
+            self.stats['misses'] += 1
+            return None
+
+    def put(self, key, value):
+        """Store value under key in both tiers."""
+        now = time.time()
+        size = len(value.encode('utf-8'))
+        with self._lock:
+            self._remember(key, value, now)
+            if self._conn is None:
+                return
+            try:
+                previous = self._conn.execute("SELECT size FROM translations WHERE key = ?", (key,)).fetchone()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO translations (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, value, size, now, now)
+                )
+                self._disk_bytes += size - (previous[0] if previous else 0)
+                if self._disk_bytes > self.max_bytes:
+                    self._evict_disk()
+                self._conn.commit()
+            except Exception as e:
+                cache_logger.warning(f"Translation cache write failed: {e}")
+
+    def _evict_disk(self):
+        """Drop expired rows, then least recently used rows until under max_bytes."""
+        if self.ttl_seconds > 0:
+            self._conn.execute("DELETE FROM translations WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        self._disk_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM translations").fetchone()[0]
+        while self._disk_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM translations ORDER BY accessed_at LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self._conn.execute("DELETE FROM translations WHERE key = ?", (key,))
+                self._disk_bytes -= size
+                self.stats['evictions'] += 1
+                if self._disk_bytes <= self.max_bytes:
+                    break
+
+    def get_stats(self):
+        """Return hit/miss counters and current tier sizes."""
+        with self._lock:
+            stats = dict(self.stats)
+            lookups = stats['hits'] + stats['misses']
+            stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+            stats['memory_entries'] = len(self._memory)
+            stats['memory_bytes'] = self._memory_bytes
+            stats['disk_bytes'] = self._disk_bytes
+            return stats
+
+    def clear(self):
+        """Remove every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            if self._conn is not None:
+                try:
+                    self._conn.execute("DELETE FROM translations")
+                    self._conn.commit()
+                    self._disk_bytes = 0
+                except Exception as e:
+                    cache_logger.warning(f"Translation cache clear failed: {e}")
@@ -1,66 +1,433 @@
 import time
 import io
+import hashlib
+import json
 import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from groq import Groq
-from config import GROQ_API_KEY, LOGGERS
+from config import (
+    GROQ_API_KEY, LOGGERS, LANGUAGE_DETECTION_CONFIDENCE_THRESHOLD, SINGLE_ROUND_TRIP_TRANSLATION,
+    TRANSLATION_CHUNK_TOKENS, TRANSLATION_CHUNK_CONCURRENCY, TRANSLATION_CHUNK_OVERLAP_CHARS,
+    INCREMENTAL_TRANSLATION_MIN_REUSE, INCREMENTAL_TRANSLATION_MAX_SEGMENTS,
+    TRANSCRIPTION_SEGMENT_SECONDS, TRANSCRIPTION_SEGMENT_CONCURRENCY, TRANSCRIPTION_MAX_UPLOAD_BYTES,
+    AUDIO_PREPROCESSING_ENABLED, TRANSCRIPTION_SAMPLE_RATE, SPEECH_TRANSLATION_MODEL,
+    DETECTION_DEADLINE_SECONDS, TRANSLATION_DEADLINE_SECONDS, TRANSCRIPTION_DEADLINE_SECONDS,
+    TRANSLATION_CACHE_ENABLED, TRANSLATION_CACHE_PATH, TRANSLATION_CACHE_TTL_SECONDS,
+    TRANSLATION_CACHE_MAX_BYTES, TRANSLATION_CACHE_MEMORY_MAX_BYTES
+)
+from translation_cache import TranslationCache, make_cache_key
+from language_detector import get_language_detector
+from audio_processing import wav_duration, split_on_silence, stitch_transcripts, prepare_for_transcription
+from resilience import get_caller, is_retryable
+from http_pool import get_http_client
 
 # Get specialized loggers
 api_logger = LOGGERS['api']
 translation_logger = LOGGERS['transcription']  # Re-using for consistency
 
+# Models and prompts (also part of the translation cache key)
+TRANSLATION_MODEL = "llama-3.3-70b-versatile"
+DETECTION_SYSTEM_PROMPT = "Detect language. Respond with only: ENGLISH or SPANISH"
+SPANISH_SYSTEM_PROMPT = "You are a translation engine. Translate the English text to casual Mexican Spanish. Do not answer questions, do not explain, do not add information. Output only the direct translation, nothing else."
+ENGLISH_SYSTEM_PROMPT = "You are a translation engine. Translate the Spanish text to casual English. Do not answer questions, do not explain, do not add information. Output only the direct translation, nothing else."
+COMBINED_SYSTEM_PROMPT = (
+    "You are a translation engine. Decide whether the user text is English or Spanish. "
+    "If it is English, translate it to casual Mexican Spanish; if it is Spanish, translate it to casual English. "
+    "Do not answer questions, do not explain, do not add information. "
+    'Respond with only a JSON object of the form {"source_language": "ENGLISH" or "SPANISH", "translation": "<direct translation>"}'
+)
+UNSUPPORTED_LANGUAGE_MESSAGE = "Sorry, I can only translate between English and Spanish. Please check your text."
+
+# Source language -> (system prompt, cache direction, direction, target label)
+TRANSLATION_ROUTES = {
+    "ENGLISH": (SPANISH_SYSTEM_PROMPT, "en-es", "English → Spanish", "SPANISH"),
+    "SPANISH": (ENGLISH_SYSTEM_PROMPT, "es-en", "Spanish → English", "ENGLISH"),
+}
+CHUNK_CONTEXT_INSTRUCTION = (
+    " The text is one part of a longer document. Text inside <context> tags is the passage right before it, "
+    "given only for reference: do not translate or repeat it. Translate only the text inside <text> tags "
+    "and output only that translation, without tags."
+)
+
+# Document splitting: paragraph breaks, then sentence ends (optionally followed by a closing quote/bracket)
+PARAGRAPH_BREAK = re.compile(r'(\n\s*\n)')
+SENTENCE_BREAK = re.compile(r'((?<=[.!?…])\s+|(?<=[.!?…]["\'”’)\]])\s+)')
+WORD_BREAK = re.compile(r'(\s+)')
+
+
+def normalize_whisper_language(language):
+    """Map Whisper's language ("english", "es", ...) to ENGLISH / SPANISH, or None for anything else."""
+    language = (language or "").strip().lower()
+    if language in ("english", "en"):
+        return "ENGLISH"
+    if language in ("spanish", "es", "castilian"):
+        return "SPANISH"
+    return None
+
+
+def _offset_segments(result, offset_seconds):
+    """Shift Whisper segment times by offset_seconds (segments of trimmed or split audio)."""
+    if offset_seconds:
+        for segment in result["segments"]:
+            for key in ("start", "end"):
+                if segment.get(key) is not None:
+                    segment[key] += offset_seconds
+    return result
+
+
+def estimate_tokens(text):
+    """Rough Llama token count for English/Spanish text (about 4 characters per token)."""
+    return (len(text) + 3) // 4
+
+
+def _split_keeping_separators(pattern, text):
+    """Split text into (piece, following separator) pairs."""
+    parts = pattern.split(text)
+    return [(parts[i], parts[i + 1] if i + 1 < len(parts) else "") for i in range(0, len(parts), 2)]
+
+
+def split_into_chunks(text, max_tokens):
+    """
+    Split a document into chunks of at most ~max_tokens for parallel translation.
+    
+    Breaks on paragraphs first, then sentences, then words, and packs consecutive
+    pieces greedily so chunks stay large.
+    
+    Returns:
+        list: (chunk, separator) pairs; joining chunk + separator reproduces the text
+    """
+    units = []
+    for paragraph, paragraph_sep in _split_keeping_separators(PARAGRAPH_BREAK, text):
+        if estimate_tokens(paragraph) <= max_tokens:
+            units.append((paragraph, paragraph_sep))
+            continue
+        sentences = _split_keeping_separators(SENTENCE_BREAK, paragraph)
+        for i, (sentence, sentence_sep) in enumerate(sentences):
+            sep = sentence_sep if i < len(sentences) - 1 else paragraph_sep
+            if estimate_tokens(sentence) <= max_tokens:
+                units.append((sentence, sep))
+                continue
+            words = _split_keeping_separators(WORD_BREAK, sentence)
+            for j, (word, word_sep) in enumerate(words):
+                units.append((word, word_sep if j < len(words) - 1 else sep))
+    
+    chunks = []
+    current, current_sep = "", ""
+    for unit, sep in units:
+        if current and estimate_tokens(current + current_sep + unit) > max_tokens:
+            chunks.append((current, current_sep))
+            current, current_sep = unit, sep
+        else:
+            current, current_sep = (current + current_sep + unit if current else unit), sep
+    if current:
+        chunks.append((current, current_sep))
+    return [(chunk, sep) for chunk, sep in chunks if chunk.strip()]
+
+
+def _context_tail(text, max_chars):
+    """The last max_chars of text, starting at a word boundary."""
+    if len(text) <= max_chars:
+        return text
+    tail = text[-max_chars:]
+    return tail[tail.find(" ") + 1:] if " " in tail else tail
+
+
+def plan_chunks(text, max_tokens):
+    """
+    Split a long text for chunked translation.
+    
+    Returns:
+        tuple: (chunks, jobs) - chunks as from split_into_chunks, and one
+        (index, chunk, context) job per chunk, where context is the tail of the
+        source before it so references carry across boundaries
+    """
+    chunks = split_into_chunks(text, max_tokens)
+    jobs = []
+    for index, (chunk, _) in enumerate(chunks):
+        context = _context_tail(chunks[index - 1][0], TRANSLATION_CHUNK_OVERLAP_CHARS) if index else ""
+        jobs.append((index, chunk, context))
+    return chunks, jobs
+
+
+def chunk_request(chunk, context, system_prompt):
+    """(system prompt, user content, max_tokens) for translating one chunk with its context."""
+    user_content = f"<context>{context}</context>\n<text>{chunk}</text>" if context else f"<text>{chunk}</text>"
+    return system_prompt + CHUNK_CONTEXT_INSTRUCTION, user_content, min(4096, 2 * estimate_tokens(chunk) + 100)
+
+
+def clean_chunk_translation(translation):
+    """Drop <text> tags the model sometimes echoes around a chunk translation."""
+    return re.sub(r'^\s*<text>|</text>\s*$', '', translation).strip()
+
+
+def assemble_chunks(chunks, records, seconds):
+    """
+    Join chunk translations in source order, keeping the source's separators.
+    
+    Returns:
+        dict: {"translation", "error", "seconds", "chunks": [{"index", "source_chars",
+              "seconds", "cached", "error"}]}; error is None on success
+    """
+    failed = [record for record in records if record["error"] is not None]
+    translation = "".join(
+        record["translation"] + separator for record, (_, separator) in zip(records, chunks)
+    ).strip() if not failed else None
+    chunk_seconds = [round(record["seconds"], 2) for record in records]
+    api_logger.info(f"Chunked translation finished in {seconds:.2f}s; per-chunk seconds: {chunk_seconds}")
+    return {
+        "translation": translation,
+        "error": f"chunk {failed[0]['index']}: {failed[0]['error']}" if failed else None,
+        "seconds": seconds,
+        "chunks": [{key: value for key, value in record.items() if key != "translation"} for record in records]
+    }
+
+
+def split_into_sentences(text):
+    """
+    Split text into sentences on paragraph breaks and sentence ends.
+
+    Returns:
+        list: (sentence, separator) pairs for the non-blank sentences of text
+    """
+    sentences = []
+    for paragraph, paragraph_sep in _split_keeping_separators(PARAGRAPH_BREAK, text):
+        pieces = _split_keeping_separators(SENTENCE_BREAK, paragraph)
+        for i, (sentence, sentence_sep) in enumerate(pieces):
+            sentences.append((sentence, sentence_sep if i < len(pieces) - 1 else paragraph_sep))
+    return [(sentence, sep) for sentence, sep in sentences if sentence.strip()]
+
+
+def sentence_hash(sentence):
+    """Segment map key for a source sentence (whitespace-insensitive)."""
+    return hashlib.sha256(" ".join(sentence.split()).encode("utf-8")).hexdigest()[:32]
+
+
+def update_segment_map(segment_map, direction, pairs, max_segments=INCREMENTAL_TRANSLATION_MAX_SEGMENTS):
+    """
+    Add (source sentence, translated sentence) pairs to a segment map
+
+    A segment map is {"direction": "English → Spanish", "segments": {sentence_hash: translation}};
+    a map for the other direction is replaced. Returns a new map holding at most
+    max_segments entries, the least recently added dropped first.
+    """
+    if segment_map and segment_map.get("direction") == direction:
+        segments = dict(segment_map["segments"])
+    else:
+        segments = {}
+    for source, translation in pairs:
+        key = sentence_hash(source)
+        segments.pop(key, None)
+        segments[key] = translation.strip()
+    for key in list(segments)[:max(0, len(segments) - max_segments)]:
+        del segments[key]
+    return {"direction": direction, "segments": segments}
+
+
+def align_sentences(source_text, translation):
+    """
+    Pair source and translated sentences one to one
+
+    Returns an empty list when the sentence counts differ, since the
+    translation then can't be split back onto its source sentences.
+    """
+    source = split_into_sentences(source_text)
+    target = split_into_sentences(translation)
+    if len(source) != len(target):
+        return []
+    return [(s, t) for (s, _), (t, _) in zip(source, target)]
+
+
+def parse_combined_response(content):
+    """
+    Strictly parse a single-round-trip response.
+    
+    Returns:
+        tuple: (source_language, translation)
+        
+    Raises:
+        ValueError: If the response is not exactly the expected JSON object
+    """
+    try:
+        payload = json.loads(content)
+    except (TypeError, json.JSONDecodeError) as e:
+        raise ValueError(f"response is not valid JSON: {e}")
+    if not isinstance(payload, dict) or set(payload) != {"source_language", "translation"}:
+        raise ValueError(f"unexpected response shape: {str(payload)[:100]}")
+    source_language, translation = payload["source_language"], payload["translation"]
+    if not isinstance(source_language, str) or source_language.strip().upper() not in ("ENGLISH", "SPANISH"):
+        raise ValueError(f"unexpected source_language: {source_language!r}")
+    if not isinstance(translation, str) or not translation.strip():
+        raise ValueError("empty translation")
+    return source_language.strip().upper(), translation.strip()
+
+
+def translation_route(source_language):
+    """
+    Translation settings for a detected source language.
+    
+    Returns:
+        tuple: (system_prompt, cache_direction, direction, target_label), or None
+        for anything but ENGLISH / SPANISH
+    """
+    return TRANSLATION_ROUTES.get(source_language)
+
+
+def new_stream_record():
+    """Final record of a streaming translation before anything is known."""
+    return {
+        "translation": "",
+        "direction": "Unknown",
+        "usage": None,
+        "cached": False,
+        "cancelled": False,
+        "first_token_seconds": None,
+        "error": None
+    }
+
+
+def stream_chunk_usage(chunk):
+    """Token usage carried by a stream chunk, or None (Groq reports it on the final chunk)."""
+    x_groq = getattr(chunk, "x_groq", None)
+    usage = getattr(chunk, "usage", None) or getattr(x_groq, "usage", None)
+    if usage is None:
+        return None
+    return usage.model_dump() if hasattr(usage, "model_dump") else usage
+
+
+def create_translation_cache():
+    """Translation cache (in-process LRU + SQLite) from config, or None when caching is disabled."""
+    if not TRANSLATION_CACHE_ENABLED:
+        return None
+    return TranslationCache(
+        TRANSLATION_CACHE_PATH,
+        ttl_seconds=TRANSLATION_CACHE_TTL_SECONDS,
+        max_bytes=TRANSLATION_CACHE_MAX_BYTES,
+        memory_max_bytes=TRANSLATION_CACHE_MEMORY_MAX_BYTES
+    )
+
+
+def cache_lookup(cache, text, direction, system_prompt, use_cache=True):
+    """Look up a cached result; returns (key, value) where value is None on a miss."""
+    if not use_cache or cache is None:
+        return None, None
+    key = make_cache_key(text, direction, TRANSLATION_MODEL, system_prompt)
+    return key, cache.get(key)
+
+
+def cache_store(cache, key, value):
+    """Store a successful result under a key returned by cache_lookup."""
+    if key is not None and cache is not None:
+        cache.put(key, value)
+
+
+def store_combined_result(cache, text, source_language, translation):
+    """Cache a single-round-trip result under the keys of the two-call path, so both modes share entries."""
+    if cache is None:
+        return
+    system_prompt, cache_direction, _, _ = translation_route(source_language)
+    cache.put(make_cache_key(text, "detect", TRANSLATION_MODEL, DETECTION_SYSTEM_PROMPT), source_language)
+    cache.put(make_cache_key(text, cache_direction, TRANSLATION_MODEL, system_prompt), translation)
+
+
+def detect_language_locally(language_detector, text, threshold):
+    """Offline statistical detection (microseconds, no network); None when not confident enough."""
+    detected_lang, confidence = language_detector.detect(text)
+    if detected_lang != "UNKNOWN" and confidence >= threshold:
+        api_logger.info(f"Local detection: {detected_lang} (confidence: {confidence:.3f})")
+        return detected_lang
+    api_logger.info(f"Local detection inconclusive ({detected_lang}, confidence: {confidence:.3f})")
+    return None
+
+
 class TextTranslator:
-    def __init__(self):
+    def __init__(self, cache=None, detection_threshold=LANGUAGE_DETECTION_CONFIDENCE_THRESHOLD,
+                 single_round_trip=SINGLE_ROUND_TRIP_TRANSLATION, max_chunk_tokens=TRANSLATION_CHUNK_TOKENS,
+                 chunk_concurrency=TRANSLATION_CHUNK_CONCURRENCY, incremental_min_reuse=INCREMENTAL_TRANSLATION_MIN_REUSE):
         translation_logger.info("Initializing TextTranslator with Groq API")
         try:
-            self.client = Groq(api_key=GROQ_API_KEY)
+            # Shared keep-alive pool; retries belong to the resilience wrappers, not the SDK
+            self.client = Groq(api_key=GROQ_API_KEY, http_client=get_http_client(), max_retries=0)
             translation_logger.info("Groq client initialized successfully for text translation.")
         except Exception as e:
             translation_logger.error(f"Failed to initialize Groq client: {e}")
             raise
 
-    def _detect_language(self, text):
-        """Detect if the text is English or Spanish using simple heuristics + Groq fallback."""
+        # Translation cache (in-process LRU + SQLite); None disables caching
+        self.cache = cache if cache is not None else create_translation_cache()
+        
+        # Offline language detector; the LLM is only asked below detection_threshold
+        self.language_detector = get_language_detector()
+        self.detection_threshold = detection_threshold
+        
+        # Detect + translate in one structured call when local detection is inconclusive
+        self.single_round_trip = single_round_trip
+        translation_logger.info(f"Translation mode: {'single round trip' if single_round_trip else 'detect then translate'}")
+        
+        # Inputs above max_chunk_tokens are translated as parallel chunks
+        self.max_chunk_tokens = max_chunk_tokens
+        self.chunk_concurrency = chunk_concurrency
+        
+        # Edited inputs re-translate only changed sentences once this share of them is already translated
+        self.incremental_min_reuse = incremental_min_reuse
+        
+        # Groq calls go through shared retry/deadline/hedging/circuit-breaker wrappers
+        self._detection_calls = get_caller("groq.detection", "groq", deadline_seconds=DETECTION_DEADLINE_SECONDS, hedge=True)
+        self._translation_calls = get_caller("groq.translation", "groq", deadline_seconds=TRANSLATION_DEADLINE_SECONDS, hedge=True)
+        self._stream_calls = get_caller("groq.translation_stream", "groq", deadline_seconds=TRANSLATION_DEADLINE_SECONDS)
+        self._transcription_calls = get_caller("groq.transcription", "groq", deadline_seconds=TRANSCRIPTION_DEADLINE_SECONDS, hedge=True)
+
+    def _cache_get(self, text, direction, system_prompt, use_cache):
+        """Look up a cached result; returns (key, value) where value is None on a miss."""
+        return cache_lookup(self.cache, text, direction, system_prompt, use_cache)
+
+    def _cache_put(self, key, value):
+        """Store a successful result under a key returned by _cache_get."""
+        cache_store(self.cache, key, value)
+
+    def get_cache_stats(self):
+        """Return translation cache counters, or None when caching is disabled."""
+        return self.cache.get_stats() if self.cache is not None else None
+
+    def _detect_language_locally(self, text):
+        """Offline statistical detection (microseconds, no network); None when not confident enough."""
+        return detect_language_locally(self.language_detector, text, self.detection_threshold)
+
+    def _detect_language(self, text, use_cache=True):
+        """Detect if the text is English or Spanish using the local classifier + Groq fallback."""
         api_logger.info(f"Detecting language for text: '{text[:50]}...'")
         
-        # First try simple heuristic detection
-        spanish_indicators = ['ñ', 'é', 'á', 'í', 'ó', 'ú', 'ü', '¿', '¡']
-        spanish_words = ['el', 'la', 'los', 'las', 'de', 'del', 'en', 'con', 'por', 'para', 'que', 'qué', 'es', 'son', 'está', 'están', 'no', 'sí', 'y', 'o', 'pero', 'como', 'muy', 'más', 'menos', 'todo', 'toda', 'todos', 'todas']
-        english_words = ['the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'can', 'could', 'should', 'this', 'that', 'these', 'those']
-        
-        text_lower = text.lower()
-        words = re.findall(r'\b\w+\b', text_lower)
-        
-        # Check for Spanish indicators
-        spanish_score = 0
-        english_score = 0
-        
-        # Character-based indicators
-        for char in spanish_indicators:
-            if char in text_lower:
-                spanish_score += 2
-        
-        # Word-based indicators
-        for word in words:
-            if word in spanish_words:
-                spanish_score += 1
-            if word in english_words:
-                english_score += 1
-        
-        # If heuristics are decisive, return result
-        if spanish_score > english_score and spanish_score > 2:
-            api_logger.info(f"Heuristic detection: SPANISH (score: {spanish_score} vs {english_score})")
-            return "SPANISH"
-        elif english_score > spanish_score and english_score > 2:
-            api_logger.info(f"Heuristic detection: ENGLISH (score: {spanish_score} vs {english_score})")
-            return "ENGLISH"
-        
-        # Fall back to LLM detection for ambiguous cases
-        api_logger.info(f"Heuristic inconclusive (scores: Spanish={spanish_score}, English={english_score}), using LLM")
+        # First try the offline statistical detector
+        detected_lang = self._detect_language_locally(text)
+        if detected_lang is not None:
+            return detected_lang
+        
+        # Fall back to LLM detection for low-confidence cases
+        api_logger.info("Using LLM language detection")
         
+        cache_key, cached = self._cache_get(text, "detect", DETECTION_SYSTEM_PROMPT, use_cache)
+        if cached is not None:
+            api_logger.info(f"Language detection cache hit: {cached}")
+            return cached
+        
+        try:
+            detected_lang = self._request_detection(text)
+            if detected_lang in ["ENGLISH", "SPANISH"]:
+                self._cache_put(cache_key, detected_lang)
+                return detected_lang
+            else:
+                api_logger.warning(f"Unexpected language detection response: '{detected_lang}', returning UNKNOWN")
+                return "UNKNOWN"
+        except Exception as e:
+            api_logger.error(f"Language detection failed: {e}")
+            return "UNKNOWN"
+
+    def _request_detection(self, text):
+        """One Groq language detection call; returns the cleaned response and raises on API errors."""
         messages = [
             {
                 "role": "system",
-                "content": "Detect language. Respond with only: ENGLISH or SPANISH"
+                "content": DETECTION_SYSTEM_PROMPT
             },
             {
                 "role": "user",
@@ -70,154 +437,883 @@ class TextTranslator:
         
         # Log the full API call for debugging
         api_logger.info(f"LANGUAGE DETECTION API CALL:")
-        api_logger.info(f"Model: llama-3.3-70b-versatile")
+        api_logger.info(f"Model: {TRANSLATION_MODEL}")
         api_logger.info(f"Messages: {messages}")
         
-        try:
-            start_time = time.time()
-            chat_completion = self.client.chat.completions.create(
-                messages=messages,
-                model="llama-3.3-70b-versatile",
-                temperature=0.0,
-                max_tokens=5
-            )
-            duration = time.time() - start_time
-            detected_lang = chat_completion.choices[0].message.content.strip().upper()
-            api_logger.info(f"Language detection API call completed in {duration:.2f}s")
-            api_logger.info(f"RAW RESPONSE: '{chat_completion.choices[0].message.content}'")
-            api_logger.info(f"CLEANED RESPONSE: '{detected_lang}'")
-            
-            if detected_lang in ["ENGLISH", "SPANISH"]:
-                return detected_lang
-            else:
-                api_logger.warning(f"Unexpected language detection response: '{detected_lang}', returning UNKNOWN")
-                return "UNKNOWN"
-        except Exception as e:
-            api_logger.error(f"Language detection failed: {e}")
-            return "UNKNOWN"
+        start_time = time.time()
+        chat_completion = self._detection_calls.call(
+            self.client.chat.completions.create,
+            messages=messages,
+            model=TRANSLATION_MODEL,
+            temperature=0.0,
+            max_tokens=5
+        )
+        duration = time.time() - start_time
+        detected_lang = chat_completion.choices[0].message.content.strip().upper()
+        api_logger.info(f"Language detection API call completed in {duration:.2f}s")
+        api_logger.info(f"RAW RESPONSE: '{chat_completion.choices[0].message.content}'")
+        api_logger.info(f"CLEANED RESPONSE: '{detected_lang}'")
+        return detected_lang
 
-    def _translate_to_spanish(self, english_text):
-        """Translate English text to Spanish using Llama 3.3 70B"""
-        translation_logger.info(f"Starting text translation to Spanish: '{english_text[:50]}...'")
-        
+    def _request_translation(self, text, system_prompt, label, max_tokens=2000):
+        """One blocking Groq translation call; raises on API errors."""
         messages = [
             {
                 "role": "system",
-                "content": "You are a translation engine. Translate the English text to casual Mexican Spanish. Do not answer questions, do not explain, do not add information. Output only the direct translation, nothing else."
+                "content": system_prompt
             },
             {
-                "role": "user", 
-                "content": english_text
+                "role": "user",
+                "content": text
             }
         ]
         
         # Log the full API call for debugging
-        api_logger.info(f"SPANISH TRANSLATION API CALL:")
-        api_logger.info(f"Model: llama-3.3-70b-versatile")
+        api_logger.info(f"{label} TRANSLATION API CALL:")
+        api_logger.info(f"Model: {TRANSLATION_MODEL}")
         api_logger.info(f"Messages: {messages}")
         
+        start_time = time.time()
+        chat_completion = self._translation_calls.call(
+            self.client.chat.completions.create,
+            messages=messages,
+            model=TRANSLATION_MODEL,
+            temperature=0.0,
+            max_tokens=max_tokens
+        )
+        duration = time.time() - start_time
+        result = chat_completion.choices[0].message.content.strip()
+        api_logger.info(f"{label.capitalize()} translation API call completed in {duration:.2f}s")
+        api_logger.info(f"RESPONSE: '{result[:100]}...'")
+        return result
+
+    def _translate_to_spanish(self, english_text, use_cache=True):
+        """Translate English text to Spanish using Llama 3.3 70B"""
+        translation_logger.info(f"Starting text translation to Spanish: '{english_text[:50]}...'")
+        
+        cache_key, cached = self._cache_get(english_text, "en-es", SPANISH_SYSTEM_PROMPT, use_cache)
+        if cached is not None:
+            api_logger.info(f"Spanish translation cache hit: '{cached[:100]}...'")
+            return cached
+        
+        if estimate_tokens(english_text) > self.max_chunk_tokens:
+            report = self._translate_chunked(english_text, SPANISH_SYSTEM_PROMPT, "en-es", "SPANISH", use_cache=use_cache)
+            if report["error"] is not None:
+                return f"Error during text translation: {report['error']}"
+            self._cache_put(cache_key, report["translation"])
+            return report["translation"]
+        
         try:
-            start_time = time.time()
-            chat_completion = self.client.chat.completions.create(
-                messages=messages,
-                model="llama-3.3-70b-versatile",
-                temperature=0.0,
-                max_tokens=2000
-            )
-            duration = time.time() - start_time
-            result = chat_completion.choices[0].message.content.strip()
-            api_logger.info(f"Spanish translation API call completed in {duration:.2f}s")
-            api_logger.info(f"RESPONSE: '{result[:100]}...'")
+            result = self._request_translation(english_text, SPANISH_SYSTEM_PROMPT, "SPANISH")
+            self._cache_put(cache_key, result)
             return result
         except Exception as e:
             translation_logger.error(f"Spanish translation failed: {e}")
             return f"Error during text translation: {str(e)}"
 
-    def _translate_to_english(self, spanish_text):
+    def _translate_to_english(self, spanish_text, use_cache=True):
         """Translate Spanish text to English using Llama 3.3 70B"""
         translation_logger.info(f"Starting text translation to English: '{spanish_text[:50]}...'")
         
+        cache_key, cached = self._cache_get(spanish_text, "es-en", ENGLISH_SYSTEM_PROMPT, use_cache)
+        if cached is not None:
+            api_logger.info(f"English translation cache hit: '{cached[:100]}...'")
+            return cached
+        
+        if estimate_tokens(spanish_text) > self.max_chunk_tokens:
+            report = self._translate_chunked(spanish_text, ENGLISH_SYSTEM_PROMPT, "es-en", "ENGLISH", use_cache=use_cache)
+            if report["error"] is not None:
+                return f"Error during text translation: {report['error']}"
+            self._cache_put(cache_key, report["translation"])
+            return report["translation"]
+        
+        try:
+            result = self._request_translation(spanish_text, ENGLISH_SYSTEM_PROMPT, "ENGLISH")
+            self._cache_put(cache_key, result)
+            return result
+        except Exception as e:
+            translation_logger.error(f"English translation failed: {e}")
+            return f"Error during text translation: {str(e)}"
+
+    def _detect_and_translate_combined(self, text, use_cache=True):
+        """
+        Detect the language and translate in a single JSON-mode Groq call.
+        
+        Results are cached under the same keys as the two-call path, so both
+        modes share cache entries.
+        
+        Returns:
+            tuple: (translation, direction), or None if the response was malformed,
+            the call failed or the text needs chunking (the caller then uses the
+            two-call path)
+        """
+        # One response can't hold a long translation; the two-call path translates it in chunks
+        if estimate_tokens(text) > self.max_chunk_tokens:
+            return None
+        
+        translation_logger.info(f"Starting single-round-trip translation: '{text[:50]}...'")
+        
+        # A cached detection means the two-call path is answered from cache anyway
+        _, cached = self._cache_get(text, "detect", DETECTION_SYSTEM_PROMPT, use_cache)
+        if cached is not None:
+            return None
+        
         messages = [
             {
                 "role": "system",
-                "content": "You are a translation engine. Translate the Spanish text to casual English. Do not answer questions, do not explain, do not add information. Output only the direct translation, nothing else."
+                "content": COMBINED_SYSTEM_PROMPT
             },
             {
                 "role": "user",
-                "content": spanish_text
+                "content": text
             }
         ]
         
         # Log the full API call for debugging
-        api_logger.info(f"ENGLISH TRANSLATION API CALL:")
-        api_logger.info(f"Model: llama-3.3-70b-versatile")
+        api_logger.info(f"SINGLE-ROUND-TRIP TRANSLATION API CALL:")
+        api_logger.info(f"Model: {TRANSLATION_MODEL}")
         api_logger.info(f"Messages: {messages}")
         
         try:
             start_time = time.time()
-            chat_completion = self.client.chat.completions.create(
+            chat_completion = self._translation_calls.call(
+                self.client.chat.completions.create,
                 messages=messages,
-                model="llama-3.3-70b-versatile",
+                model=TRANSLATION_MODEL,
                 temperature=0.0,
-                max_tokens=2000
+                max_tokens=2000,
+                response_format={"type": "json_object"}
             )
             duration = time.time() - start_time
-            result = chat_completion.choices[0].message.content.strip()
-            api_logger.info(f"English translation API call completed in {duration:.2f}s")
-            api_logger.info(f"RESPONSE: '{result[:100]}...'")
-            return result
+            content = chat_completion.choices[0].message.content
+            api_logger.info(f"Single-round-trip API call completed in {duration:.2f}s")
+            api_logger.info(f"RAW RESPONSE: '{str(content)[:200]}'")
+            source_language, translation = parse_combined_response(content)
+        except ValueError as e:
+            api_logger.warning(f"Malformed single-round-trip response ({e}), falling back to two calls")
+            return None
         except Exception as e:
-            translation_logger.error(f"English translation failed: {e}")
-            return f"Error during text translation: {str(e)}"
+            api_logger.error(f"Single-round-trip translation failed ({e}), falling back to two calls")
+            return None
+        
+        if use_cache:
+            store_combined_result(self.cache, text, source_language, translation)
+        return translation, translation_route(source_language)[2]
 
-    def transcribe_audio(self, audio_bytes):
-        """Transcribe audio to text using Groq Whisper large-v3-turbo"""
+    @staticmethod
+    def _upload_audio(create, audio_bytes, **kwargs):
+        """Call an audio endpoint with a fresh file object (each retry or hedge re-reads it)."""
+        audio_file = io.BytesIO(audio_bytes)
+        audio_file.name = "audio.wav"  # Required by Groq API
+        return create(file=audio_file, **kwargs)
+
+    def _request_transcription(self, audio_bytes, verbose=False):
+        """
+        One Whisper upload; raises on API errors.
+        
+        Returns:
+            dict: {"text", "language", "segments", "duration"}; language and segments
+                  are only filled in with verbose=True (verbose_json)
+        """
+        transcription = self._transcription_calls.call(
+            self._upload_audio, self.client.audio.transcriptions.create, audio_bytes,
+            model="whisper-large-v3-turbo",
+            response_format="verbose_json" if verbose else "text",
+            language=None  # Auto-detect language
+        )
+        if not verbose:
+            return {"text": str(transcription).strip(), "language": None, "segments": [], "duration": None}
+        
+        data = transcription.model_dump() if hasattr(transcription, "model_dump") else dict(transcription)
+        return {
+            "text": (data.get("text") or "").strip(),
+            "language": normalize_whisper_language(data.get("language")),
+            "segments": [
+                {key: segment.get(key) for key in ("start", "end", "text", "avg_logprob", "no_speech_prob")}
+                for segment in data.get("segments") or []
+            ],
+            "duration": data.get("duration"),
+        }
+
+    def transcribe_audio(self, audio_bytes, verbose=False):
+        """
+        Transcribe audio to text using Groq Whisper large-v3-turbo
+        
+        Args:
+            audio_bytes (bytes): Recorded audio (WAV)
+            verbose (bool): Request verbose_json and return Whisper's metadata too
+            
+        Returns:
+            str: The transcription (or an error message), or with verbose=True
+            dict: {"text", "language" ("ENGLISH" | "SPANISH" | None), "segments", "duration"};
+                  segment times are seconds into the original recording
+        """
         translation_logger.info("Starting audio transcription with Whisper large-v3-turbo")
+        result = self._transcribe(audio_bytes, verbose)
+        return result if verbose else result["text"]
+
+    def _prepare_audio(self, audio_bytes):
+        """
+        Apply upload preprocessing when enabled
+        
+        Returns:
+            tuple: (audio bytes to upload, or None if the recording holds no speech,
+                    preparation stats or None, seconds trimmed from the start)
+        """
+        if not AUDIO_PREPROCESSING_ENABLED:
+            return audio_bytes, None, 0.0
         try:
-            start_time = time.time()
-            
-            # Create a BytesIO object from the audio bytes
-            audio_file = io.BytesIO(audio_bytes)
-            audio_file.name = "audio.wav"  # Required by Groq API
-            
-            transcription = self.client.audio.transcriptions.create(
-                file=audio_file,
-                model="whisper-large-v3-turbo",
-                response_format="text",
-                language=None  # Auto-detect language
+            prepared_bytes, preparation = prepare_for_transcription(audio_bytes, target_rate=TRANSCRIPTION_SAMPLE_RATE)
+        except Exception as e:
+            # Not a PCM WAV we can decode - upload it unchanged
+            translation_logger.warning(f"Audio preprocessing skipped: {e}")
+            return audio_bytes, None, 0.0
+        if prepared_bytes is None:
+            translation_logger.info(
+                f"No speech in {preparation['original_seconds']:.1f}s recording, skipping transcription"
             )
-            
+        return prepared_bytes, preparation, preparation["trimmed_start_seconds"]
+
+    def _needs_segmenting(self, audio_bytes):
+        """Duration of a recording too long or large for one upload, else None."""
+        duration_seconds = wav_duration(audio_bytes)
+        if duration_seconds is not None and (
+            duration_seconds > 1.5 * TRANSCRIPTION_SEGMENT_SECONDS or len(audio_bytes) > TRANSCRIPTION_MAX_UPLOAD_BYTES
+        ):
+            return duration_seconds
+        return None
+
+    def _transcribe(self, audio_bytes, verbose):
+        """transcribe_audio internals; always returns the result dict."""
+        prepared_bytes, preparation, offset_seconds = self._prepare_audio(audio_bytes)
+        if prepared_bytes is None:
+            return {"text": "", "language": None, "segments": [], "duration": preparation["original_seconds"]}
+        audio_bytes = prepared_bytes
+        
+        # Long or oversized recordings are split at pauses and transcribed in parallel
+        duration_seconds = self._needs_segmenting(audio_bytes)
+        if duration_seconds is not None:
+            return self._transcribe_segmented(audio_bytes, duration_seconds, verbose, offset_seconds)
+        
+        try:
+            start_time = time.time()
+            result = self._request_transcription(audio_bytes, verbose=verbose)
             duration = time.time() - start_time
-            api_logger.info(f"Audio transcription completed in {duration:.2f}s")
-            translation_logger.info(f"Transcribed text: '{str(transcription)[:100]}...'")
-            
-            return str(transcription).strip()
+            api_logger.info(f"Audio transcription completed in {duration:.2f}s (language: {result['language']})")
+            if preparation is not None:
+                self._log_preparation_savings(preparation, duration)
+            translation_logger.info(f"Transcribed text: '{result['text'][:100]}...'")
+            return _offset_segments(result, offset_seconds)
             
         except Exception as e:
             translation_logger.error(f"Audio transcription failed: {e}")
-            return f"Error during audio transcription: {str(e)}"
+            return {"text": f"Error during audio transcription: {str(e)}", "language": None, "segments": [], "duration": None}
+
+    def _log_preparation_savings(self, preparation, request_seconds):
+        """Log bytes saved by preprocessing and the upload time that saved (estimated at the observed rate)."""
+        saved_bytes = preparation["original_bytes"] - preparation["prepared_bytes"]
+        saved_seconds = request_seconds * saved_bytes / max(1, preparation["prepared_bytes"])
+        api_logger.info(
+            f"Audio preprocessing: {preparation['original_bytes']} -> {preparation['prepared_bytes']} bytes "
+            f"({preparation['original_rate']} Hz, {preparation['original_seconds']:.1f}s -> "
+            f"{TRANSCRIPTION_SAMPLE_RATE} Hz mono, {preparation['prepared_seconds']:.1f}s); "
+            f"saved {saved_bytes} bytes, ~{saved_seconds:.2f}s upload"
+        )
 
-    def detect_and_translate(self, text):
-        """Automatically detects the language and translates it to the other."""
+    def _transcribe_segment(self, index, segment_bytes, verbose):
+        """Transcribe one segment (transient errors are retried by the call wrapper); returns (result dict, seconds)."""
+        start_time = time.time()
+        result = self._request_transcription(segment_bytes, verbose=verbose)
+        seconds = time.time() - start_time
+        api_logger.info(f"Segment {index} transcribed in {seconds:.2f}s ({len(segment_bytes)} bytes)")
+        return result, seconds
+
+    def _transcribe_segmented(self, audio_bytes, duration_seconds, verbose=False, offset_seconds=0.0):
+        """Split a long WAV at low-energy points, transcribe segments concurrently and stitch the text."""
+        start_time = time.time()
+        try:
+            segments = split_on_silence(audio_bytes, target_seconds=TRANSCRIPTION_SEGMENT_SECONDS)
+        except Exception as e:
+            translation_logger.error(f"Could not split {duration_seconds:.1f}s recording: {e}")
+            return {"text": f"Error during audio transcription: {str(e)}", "language": None, "segments": [], "duration": None}
+        if not segments:
+            return {"text": "", "language": None, "segments": [], "duration": duration_seconds}
+        
+        translation_logger.info(f"Transcribing {duration_seconds:.1f}s recording as {len(segments)} segments")
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, min(TRANSCRIPTION_SEGMENT_CONCURRENCY, len(segments))),
+                                    thread_name_prefix="transcribe-segment") as executor:
+                results = list(executor.map(
+                    lambda item: self._transcribe_segment(item[0], item[1][1], verbose), enumerate(segments)
+                ))
+        except Exception as e:
+            translation_logger.error(f"Segmented audio transcription failed: {e}")
+            return {"text": f"Error during audio transcription: {str(e)}", "language": None, "segments": [], "duration": None}
+        
+        transcription = stitch_transcripts([result["text"] for result, _ in results])
+        api_logger.info(
+            f"Segmented transcription completed in {time.time() - start_time:.2f}s; "
+            f"per-segment seconds: {[round(seconds, 2) for _, seconds in results]}"
+        )
+        translation_logger.info(f"Transcribed text: '{transcription[:100]}...'")
+        
+        # Language: the one Whisper reported for most of the audio
+        language_seconds = {}
+        merged_segments = []
+        for (segment_start, _), (result, _) in zip(segments, results):
+            shifted = _offset_segments(result, offset_seconds + segment_start)
+            merged_segments.extend(shifted["segments"])
+            if result["language"]:
+                spoken = sum((s["end"] or 0) - (s["start"] or 0) for s in result["segments"]) or 1.0
+                language_seconds[result["language"]] = language_seconds.get(result["language"], 0.0) + spoken
+        return {
+            "text": transcription,
+            "language": max(language_seconds, key=language_seconds.get) if language_seconds else None,
+            "segments": merged_segments,
+            "duration": duration_seconds,
+        }
+
+    def _request_audio_translation(self, audio_bytes):
+        """One Whisper translations upload (speech in any language to English text); raises on API errors."""
+        translation = self._transcription_calls.call(
+            self._upload_audio, self.client.audio.translations.create, audio_bytes,
+            model=SPEECH_TRANSLATION_MODEL,
+            response_format="text"
+        )
+        return str(translation).strip()
+
+    def transcribe_and_translate_audio(self, audio_bytes):
+        """
+        Transcribe a recording and, for Spanish speech, translate it to English in the same round trip
+        
+        The transcription (for display and language) and Whisper's translations endpoint
+        run concurrently, so Spanish dictation needs no detection or LLM translation call.
+        For English speech the translations result is discarded and translation is None:
+        the caller translates the transcript as usual, passing its language as source_language.
+        Long recordings are only transcribed (translation None), as is everything when
+        the translations call fails.
+        
+        Returns:
+            dict: {"transcription": transcribe_audio(verbose=True) result,
+                   "translation": English text or None, "direction": str or None,
+                   "seconds": wall time of both calls}
+        """
+        translation_logger.info("Starting direct speech translation with Whisper")
+        start_time = time.time()
+        report = {"transcription": None, "translation": None, "direction": None, "seconds": 0.0}
+        
+        prepared_bytes, preparation, offset_seconds = self._prepare_audio(audio_bytes)
+        if prepared_bytes is None:
+            report["transcription"] = {"text": "", "language": None, "segments": [], "duration": preparation["original_seconds"]}
+            return report
+        duration_seconds = self._needs_segmenting(prepared_bytes)
+        if duration_seconds is not None:
+            report["transcription"] = self._transcribe_segmented(prepared_bytes, duration_seconds, True, offset_seconds)
+            report["seconds"] = time.time() - start_time
+            return report
+        
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="speech-translate") as executor:
+            transcription_future = executor.submit(self._request_transcription, prepared_bytes, True)
+            translation_future = executor.submit(self._request_audio_translation, prepared_bytes)
+            try:
+                transcription = _offset_segments(transcription_future.result(), offset_seconds)
+            except Exception as e:
+                translation_logger.error(f"Audio transcription failed: {e}")
+                transcription = {"text": f"Error during audio transcription: {str(e)}", "language": None, "segments": [], "duration": None}
+            try:
+                translation = translation_future.result()
+            except Exception as e:
+                translation_logger.warning(f"Whisper speech translation failed, falling back to text translation: {e}")
+                translation = None
+        
+        report["transcription"] = transcription
+        report["seconds"] = time.time() - start_time
+        if preparation is not None:
+            self._log_preparation_savings(preparation, report["seconds"])
+        if transcription["language"] == "SPANISH" and translation:
+            report["translation"] = translation
+            report["direction"] = "Spanish → English"
+        api_logger.info(
+            f"Direct speech translation completed in {report['seconds']:.2f}s "
+            f"(language: {transcription['language']}, translated: {report['translation'] is not None})"
+        )
+        return report
+
+    def _resolve_source_language(self, text, source_language=None, use_cache=True):
+        """
+        Source language for a translation: a pre-known one (e.g. from Whisper) skips
+        _detect_language, unless the local detector confidently disagrees.
+        """
+        if source_language in ("ENGLISH", "SPANISH"):
+            local_language = self._detect_language_locally(text)
+            if local_language is not None and local_language != source_language:
+                api_logger.info(f"Local detector overrides provided source language {source_language} -> {local_language}")
+                return local_language
+            api_logger.info(f"Using provided source language: {source_language}")
+            return source_language
+        return self._detect_language(text, use_cache=use_cache)
+
+    def detect_and_translate_stream(self, text, use_cache=True, cancel_event=None, source_language=None):
+        """
+        Streaming variant of detect_and_translate.
+        
+        Yields translation text deltas (str) as Groq produces them, followed by a single
+        final record (dict) with keys: translation, direction, usage, cached, cancelled,
+        first_token_seconds, error. error is None unless the request failed, in which
+        case translation holds only what arrived before the failure. Setting cancel_event (threading.Event) or closing the
+        generator stops reading and closes the underlying HTTP stream.
+        
+        Args:
+            text (str): English or Spanish text
+            use_cache (bool): Set to False to bypass the translation cache for this call
+            cancel_event (threading.Event): Optional cancellation signal
+            source_language (str): "ENGLISH" or "SPANISH" if already known (skips detection)
+        """
+        translation_logger.info(f"Starting streaming translation for text: '{text[:50]}...'")
+        record = new_stream_record()
+        
+        detected_language = self._resolve_source_language(text, source_language, use_cache=use_cache)
+        api_logger.info(f"DETECTED LANGUAGE: {detected_language}")
+        route = translation_route(detected_language)
+        if route is None:
+            api_logger.info("LANGUAGE DETECTION FAILED - returning error")
+            record["translation"] = UNSUPPORTED_LANGUAGE_MESSAGE
+            yield record["translation"]
+            yield record
+            return
+        system_prompt, cache_direction, direction, label = route
+        record["direction"] = direction
+        
+        cache_key, cached = self._cache_get(text, cache_direction, system_prompt, use_cache)
+        if cached is not None:
+            api_logger.info(f"Streaming translation cache hit: '{cached[:100]}...'")
+            record.update(translation=cached, cached=True, first_token_seconds=0.0)
+            yield cached
+            yield record
+            return
+        
+        # Long inputs can't fit one response; translate them as parallel chunks and emit the result at once
+        if estimate_tokens(text) > self.max_chunk_tokens:
+            report = self._translate_chunked(text, system_prompt, cache_direction, label, use_cache=use_cache)
+            if report["error"] is not None:
+                record["translation"] = f"Error during text translation: {report['error']}"
+                record["error"] = report["error"]
+            else:
+                record["translation"] = report["translation"]
+                self._cache_put(cache_key, report["translation"])
+            yield record["translation"]
+            yield record
+            return
+        
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": text}
+        ]
+        api_logger.info(f"STREAMING TRANSLATION API CALL ({direction}):")
+        api_logger.info(f"Model: {TRANSLATION_MODEL}")
+        api_logger.info(f"Messages: {messages}")
+        
+        parts = []
+        stream = None
+        failed = False
+        start_time = time.time()
+        try:
+            # Only opening the stream is retried (streams are never hedged)
+            stream = self._stream_calls.call(
+                self.client.chat.completions.create,
+                messages=messages,
+                model=TRANSLATION_MODEL,
+                temperature=0.0,
+                max_tokens=2000,
+                stream=True
+            )
+            for chunk in stream:
+                if cancel_event is not None and cancel_event.is_set():
+                    api_logger.info("Streaming translation cancelled by caller")
+                    record["cancelled"] = True
+                    break
+                
+                usage = stream_chunk_usage(chunk)
+                if usage is not None:
+                    record["usage"] = usage
+                
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    if record["first_token_seconds"] is None:
+                        record["first_token_seconds"] = time.time() - start_time
+                        api_logger.info(f"First translation token after {record['first_token_seconds']:.2f}s")
+                    # Leading whitespace is dropped to match the stripped blocking result
+                    if not parts:
+                        delta = delta.lstrip()
+                        if not delta:
+                            continue
+                    parts.append(delta)
+                    yield delta
+        except Exception as e:
+            translation_logger.error(f"Streaming translation failed: {e}")
+            failed = True
+            record["error"] = str(e)
+            error_text = f"Error during text translation: {str(e)}"
+            if not parts:
+                parts.append(error_text)
+                yield error_text
+        finally:
+            if stream is not None:
+                stream.close()
+        
+        duration = time.time() - start_time
+        record["translation"] = "".join(parts).strip()
+        api_logger.info(f"Streaming translation finished in {duration:.2f}s (cancelled={record['cancelled']})")
+        if not failed and not record["cancelled"] and record["translation"]:
+            self._cache_put(cache_key, record["translation"])
+        yield record
+
+    def translate_incremental(self, text, segment_map, use_cache=True, cancel_event=None, source_language=None):
+        """
+        Re-translate edited text, sending only its added or changed sentences.
+        
+        Sentences whose hash is in segment_map (see update_segment_map) reuse their
+        earlier translation; each run of consecutive new sentences is translated as
+        one chunk with the source sentence before it as context, runs in parallel,
+        and the result is spliced back together in source order.
+        
+        Args:
+            text (str): English or Spanish text
+            segment_map (dict): The session's segment map from earlier translations
+            use_cache (bool): Set to False to bypass the translation cache for this call
+            cancel_event (threading.Event): Optional cancellation signal; chunks not yet
+                sent are dropped and the record comes back with cancelled set
+            source_language (str): "ENGLISH" or "SPANISH" if already known (skips detection)
+            
+        Returns:
+            dict: detect_and_translate_stream's final record plus "segment_map" (the
+                  updated map) and "incremental" ({"sentences", "reused", "sent_chars",
+                  "seconds"}), or None when the map doesn't cover at least incremental_min_reuse of the
+                  sentences or the direction changed - translate the whole text instead
+        """
+        if not segment_map or not segment_map.get("segments"):
+            return None
+        route = translation_route(self._resolve_source_language(text, source_language, use_cache=use_cache))
+        if route is None:
+            return None
+        system_prompt, cache_direction, direction, label = route
+        if segment_map.get("direction") != direction:
+            return None
+        
+        start_time = time.time()
+        sentences = split_into_sentences(text)
+        known = segment_map["segments"]
+        hashes = [sentence_hash(sentence) for sentence, _ in sentences]
+        reused = sum(1 for key in hashes if key in known)
+        record = new_stream_record()
+        record.update(
+            direction=direction,
+            segment_map=segment_map,
+            incremental={"sentences": len(sentences), "reused": reused, "sent_chars": 0, "seconds": 0.0}
+        )
+        
+        # An unchanged re-submit is answered from the cache like any other translation
+        cache_key, cached = self._cache_get(text, cache_direction, system_prompt, use_cache)
+        if cached is not None:
+            api_logger.info(f"Incremental translation cache hit: '{cached[:100]}...'")
+            record.update(translation=cached, cached=True)
+            return record
+        if not sentences or reused < self.incremental_min_reuse * len(sentences):
+            return None
+        
+        # Runs of consecutive new sentences: (first index, end index)
+        runs = []
+        index = 0
+        while index < len(sentences):
+            if hashes[index] in known:
+                index += 1
+                continue
+            end = index
+            while end < len(sentences) and hashes[end] not in known:
+                end += 1
+            runs.append((index, end))
+            index = end
+        
+        jobs = []
+        for run_index, (first, end) in enumerate(runs):
+            chunk = "".join(sentence + sep for sentence, sep in sentences[first:end]).strip()
+            context = _context_tail(sentences[first - 1][0], TRANSLATION_CHUNK_OVERLAP_CHARS) if first else ""
+            jobs.append((run_index, chunk, context))
+        record["incremental"]["sent_chars"] = sum(len(chunk) for _, chunk, _ in jobs)
+        records = []
+        if jobs:
+            executor = ThreadPoolExecutor(max_workers=max(1, min(self.chunk_concurrency, len(jobs))), thread_name_prefix="translate-chunk")
+            futures = [
+                executor.submit(self._translate_chunk, *job, system_prompt, cache_direction, label, use_cache) for job in jobs
+            ]
+            # Poll for cancellation: requests in flight finish in the background, queued ones never start
+            while wait(futures, timeout=0.1)[1]:
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+            executor.shutdown(wait=False, cancel_futures=True)
+            if cancel_event is not None and cancel_event.is_set():
+                api_logger.info("Incremental translation cancelled by caller")
+                record.update(cancelled=True, segment_map=None)
+                return record
+            records = [future.result() for future in futures]
+        
+        failed = [run for run in records if run["error"] is not None]
+        if failed:
+            record["segment_map"] = None
+            record["translation"] = f"Error during text translation: {failed[0]['error']}"
+            record["error"] = failed[0]["error"]
+            return record
+        
+        # Splice reused and new translations in source order, keeping the source's separators
+        parts = []
+        pairs = []
+        run_starts = {first: (end, run) for (first, end), run in zip(runs, records)}
+        index = 0
+        while index < len(sentences):
+            if index in run_starts:
+                end, run = run_starts[index]
+                parts.append(run["translation"])
+                pairs.extend(align_sentences("".join(s + sep for s, sep in sentences[index:end]), run["translation"]))
+                index = end
+            else:
+                parts.append(known[hashes[index]])
+                index += 1
+            parts.append(sentences[index - 1][1])
+        
+        duration = time.time() - start_time
+        record.update(translation="".join(parts).strip(), segment_map=update_segment_map(segment_map, direction, pairs))
+        record["incremental"]["seconds"] = duration
+        self._cache_put(cache_key, record["translation"])
+        api_logger.info(
+            f"Incremental translation finished in {duration:.2f}s: {len(sentences) - reused} of {len(sentences)} "
+            f"sentences sent ({record['incremental']['sent_chars']} of {len(text)} chars)"
+        )
+        return record
+
+    def detect_and_translate(self, text, use_cache=True, source_language=None):
+        """
+        Automatically detects the language and translates it to the other.
+        
+        Args:
+            text (str): English or Spanish text
+            use_cache (bool): Set to False to bypass the translation cache for this call
+            source_language (str): "ENGLISH" or "SPANISH" if already known, e.g. from
+                transcribe_audio(verbose=True); skips language detection
+            
+        Returns:
+            tuple: (translation, direction)
+        """
         translation_logger.info(f"Starting translation for text: '{text[:50]}...'")
         api_logger.info(f"DETECT_AND_TRANSLATE INPUT: '{text}'")
         
-        detected_language = self._detect_language(text)
+        # Single-round-trip mode only matters when the local detector can't decide
+        if source_language is None and self.single_round_trip and self._detect_language_locally(text) is None:
+            combined = self._detect_and_translate_combined(text, use_cache=use_cache)
+            if combined is not None:
+                translation, direction = combined
+                translation_logger.info(f"Translation completed: {direction}")
+                api_logger.info(f"FINAL TRANSLATION RESULT: '{translation}'")
+                return translation, direction
+        
+        detected_language = self._resolve_source_language(text, source_language, use_cache=use_cache)
         translation_logger.info(f"Detected language: {detected_language}")
         api_logger.info(f"DETECTED LANGUAGE: {detected_language}")
 
         if detected_language == "ENGLISH":
             api_logger.info("ROUTING TO: _translate_to_spanish")
-            translation = self._translate_to_spanish(text)
+            translation = self._translate_to_spanish(text, use_cache=use_cache)
             direction = "English → Spanish"
         elif detected_language == "SPANISH":
             api_logger.info("ROUTING TO: _translate_to_english")
-            translation = self._translate_to_english(text)
+            translation = self._translate_to_english(text, use_cache=use_cache)
             direction = "Spanish → English"
         else:
             api_logger.info("LANGUAGE DETECTION FAILED - returning error")
-            return "Sorry, I can only translate between English and Spanish. Please check your text.", "Unknown"
+            return UNSUPPORTED_LANGUAGE_MESSAGE, "Unknown"
         
         translation_logger.info(f"Translation completed: {direction}")
         api_logger.info(f"FINAL TRANSLATION RESULT: '{translation}'")
-        return translation, direction
\ No newline at end of file
+        return translation, direction
+
+    def _translate_strict(self, text, use_cache=True):
+        """
+        detect_and_translate for batch use: raises instead of returning error strings.
+        
+        Returns:
+            tuple: (translation, direction)
+        """
+        detected_language = self._detect_language_locally(text)
+        if detected_language is None and self.single_round_trip:
+            combined = self._detect_and_translate_combined(text, use_cache=use_cache)
+            if combined is not None:
+                return combined
+        if detected_language is None:
+            detect_key, detected_language = self._cache_get(text, "detect", DETECTION_SYSTEM_PROMPT, use_cache)
+            if detected_language is None:
+                detected_language = self._request_detection(text)
+                if detected_language not in ("ENGLISH", "SPANISH"):
+                    raise ValueError(f"Unsupported or undetected language: '{detected_language}'")
+                self._cache_put(detect_key, detected_language)
+        
+        system_prompt, cache_direction, direction, label = translation_route(detected_language)
+        cache_key, cached = self._cache_get(text, cache_direction, system_prompt, use_cache)
+        if cached is not None:
+            return cached, direction
+        if estimate_tokens(text) > self.max_chunk_tokens:
+            report = self._translate_chunked(text, system_prompt, cache_direction, label, use_cache=use_cache)
+            if report["error"] is not None:
+                raise RuntimeError(report["error"])
+            translation = report["translation"]
+        else:
+            translation = self._request_translation(text, system_prompt, label)
+        self._cache_put(cache_key, translation)
+        return translation, direction
+
+    def _translate_item(self, text, use_cache):
+        """Translate one batch item into a record; provider retries happen in the resilience wrappers."""
+        try:
+            translation, direction = self._translate_strict(text, use_cache=use_cache)
+            return {"translation": translation, "direction": direction, "error": None}
+        except Exception as e:
+            translation_logger.error(f"Batch item failed: {e}")
+            return {
+                "translation": None,
+                "direction": "Unknown",
+                "error": {"type": type(e).__name__, "message": str(e), "retryable": is_retryable(e)}
+            }
+
+    def translate_batch(self, texts, concurrency=4, ordered=True, use_cache=True):
+        """
+        Translate many texts concurrently with a bounded worker pool.
+        
+        Identical inputs are translated once per batch, transient provider errors
+        (connection, rate limit, 5xx) are retried by the Groq call wrappers, and
+        failures come back as structured records instead of error strings. ``texts`` may be any
+        iterable; it is consumed lazily, with at most ``2 * concurrency`` items
+        waiting to be yielded.
+        
+        Args:
+            texts (iterable): English or Spanish strings
+            concurrency (int): Number of worker threads (concurrent Groq requests)
+            ordered (bool): Yield results in input order (True) or as they complete (False)
+            use_cache (bool): Set to False to bypass the translation cache
+            
+        Yields:
+            dict: {"index", "text", "translation", "direction", "error"};
+                  error is None on success, else {"type", "message", "retryable"}
+        """
+        concurrency = max(1, concurrency)
+        window = 2 * concurrency
+        futures_by_text = {}  # Dedupe: every occurrence of a text shares one future
+        pending = deque()  # (index, text, future) not yet yielded, in input order
+        counts = {"items": 0, "errors": 0}
+        start_time = time.time()
+        
+        def make_record(index, text, future):
+            record = {"index": index, "text": text, **future.result()}
+            counts["items"] += 1
+            if record["error"] is not None:
+                counts["errors"] += 1
+            return record
+        
+        def drain(block):
+            # Yield finished items; with block=True, wait until at least one is yielded
+            if ordered:
+                while pending and (block or pending[0][2].done()):
+                    yield make_record(*pending.popleft())
+                    block = False
+                return
+            if block:
+                wait({future for _, _, future in pending}, return_when=FIRST_COMPLETED)
+            finished = [item for item in pending if item[2].done()]
+            for item in finished:
+                pending.remove(item)
+                yield make_record(*item)
+        
+        translation_logger.info(f"Starting batch translation (concurrency={concurrency}, ordered={ordered})")
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="translate-batch") as executor:
+            try:
+                for index, text in enumerate(texts):
+                    future = futures_by_text.get(text)
+                    if future is None:
+                        future = executor.submit(self._translate_item, text, use_cache)
+                        futures_by_text[text] = future
+                    pending.append((index, text, future))
+                    yield from drain(block=len(pending) >= window)
+                while pending:
+                    yield from drain(block=True)
+            finally:
+                for future in futures_by_text.values():
+                    future.cancel()
+        
+        duration = time.time() - start_time
+        translation_logger.info(
+            f"Batch translation finished: {counts['items']} items ({len(futures_by_text)} unique), "
+            f"{counts['errors']} errors in {duration:.2f}s"
+        )
+
+    def _translate_chunk(self, index, chunk, context, system_prompt, cache_direction, label, use_cache):
+        """Translate one document chunk (with preceding context); provider retries happen in the wrappers."""
+        chunk_prompt, user_content, max_tokens = chunk_request(chunk, context, system_prompt)
+        record = {"index": index, "source_chars": len(chunk), "seconds": 0.0, "cached": False, "error": None}
+        start_time = time.time()
+        
+        cache_key, cached = self._cache_get(user_content, cache_direction, chunk_prompt, use_cache)
+        if cached is not None:
+            record.update(cached=True, translation=cached)
+            return record
+        
+        try:
+            translation = self._request_translation(user_content, chunk_prompt, f"{label} CHUNK {index}", max_tokens=max_tokens)
+        except Exception as e:
+            translation_logger.error(f"Chunk {index} translation failed: {e}")
+            record.update(translation=None, seconds=time.time() - start_time, error=str(e))
+            return record
+        translation = clean_chunk_translation(translation)
+        self._cache_put(cache_key, translation)
+        record.update(translation=translation, seconds=time.time() - start_time)
+        return record
+
+    def _translate_chunked(self, text, system_prompt, cache_direction, label, use_cache=True):
+        """
+        Translate a long text as parallel chunks and reassemble them in order.
+        
+        Returns:
+            dict: {"translation", "error", "seconds", "chunks": [{"index", "source_chars",
+                  "seconds", "cached", "error"}]}; error is None on success
+        """
+        start_time = time.time()
+        chunks, jobs = plan_chunks(text, self.max_chunk_tokens)
+        translation_logger.info(f"Translating {len(chunks)} chunks of ~{self.max_chunk_tokens} tokens ({len(text)} chars)")
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(self.chunk_concurrency, len(jobs))), thread_name_prefix="translate-chunk") as executor:
+            records = list(executor.map(
+                lambda job: self._translate_chunk(*job, system_prompt, cache_direction, label, use_cache), jobs
+            ))
+        
+        return assemble_chunks(chunks, records, time.time() - start_time)
+
+    def translate_document(self, text, use_cache=True):
+        """
+        Translate a long document, reporting per-chunk latency.
+        
+        Args:
+            text (str): English or Spanish document
+            use_cache (bool): Set to False to bypass the translation cache
+            
+        Returns:
+            dict: {"translation", "direction", "error", "seconds", "chunks"} (see _translate_chunked)
+        """
+        detected_language = self._detect_language(text[:4 * self.max_chunk_tokens], use_cache=use_cache)
+        if detected_language == "ENGLISH":
+            report = self._translate_chunked(text, SPANISH_SYSTEM_PROMPT, "en-es", "SPANISH", use_cache=use_cache)
+            report["direction"] = "English → Spanish"
+        elif detected_language == "SPANISH":
+            report = self._translate_chunked(text, ENGLISH_SYSTEM_PROMPT, "es-en", "ENGLISH", use_cache=use_cache)
+            report["direction"] = "Spanish → English"
+        else:
+            return {
+                "translation": None, "direction": "Unknown", "error": "Unsupported or undetected language",
+                "seconds": 0.0, "chunks": []
+            }
+        return report
@@ -0,0 +1,147 @@
+import threading
+import time
+from collections import Counter, deque
+from config import (
+    LOGGERS, TTS_PREFETCH_BUDGET_CHARS, TTS_PREFETCH_BUDGET_WINDOW_SECONDS, TTS_PREFETCH_MAX_TEXT_CHARS
+)
+
+# Get audio logger
+audio_logger = LOGGERS['audio']
+
+VOICE_HISTORY_LENGTH = 50  # Voice uses remembered per session
+
+
+class CharacterBudget:
+    """Sliding-window cap on speculative TTS characters, shared by every session in the process."""
+
+    def __init__(self, max_chars, window_seconds):
+        self.max_chars = max_chars
+        self.window_seconds = window_seconds
+        self._lock = threading.Lock()
+        self._spent = deque()  # (monotonic time, characters)
+        self._total = 0
+
+    def _expire(self, now):
+        while self._spent and now - self._spent[0][0] >= self.window_seconds:
+            self._total -= self._spent.popleft()[1]
+
+    def try_spend(self, chars):
+        """Reserve chars if they fit in the window's remaining budget; returns False (spending nothing) otherwise."""
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            if self._total + chars > self.max_chars:
+                return False
+            self._spent.append((now, chars))
+            self._total += chars
+            return True
+
+    def remaining(self):
+        with self._lock:
+            self._expire(time.monotonic())
+            return self.max_chars - self._total
+
+
+def record_voice_use(history, voice_name, language):
+    """Append a voice use to a session's history list (kept to the last VOICE_HISTORY_LENGTH uses)."""
+    history.append((language, voice_name))
+    del history[:-VOICE_HISTORY_LENGTH]
+
+
+def predict_voice(history, language):
+    """
+    The voice a session will most likely pick for a translation into language
+
+    The last voice used for that language if there is one, otherwise the
+    session's most frequently used voice; None without any history.
+    """
+    for used_language, voice_name in reversed(history):
+        if used_language == language:
+            return voice_name
+    if history:
+        return Counter(voice_name for _, voice_name in history).most_common(1)[0][0]
+    return None
+
+
+class TTSPrefetcher:
+    """
+    Speculative synthesis of a translation with the session's predicted voice.
+
+    Runs as a background job ahead of the voice pick. Audio lands in the audio
+    cache (or as an artifact), so picking the predicted voice plays it at once;
+    the app cancels the job when a different voice or text is chosen. Each
+    prefetch is charged against the process-wide character budget when it is
+    submitted, and texts longer than max_text_chars are not prefetched.
+    """
+
+    def __init__(self, budget, max_text_chars=TTS_PREFETCH_MAX_TEXT_CHARS):
+        self.budget = budget
+        self.max_text_chars = max_text_chars
+        self._lock = threading.Lock()
+        self.stats = {
+            'predictions': 0,
+            'synthesized': 0,
+            'characters': 0,
+            'over_budget': 0,
+            'too_long': 0,
+            'cancelled': 0,
+            'hits': 0,
+            'misses': 0,
+        }
+
+    def record(self, name, amount=1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def reserve(self, text):
+        """
+        Charge text against the budget before its prefetch is submitted
+
+        Returns False (charging nothing) for texts longer than max_text_chars or
+        beyond the remaining budget.
+        """
+        if len(text) > self.max_text_chars:
+            self.record('too_long')
+            return False
+        if not self.budget.try_spend(len(text)):
+            self.record('over_budget')
+            audio_logger.info(f"TTS prefetch skipped: {len(text)} characters exceed the remaining budget")
+            return False
+        self.record('predictions')
+        return True
+
+    def run(self, job, tts_handler, text, voice_id, voice_name):
+        """
+        Job function: synthesize text with voice_id (already reserved) unless cancelled first
+
+        Returns:
+            dict: Same shape as the app's TTS job result, or None if cancelled before synthesis
+        """
+        if job.cancelled:
+            self.record('cancelled')
+            return None
+        self.record('synthesized')
+        self.record('characters', len(text))
+        audio_logger.info(f"Prefetching TTS with predicted voice {voice_name} ({len(text)} characters)")
+        path = tts_handler.generate_audio_with_voice_id(text, voice_id, voice_name)
+        return {'text': text, 'voice_id': voice_id, 'voice_name': voice_name, 'stream_id': None, 'path': path}
+
+    def get_stats(self):
+        """Return prefetch counters plus the remaining character budget."""
+        with self._lock:
+            stats = dict(self.stats)
+        stats['budget_remaining'] = self.budget.remaining()
+        return stats
+
+
+_prefetcher_lock = threading.Lock()
+_prefetcher = None
+
+
+def get_prefetcher():
+    """Process-wide TTS prefetcher (configured from config)."""
+    global _prefetcher
+    with _prefetcher_lock:
+        if _prefetcher is None:
+            _prefetcher = TTSPrefetcher(CharacterBudget(TTS_PREFETCH_BUDGET_CHARS, TTS_PREFETCH_BUDGET_WINDOW_SECONDS))
+        return _prefetcher
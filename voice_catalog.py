@@ -0,0 +1,218 @@
+import csv
+import json
+import os
+import threading
+from types import MappingProxyType
+from config import LOGGERS, VOICE_CATALOG_CSV, VOICE_CATALOG_CACHE_PATH
+
+# Get audio logger
+audio_logger = LOGGERS['audio']
+
+CATALOG_FORMAT_VERSION = 1
+SELECT_PLACEHOLDER = "Select a voice..."
+GENDER_EMOJI = {'male': "👨", 'female': "👩"}
+CSV_LANGUAGES = {'en': 'english', 'es': 'spanish'}  # CSV language code -> catalog language, in lookup priority
+
+# Used when the CSV is missing or unreadable
+DEFAULT_VOICES = [
+    {'language': 'english', 'voice_id': 'EXAVITQu4vr4xnSDxMaL', 'name': 'Sarah', 'gender': 'female', 'accent': 'american',
+     'description': 'Young adult woman with a confident and warm, mature quality...'},
+    {'language': 'english', 'voice_id': 'bIHbv24MWmeRgasZH58o', 'name': 'Will', 'gender': 'male', 'accent': 'american',
+     'description': 'Conversational and laid back...'},
+    {'language': 'spanish', 'voice_id': 'x5IDPSl4ZUbhosMmVFTk', 'name': 'Lumina', 'gender': 'female', 'accent': 'colombian',
+     'description': 'A neutral and versatile female voice, characterized by its clarity...'},
+    {'language': 'spanish', 'voice_id': '15bJsujCI3tcDWeoZsQP', 'name': 'Santiago', 'gender': 'male', 'accent': 'mexican',
+     'description': 'Young Spanish Male. Voice is Clear, casual with a Mexican accent...'},
+]
+
+
+def _clean_text(value):
+    """Collapse the CSV's multiline cells; pandas-style 'nan' placeholders become empty."""
+    text = str(value or '').replace('\n', ' ').replace('  ', ' ').strip()
+    return '' if text.lower() == 'nan' else text
+
+
+def _voice_from_row(row):
+    """One CSV row -> voice record (same cleaning rules the handler always applied), or None to skip it."""
+    language = CSV_LANGUAGES.get(_clean_text(row.get('language')))
+    voice_id = _clean_text(row.get('voice_id'))
+    name = _clean_text(row.get('name'))
+    gender = _clean_text(row.get('gender'))
+    if not (language and voice_id and name and gender):
+        return None
+
+    name = name.split(' - ')[0].strip()  # Remove extra descriptors after dash
+    # Handle names like "Santiago Latinamerican Spanish" - keep only the first name
+    if len(name.split()) > 2 and 'spanish' in name.lower():
+        name = name.split()[0]
+
+    description = _clean_text(row.get('description')) or f"Professional {gender.lower()} voice"
+    return {
+        'language': language,
+        'voice_id': voice_id,
+        'name': name,
+        'gender': gender,
+        'accent': _clean_text(row.get('accent')),
+        'description': description[:100] + "..." if len(description) > 100 else description,
+    }
+
+
+def parse_voice_csv(csv_path):
+    """Parse the voice CSV in a single pass; returns voice records for the supported languages."""
+    with open(csv_path, encoding='utf-8', newline='') as f:
+        rows = csv.DictReader(f, skipinitialspace=True)
+        voices = [voice for voice in map(_voice_from_row, rows) if voice is not None]
+    # Language priority order (English first) decides which voice owns a display name shared across languages
+    order = list(CSV_LANGUAGES.values())
+    return sorted(voices, key=lambda voice: order.index(voice['language']))
+
+
+class VoiceCatalog:
+    """
+    Immutable, pre-indexed voice catalog.
+
+    Built once from voice records; every lookup the UI needs (by display name,
+    emoji-free label, voice_id, gender, language, and the ready-made selectbox
+    options per gender) is a dict or tuple read. Voice records are read-only
+    mappings with voice_id, name, gender, accent, description, language,
+    display_name ("👩 Sarah (American)") and label ("Sarah (American)").
+    """
+
+    def __init__(self, voices, source=None):
+        self.source = source
+        by_display_name = {}
+        by_language = {language: {} for language in CSV_LANGUAGES.values()}
+        for voice in voices:
+            gender_emoji = GENDER_EMOJI['male'] if voice['gender'].lower() == 'male' else GENDER_EMOJI['female']
+            accent = voice['accent']
+            accent_label = f" ({accent.title()})" if accent and accent.lower() != 'standard' else ""
+            label = f"{voice['name']}{accent_label}"
+            display_name = f"{gender_emoji} {label}"
+            record = MappingProxyType(dict(voice, display_name=display_name, label=label))
+            by_language.setdefault(voice['language'], {})[display_name] = record
+            by_display_name.setdefault(display_name, record)
+
+        self.voices = tuple(by_display_name.values())
+        self.by_display_name = MappingProxyType(by_display_name)
+        self.by_label = MappingProxyType({voice['label']: voice for voice in reversed(self.voices)})
+        self.by_voice_id = MappingProxyType({voice['voice_id']: voice for voice in reversed(self.voices)})
+        self.by_language = MappingProxyType({
+            language: MappingProxyType(language_voices) for language, language_voices in by_language.items()
+        })
+        self.by_gender = MappingProxyType({
+            gender: tuple(voice for voice in self.voices if voice['gender'].lower() == gender) for gender in GENDER_EMOJI
+        })
+        # Selectbox options per gender: the placeholder, then emoji-free labels
+        self.options = MappingProxyType({
+            gender: (SELECT_PLACEHOLDER,) + tuple(voice['label'] for voice in gender_voices)
+            for gender, gender_voices in self.by_gender.items()
+        })
+
+    def __len__(self):
+        return len(self.voices)
+
+    def get(self, display_name):
+        """Voice record for a display name (with or without its gender emoji), or None."""
+        return self.by_display_name.get(display_name) or self.by_label.get(display_name)
+
+    def voice_id(self, display_name):
+        voice = self.get(display_name)
+        return voice['voice_id'] if voice else None
+
+
+def _source_signature(csv_path):
+    """(mtime_ns, size) of the CSV, or None if it doesn't exist."""
+    try:
+        stat = os.stat(csv_path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _read_cache(cache_path, csv_path, signature):
+    """Voice records from the cache file if it was built from this exact CSV version, else None."""
+    try:
+        with open(cache_path, encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (cached.get('version') != CATALOG_FORMAT_VERSION or cached.get('source') != os.path.abspath(csv_path)
+            or cached.get('signature') != signature):
+        return None
+    return cached.get('voices')
+
+
+def _write_cache(cache_path, csv_path, signature, voices):
+    """Atomically write the compact cache file; failures only cost a re-parse next time."""
+    try:
+        os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+        temp_path = f"{cache_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': CATALOG_FORMAT_VERSION,
+                'source': os.path.abspath(csv_path),
+                'signature': signature,
+                'voices': voices,
+            }, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        audio_logger.warning(f"Could not write voice catalog cache {cache_path}: {e}")
+
+
+def load_voice_catalog(csv_path=VOICE_CATALOG_CSV, cache_path=VOICE_CATALOG_CACHE_PATH):
+    """
+    Build the catalog from the cache file, or parse the CSV (and refresh the cache) if it changed
+
+    Falls back to the built-in default voices if the CSV is missing or unreadable.
+    """
+    signature = _source_signature(csv_path)
+    if signature is None:
+        audio_logger.warning("Voice CSV file not found, using default voices")
+        return VoiceCatalog(DEFAULT_VOICES, source=None), None
+
+    voices = _read_cache(cache_path, csv_path, signature) if cache_path else None
+    if voices is not None:
+        audio_logger.info(f"Loaded {len(voices)} voices from catalog cache {cache_path}")
+    else:
+        try:
+            voices = parse_voice_csv(csv_path)
+        except Exception as e:
+            audio_logger.error(f"Error loading voices from CSV: {e}")
+            audio_logger.error("CSV parsing failed, falling back to default voices")
+            return VoiceCatalog(DEFAULT_VOICES, source=None), signature
+        audio_logger.info(f"Parsed {len(voices)} English and Spanish voices from {csv_path}")
+        if cache_path:
+            _write_cache(cache_path, csv_path, signature, voices)
+
+    catalog = VoiceCatalog(voices, source=csv_path)
+    audio_logger.info(
+        f"Voice catalog ready: {len(catalog.by_language['english'])} English, "
+        f"{len(catalog.by_language['spanish'])} Spanish voices"
+    )
+    return catalog, signature
+
+
+_catalog_lock = threading.Lock()
+_catalog = None
+_catalog_signature = None
+
+
+def get_voice_catalog():
+    """
+    Process-wide voice catalog, hot-reloaded when the CSV changes
+
+    Each call costs one stat() of the CSV; the catalog is rebuilt (from the
+    cache file or the CSV) only when its mtime or size differs from the version
+    the current catalog was built from. Readers keep whichever immutable catalog
+    they were handed, so a reload never changes one under them.
+    """
+    global _catalog, _catalog_signature
+    signature = _source_signature(VOICE_CATALOG_CSV)
+    if _catalog is not None and signature == _catalog_signature:
+        return _catalog
+    with _catalog_lock:
+        if _catalog is None or signature != _catalog_signature:
+            if _catalog is not None:
+                audio_logger.info(f"Voice CSV {VOICE_CATALOG_CSV} changed, reloading voice catalog")
+            _catalog, _catalog_signature = load_voice_catalog()
+        return _catalog